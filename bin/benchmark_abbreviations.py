@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""Microbenchmark of abbreviation and replacement matching for each language
+
+Compares trying each pattern of a language's settings in turn with the
+combined matchers (settings.abbreviations_matcher/replacements_matcher), and
+checks that both give the same text for every word.
+
+Words come from a short sample with a few abbreviations and, optionally, a
+sentences file (lang|text|truth lines).
+
+Example:
+
+.. code-block:: sh
+
+    python3 bin/benchmark_abbreviations.py test/test_sentences.txt --repeat 200
+"""
+import argparse
+import logging
+import time
+import typing
+
+from gruut.const import KNOWN_LANGS, TextProcessorSettings
+from gruut.lang import get_settings
+
+_LOGGER = logging.getLogger("benchmark_abbreviations")
+
+# Mostly ordinary words, with some abbreviations and replacements
+SAMPLE_TEXT = (
+    "Yesterday Dr. Smith and Mrs. Jones met with the owners of Brown’s "
+    "hardware co. on Main St. to discuss a plan that would cut costs by 5% "
+    "before the end of the year, and they agreed to meet again next week "
+    "in the small office near the old train station l’homme Straße."
+)
+
+# -----------------------------------------------------------------------------
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(prog="benchmark_abbreviations.py")
+    parser.add_argument(
+        "sentences",
+        nargs="?",
+        help="Path to test sentences file with lang|text|truth lines",
+    )
+    parser.add_argument(
+        "--language",
+        action="append",
+        help="Language(s) to benchmark (default: all)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=100,
+        help="Number of times to go through all words (default: 100)",
+    )
+    parser.add_argument(
+        "--debug", action="store_true", help="Print DEBUG messages to console"
+    )
+    args = parser.parse_args()
+
+    if args.debug:
+        logging.basicConfig(level=logging.DEBUG)
+    else:
+        logging.basicConfig(level=logging.INFO)
+
+    texts = [SAMPLE_TEXT]
+    if args.sentences:
+        with open(args.sentences, "r", encoding="utf-8") as sentences_file:
+            for line in sentences_file:
+                line = line.strip()
+                if (not line) or line.startswith("#"):
+                    continue
+
+                texts.append(line.split("|", maxsplit=2)[1])
+
+    for lang in sorted(args.language or KNOWN_LANGS):
+        settings = get_settings(lang)
+        words = [
+            word_text
+            for text in texts
+            for word_text in settings.split_words(text)
+            if word_text
+        ]
+
+        for name, num_patterns, sequential, combined in [
+            (
+                "abbreviations",
+                len(settings.abbreviations),
+                abbreviations_sequential,
+                abbreviations_combined,
+            ),
+            (
+                "replacements",
+                len(settings.replacements),
+                replacements_sequential,
+                replacements_combined,
+            ),
+        ]:
+            if num_patterns < 1:
+                continue
+
+            sequential_results = [sequential(settings, w) for w in words]
+            combined_results = [combined(settings, w) for w in words]
+            for word_text, expected, actual in zip(
+                words, sequential_results, combined_results
+            ):
+                assert expected == actual, (lang, word_text, expected, actual)
+
+            sequential_seconds = time_words(sequential, settings, words, args.repeat)
+            combined_seconds = time_words(combined, settings, words, args.repeat)
+            num_words = len(words) * args.repeat
+
+            print(
+                "{0} {1} ({2} pattern(s)): sequential {3:0.2f} us/word, combined {4:0.2f} us/word, {5:0.1f}x".format(
+                    lang,
+                    name,
+                    num_patterns,
+                    (sequential_seconds / num_words) * 1e6,
+                    (combined_seconds / num_words) * 1e6,
+                    sequential_seconds / combined_seconds,
+                )
+            )
+
+
+def time_words(
+    func: typing.Callable[[TextProcessorSettings, str], typing.Optional[str]],
+    settings: TextProcessorSettings,
+    words: typing.Sequence[str],
+    repeat: int,
+) -> float:
+    """Seconds to run func on all words repeat times"""
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        for word_text in words:
+            func(settings, word_text)
+
+    return time.perf_counter() - start_time
+
+
+# -----------------------------------------------------------------------------
+
+
+def abbreviations_sequential(
+    settings: TextProcessorSettings, text: str
+) -> typing.Optional[str]:
+    """Expand the first matching abbreviation, trying one pattern at a time"""
+    for pattern, template in settings.abbreviations.items():
+        match = pattern.match(text)  # type: ignore
+        if match is not None:
+            return match.expand(template)
+
+    return None
+
+
+def abbreviations_combined(
+    settings: TextProcessorSettings, text: str
+) -> typing.Optional[str]:
+    """Expand the first matching abbreviation with the combined matcher"""
+    assert settings.abbreviations_matcher is not None
+    match = settings.abbreviations_matcher.match(text)
+    if match is not None:
+        return match.expand(settings.abbreviations[match.re])
+
+    return None
+
+
+def replacements_sequential(
+    settings: TextProcessorSettings, text: str
+) -> typing.Optional[str]:
+    """Apply every replacement in turn"""
+    matched = False
+    for pattern, template in settings.replacements:
+        text, num_subs = pattern.subn(template, text)  # type: ignore
+        if num_subs > 0:
+            matched = True
+
+    return text if matched else None
+
+
+def replacements_combined(
+    settings: TextProcessorSettings, text: str
+) -> typing.Optional[str]:
+    """Apply replacements only if the combined matcher finds one"""
+    assert settings.replacements_matcher is not None
+    if not settings.replacements_matcher.has_match(text):
+        return None
+
+    return replacements_sequential(settings, text)
+
+
+# -----------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Compare text processing speed of TextGraph and networkx.DiGraph
+
+Example:
+
+.. code-block:: sh
+
+    python3 bin/benchmark_graph.py test/test_sentences.txt --iterations 100
+"""
+import argparse
+import dataclasses
+import logging
+import time
+import typing
+from pathlib import Path
+
+import networkx as nx
+
+from gruut.graph import TextGraph
+from gruut.text_processor import TextProcessor
+
+_LOGGER = logging.getLogger("benchmark_graph")
+
+# -----------------------------------------------------------------------------
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(prog="benchmark_graph.py")
+    parser.add_argument(
+        "sentences", help="Path to test sentences file with lang|text|truth lines"
+    )
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=50,
+        help="Number of times to process each sentence (default: 50)",
+    )
+    parser.add_argument(
+        "--lexicon",
+        action="store_true",
+        help="Include lexicon database lookups in timing (not graph related)",
+    )
+    parser.add_argument(
+        "--debug", action="store_true", help="Print DEBUG messages to console"
+    )
+    args = parser.parse_args()
+
+    if args.debug:
+        logging.basicConfig(level=logging.DEBUG)
+    else:
+        logging.basicConfig(level=logging.INFO)
+
+    lang_texts = load_sentences(args.sentences)
+    _LOGGER.info("Loaded %s sentence(s) from %s", len(lang_texts), args.sentences)
+
+    results: typing.Dict[str, typing.Tuple[float, typing.List[typing.Any]]] = {}
+    for graph_name, graph_class in [("networkx", nx.DiGraph), ("TextGraph", TextGraph)]:
+        results[graph_name] = run_benchmark(
+            graph_class,
+            lang_texts,
+            args.iterations,
+            load_phoneme_lexicon=args.lexicon,
+        )
+        _LOGGER.info("%s: %0.3f second(s)", graph_name, results[graph_name][0])
+
+    nx_seconds, nx_sentences = results["networkx"]
+    tg_seconds, tg_sentences = results["TextGraph"]
+
+    assert nx_sentences == tg_sentences, "Output differs between graph types"
+
+    print(
+        "networkx: {0:0.3f}s, TextGraph: {1:0.3f}s, speedup: {2:0.2f}x".format(
+            nx_seconds, tg_seconds, nx_seconds / tg_seconds
+        )
+    )
+
+
+def load_sentences(
+    sentences_path: typing.Union[str, Path]
+) -> typing.List[typing.Tuple[str, str]]:
+    """Load (lang, text) pairs, skipping comments and blank lines"""
+    lang_texts = []
+    with open(sentences_path, "r", encoding="utf-8") as sentences_file:
+        for line in sentences_file:
+            line = line.strip()
+            if (not line) or line.startswith("#"):
+                continue
+
+            lang, text, *_ = line.split("|")
+            lang_texts.append((lang, text))
+
+    return lang_texts
+
+
+def run_benchmark(
+    graph_class,
+    lang_texts: typing.Sequence[typing.Tuple[str, str]],
+    iterations: int,
+    **processor_kwargs,
+) -> typing.Tuple[float, typing.List[typing.Any]]:
+    """Process each sentence and return total seconds and final output"""
+    processor = TextProcessor(graph_class=graph_class, **processor_kwargs)
+
+    # Warm up caches and load models outside of timing
+    for lang, text in lang_texts:
+        graph, root = processor(text, lang=lang)
+        list(processor.sentences(graph, root))
+
+    outputs: typing.List[typing.Any] = []
+    start_time = time.perf_counter()
+    for _ in range(iterations):
+        outputs = []
+        for lang, text in lang_texts:
+            graph, root = processor(text, lang=lang)
+            outputs.extend(
+                dataclasses.asdict(s) for s in processor.sentences(graph, root)
+            )
+
+    end_time = time.perf_counter()
+
+    return end_time - start_time, outputs
+
+
+# -----------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    main()
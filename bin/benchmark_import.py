@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Measure cold start time of import gruut and gruut --version
+
+Each command is run in a fresh process with python -X importtime. Reports the
+best wall time, the modules with the largest cumulative import time, and
+which heavy optional dependencies were loaded (these should only be imported
+when a stage first needs them).
+
+Example:
+
+.. code-block:: sh
+
+    python3 bin/benchmark_import.py --runs 5 --top 10
+"""
+import argparse
+import logging
+import subprocess
+import sys
+import time
+import typing
+
+_LOGGER = logging.getLogger("benchmark_import")
+
+# Modules that should not be loaded by import gruut or gruut --version
+HEAVY_MODULES = [
+    "babel",
+    "babel.numbers",
+    "dateparser",
+    "gruut_ipa",
+    "jsonlines",
+    "networkx",
+    "num2words",
+    "numpy",
+    "pycrfsuite",
+]
+
+COMMANDS = {
+    "import gruut": ["-c", "import gruut"],
+    "gruut --version": ["-m", "gruut", "--version"],
+}
+
+# -----------------------------------------------------------------------------
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(prog="benchmark_import.py")
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=5,
+        help="Number of processes to start per command (default: 5)",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="Number of slowest modules to print (default: 10)",
+    )
+    parser.add_argument(
+        "--debug", action="store_true", help="Print DEBUG messages to console"
+    )
+    args = parser.parse_args()
+
+    if args.debug:
+        logging.basicConfig(level=logging.DEBUG)
+    else:
+        logging.basicConfig(level=logging.INFO)
+
+    for name, command_args in COMMANDS.items():
+        results = [run_child(command_args) for _ in range(max(1, args.runs))]
+
+        # Best of runs
+        best_seconds, best_times = min(results, key=lambda r: r[0])
+        print(
+            "{0}: {1:0.1f} ms wall, {2:0.1f} ms import".format(
+                name, best_seconds * 1000, sum_top_level(best_times) / 1000
+            )
+        )
+
+        for module, cumulative_us in sorted(
+            best_times.items(), key=lambda kv: kv[1][1], reverse=True
+        )[: args.top]:
+            print("  {0:>8.1f} ms  {1}".format(cumulative_us[1] / 1000, module))
+
+        heavy_loaded = [m for m in HEAVY_MODULES if m in best_times]
+        print("  heavy modules loaded:", ", ".join(heavy_loaded) or "none")
+
+
+def run_child(
+    command_args: typing.List[str],
+) -> typing.Tuple[float, typing.Dict[str, typing.Tuple[int, int, int]]]:
+    """Run Python with -X importtime and return wall time and import times"""
+    command = [sys.executable, "-X", "importtime", *command_args]
+    _LOGGER.debug(command)
+
+    start_time = time.perf_counter()
+    proc = subprocess.run(
+        command,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    wall_seconds = time.perf_counter() - start_time
+
+    return wall_seconds, parse_importtime(proc.stderr)
+
+
+def parse_importtime(
+    stderr: str,
+) -> typing.Dict[str, typing.Tuple[int, int, int]]:
+    """Parse -X importtime output into module -> (self us, cumulative us, depth)"""
+    times: typing.Dict[str, typing.Tuple[int, int, int]] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3:
+            continue
+
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            # Header
+            continue
+
+        module_str = parts[2].rstrip()
+        module = module_str.strip()
+        depth = (len(module_str) - len(module_str.lstrip()) - 1) // 2
+        times[module] = (self_us, cumulative_us, depth)
+
+    return times
+
+
+def sum_top_level(times: typing.Dict[str, typing.Tuple[int, int, int]]) -> int:
+    """Total import time in microseconds (sum of top-level imports)"""
+    return sum(cumulative for _, cumulative, depth in times.values() if depth == 0)
+
+
+# -----------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Compare lexicon look up with database queries, cached queries, a preloaded lexicon, and a memory-mapped lexicon
+
+Reports load time and memory of the preloaded/memory-mapped lexicons, and look up speed.
+
+Example:
+
+.. code-block:: sh
+
+    python3 bin/benchmark_lexicon.py /path/to/lexicon.db --words 10000
+"""
+import argparse
+import logging
+import random
+import resource
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from gruut.phonemize import SqlitePhonemizer
+
+_LOGGER = logging.getLogger("benchmark_lexicon")
+
+# -----------------------------------------------------------------------------
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(prog="benchmark_lexicon.py")
+    parser.add_argument("lexicon", help="Path to lexicon database")
+    parser.add_argument(
+        "--words",
+        type=int,
+        default=5000,
+        help="Number of words to look up (default: 5000)",
+    )
+    parser.add_argument(
+        "--missing",
+        type=float,
+        default=0.1,
+        help="Fraction of looked up words that are not in the lexicon (default: 0.1)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument(
+        "--debug", action="store_true", help="Print DEBUG messages to console"
+    )
+    args = parser.parse_args()
+
+    if args.debug:
+        logging.basicConfig(level=logging.DEBUG)
+    else:
+        logging.basicConfig(level=logging.INFO)
+
+    random.seed(args.seed)
+    db_conn = sqlite3.connect(args.lexicon)
+
+    # Sample words from the lexicon, plus some that aren't in it
+    all_words = [row[0] for row in db_conn.execute("SELECT DISTINCT word FROM word_phonemes")]
+    words = random.choices(all_words, k=args.words)
+    for word_idx in range(int(len(words) * args.missing)):
+        words[word_idx] = words[word_idx] + "zzq"
+
+    random.shuffle(words)
+    _LOGGER.info(
+        "Looking up %s word(s) from %s word lexicon", len(words), len(all_words)
+    )
+
+    word_transform_funcs = [str.lower]
+
+    # Database queries
+    db_phonemizer = SqlitePhonemizer(db_conn, word_transform_funcs=word_transform_funcs)
+    start_time = time.perf_counter()
+    db_results = [db_phonemizer(word) for word in words]
+    db_seconds = time.perf_counter() - start_time
+
+    # Preloaded
+    rss_before = get_max_rss()
+    preload_phonemizer = SqlitePhonemizer(
+        db_conn, word_transform_funcs=word_transform_funcs, preload=True
+    )
+    rss_after = get_max_rss()
+
+    assert preload_phonemizer.preloaded is not None
+    preloaded = preload_phonemizer.preloaded
+
+    start_time = time.perf_counter()
+    preload_results = [preload_phonemizer(word) for word in words]
+    preload_seconds = time.perf_counter() - start_time
+
+    assert db_results == preload_results, "Preloaded results differ"
+
+    # Cached database queries (second pass over the same words)
+    start_time = time.perf_counter()
+    cached_results = [db_phonemizer(word) for word in words]
+    cached_seconds = time.perf_counter() - start_time
+
+    assert db_results == cached_results, "Cached results differ"
+
+    # Compiled and memory-mapped
+    with tempfile.TemporaryDirectory() as temp_dir:
+        bin_path = Path(temp_dir) / "lexicon.bin"
+        preloaded.save(bin_path)
+
+        mapped_phonemizer = SqlitePhonemizer(
+            db_conn, word_transform_funcs=word_transform_funcs, mapped_path=bin_path
+        )
+
+        assert mapped_phonemizer.preloaded is not None
+        mapped_load_seconds = mapped_phonemizer.preloaded.load_seconds
+        mapped_mb = mapped_phonemizer.preloaded.nbytes / (1024 * 1024)
+
+        start_time = time.perf_counter()
+        mapped_results = [mapped_phonemizer(word) for word in words]
+        mapped_seconds = time.perf_counter() - start_time
+
+    assert db_results == mapped_results, "Memory-mapped results differ"
+
+    print(
+        "preload: {0:0.2f}s, {1:0.1f} MB (lexicon), {2:0.1f} MB (max RSS increase)".format(
+            preloaded.load_seconds,
+            preloaded.nbytes / (1024 * 1024),
+            (rss_after - rss_before) / 1024,
+        )
+    )
+    print(
+        "mapped: {0:0.4f}s, {1:0.1f} MB (file)".format(mapped_load_seconds, mapped_mb)
+    )
+    print(
+        "database: {0:0.1f} words/s, cached: {1:0.1f} words/s, preloaded: {2:0.1f} words/s, mapped: {3:0.1f} words/s".format(
+            len(words) / db_seconds,
+            len(words) / cached_seconds,
+            len(words) / preload_seconds,
+            len(words) / mapped_seconds,
+        )
+    )
+
+    for cache_name, stats in db_phonemizer.cache_stats.items():
+        print(
+            "{0} cache: {1} hit(s), {2} miss(es), {3} eviction(s)".format(
+                cache_name, stats.hits, stats.misses, stats.evictions
+            )
+        )
+
+
+def get_max_rss() -> int:
+    """Get maximum resident memory of this process (KB on Linux)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+# -----------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""Compare startup time of Phonetisaurus graphs in .npz and memory-mapped .npy formats
+
+The .npy directory is converted from the .npz file, and includes the search
+index from bin/fst2npy.py even if the .npz file doesn't.
+
+Each format is loaded in a fresh process, which reports load time, time to
+guess the first word and to guess it again (with warm caches), and
+private/shared (file-backed) resident memory.
+
+Example:
+
+.. code-block:: sh
+
+    python3 bin/benchmark_phonetisaurus.py /path/to/graph.npz --word hello
+"""
+import argparse
+import json
+import logging
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from gruut.g2p_phonetisaurus import PhonetisaurusGraph, convert_graph
+
+_LOGGER = logging.getLogger("benchmark_phonetisaurus")
+
+# -----------------------------------------------------------------------------
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(prog="benchmark_phonetisaurus.py")
+    parser.add_argument("graph", help="Path to graph npz file from fst2npy.py")
+    parser.add_argument(
+        "--word", default="test", help="Word to guess after loading (default: test)"
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=3,
+        help="Number of processes to start per format (default: 3)",
+    )
+    parser.add_argument(
+        "--preload", action="store_true", help="Load graphs with preload=True"
+    )
+    parser.add_argument(
+        "--load-only", action="store_true", help=argparse.SUPPRESS,
+    )
+    parser.add_argument(
+        "--debug", action="store_true", help="Print DEBUG messages to console"
+    )
+    args = parser.parse_args()
+
+    if args.load_only:
+        # Child process
+        print(json.dumps(load_graph(args.graph, args.word, preload=args.preload)))
+        return
+
+    if args.debug:
+        logging.basicConfig(level=logging.DEBUG)
+    else:
+        logging.basicConfig(level=logging.INFO)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        graph_dir = Path(temp_dir) / "graph"
+
+        _LOGGER.info("Converting %s to %s", args.graph, graph_dir)
+        convert_graph(args.graph, graph_dir)
+
+        for format_name, graph_path in [("npz", args.graph), ("npy", graph_dir)]:
+            results = [
+                run_child(graph_path, args.word, preload=args.preload)
+                for _ in range(max(1, args.runs))
+            ]
+
+            # Best of runs
+            best = min(results, key=lambda r: r["load_seconds"])
+            print(
+                "{0}: load {1:0.4f}s, first guess {2:0.4f}s, repeat guess {3:0.4f}s, private {4:0.1f} MB, shared {5:0.1f} MB, guess: {6}".format(
+                    format_name,
+                    best["load_seconds"],
+                    best["guess_seconds"],
+                    best["repeat_seconds"],
+                    best["anon_kb"] / 1024,
+                    best["file_kb"] / 1024,
+                    " ".join(best["phonemes"]),
+                )
+            )
+
+
+def run_child(graph_path, word: str, preload: bool = False):
+    """Load graph in a fresh process and return its measurements"""
+    command = [sys.executable, __file__, str(graph_path), "--word", word, "--load-only"]
+    if preload:
+        command.append("--preload")
+
+    output = subprocess.check_output(command, universal_newlines=True)
+
+    return json.loads(output)
+
+
+def load_graph(graph_path, word: str, preload: bool = False):
+    """Load graph and guess one word twice (run in child process)"""
+    start_time = time.perf_counter()
+    phon_graph = PhonetisaurusGraph.load(graph_path, preload=preload)
+    load_seconds = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    _, _, phonemes = next(iter(phon_graph.g2p([word])))
+    guess_seconds = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    next(iter(phon_graph.g2p([word])))
+    repeat_seconds = time.perf_counter() - start_time
+
+    return {
+        "load_seconds": load_seconds,
+        "guess_seconds": guess_seconds,
+        "repeat_seconds": repeat_seconds,
+        "phonemes": list(phonemes),
+        **get_memory_kb(),
+    }
+
+
+def get_memory_kb():
+    """Private (anonymous) and file-backed resident memory of this process in KB"""
+    memory_kb = {"anon_kb": 0, "file_kb": 0}
+    status_path = Path("/proc/self/status")
+    if not status_path.is_file():
+        # Not Linux (max RSS is inherited from parent process, so it's a rough guide)
+        memory_kb["anon_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return memory_kb
+
+    with open(status_path, "r", encoding="utf-8") as status_file:
+        for line in status_file:
+            if line.startswith("RssAnon:"):
+                memory_kb["anon_kb"] = int(line.split()[1])
+            elif line.startswith("RssFile:"):
+                memory_kb["file_kb"] = int(line.split()[1])
+
+    return memory_kb
+
+
+# -----------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""Load test for gruut serve
+
+Sends concurrent requests and reports throughput and p50/p99 latency.
+Starts a loopback server (python3 -m gruut serve) unless --url or --unix-socket
+point to a running one.
+
+Example:
+
+.. code-block:: sh
+
+    python3 bin/benchmark_server.py test/test_sentences.txt --requests 1000 --concurrency 16
+"""
+import argparse
+import http.client
+import json
+import logging
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import typing
+from pathlib import Path
+from urllib.parse import urlparse
+
+_LOGGER = logging.getLogger("benchmark_server")
+
+# -----------------------------------------------------------------------------
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP connection over a Unix domain socket"""
+
+    def __init__(self, socket_path: str, timeout: float = 60):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(prog="benchmark_server.py")
+    parser.add_argument(
+        "sentences", help="Path to test sentences file with lang|text|truth lines"
+    )
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=500,
+        help="Total number of requests to send (default: 500)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Number of concurrent clients (default: 8)",
+    )
+    parser.add_argument("--url", help="URL of running server (http://host:port)")
+    parser.add_argument("--unix-socket", help="Unix socket of running server")
+    parser.add_argument(
+        "--batch-window-ms",
+        type=float,
+        default=5.0,
+        help="Batch window of loopback server (default: 5)",
+    )
+    parser.add_argument(
+        "--max-batch-size",
+        type=int,
+        default=32,
+        help="Maximum batch size of loopback server (default: 32)",
+    )
+    parser.add_argument(
+        "--debug", action="store_true", help="Print DEBUG messages to console"
+    )
+    args = parser.parse_args()
+
+    if args.debug:
+        logging.basicConfig(level=logging.DEBUG)
+    else:
+        logging.basicConfig(level=logging.INFO)
+
+    # lang|text|truth
+    texts: typing.List[typing.Tuple[str, str]] = []
+    with open(args.sentences, "r", encoding="utf-8") as sentences_file:
+        for line in sentences_file:
+            line = line.strip()
+            if (not line) or line.startswith("#"):
+                continue
+
+            lang, text = line.split("|", maxsplit=2)[:2]
+            texts.append((lang, text))
+
+    assert texts, "No test sentences"
+
+    server_proc: typing.Optional[subprocess.Popen] = None
+    temp_dir: typing.Optional[tempfile.TemporaryDirectory] = None
+
+    try:
+        if args.url:
+            url = urlparse(args.url)
+
+            def make_connection() -> http.client.HTTPConnection:
+                return http.client.HTTPConnection(
+                    url.hostname or "127.0.0.1", url.port or 80, timeout=60
+                )
+
+        else:
+            socket_path = args.unix_socket
+            if not socket_path:
+                # Start loopback server
+                temp_dir = tempfile.TemporaryDirectory()
+                socket_path = str(Path(temp_dir.name) / "gruut.sock")
+                server_proc = start_server(
+                    socket_path,
+                    lang=texts[0][0],
+                    batch_window_ms=args.batch_window_ms,
+                    max_batch_size=args.max_batch_size,
+                )
+
+            def make_connection() -> http.client.HTTPConnection:
+                return UnixHTTPConnection(socket_path)
+
+        wait_for_server(make_connection)
+
+        # Warm up
+        post_text(make_connection(), texts[0][1], texts[0][0])
+
+        latencies: typing.List[float] = []
+        latencies_lock = threading.Lock()
+        next_request = iter(range(args.requests))
+        next_lock = threading.Lock()
+
+        def run_client():
+            conn = make_connection()
+            while True:
+                with next_lock:
+                    request_idx = next(next_request, None)
+
+                if request_idx is None:
+                    break
+
+                lang, text = texts[request_idx % len(texts)]
+                start_time = time.perf_counter()
+                post_text(conn, text, lang)
+                end_time = time.perf_counter()
+
+                with latencies_lock:
+                    latencies.append(end_time - start_time)
+
+            conn.close()
+
+        start_time = time.perf_counter()
+        threads = [
+            threading.Thread(target=run_client) for _ in range(args.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        total_seconds = time.perf_counter() - start_time
+
+        health = get_json(make_connection(), "/health")
+    finally:
+        if server_proc is not None:
+            server_proc.terminate()
+            server_proc.wait()
+
+        if temp_dir is not None:
+            temp_dir.cleanup()
+
+    latencies.sort()
+    print(
+        "{0} request(s) in {1:0.2f}s: {2:0.1f} requests/s, p50: {3:0.1f} ms, p99: {4:0.1f} ms".format(
+            len(latencies),
+            total_seconds,
+            len(latencies) / total_seconds,
+            percentile(latencies, 0.50) * 1000,
+            percentile(latencies, 0.99) * 1000,
+        )
+    )
+
+    if health.get("batches"):
+        print(
+            "{0} batch(es), {1:0.1f} request(s) per batch".format(
+                health["batches"], health["requests"] / health["batches"]
+            )
+        )
+
+
+# -----------------------------------------------------------------------------
+
+
+def start_server(
+    socket_path: str, lang: str, batch_window_ms: float, max_batch_size: int
+) -> subprocess.Popen:
+    """Start gruut serve on a Unix socket"""
+    command = [
+        sys.executable,
+        "-m",
+        "gruut",
+        "serve",
+        "--language",
+        lang,
+        "--unix-socket",
+        socket_path,
+        "--batch-window-ms",
+        str(batch_window_ms),
+        "--max-batch-size",
+        str(max_batch_size),
+    ]
+    _LOGGER.debug(command)
+
+    return subprocess.Popen(command, env=os.environ.copy())
+
+
+def wait_for_server(
+    make_connection: typing.Callable[[], http.client.HTTPConnection],
+    timeout: float = 60,
+):
+    """Wait until server answers /health"""
+    end_time = time.monotonic() + timeout
+    while True:
+        try:
+            get_json(make_connection(), "/health")
+            break
+        except OSError:
+            if time.monotonic() > end_time:
+                raise
+
+            time.sleep(0.1)
+
+
+def post_text(conn: http.client.HTTPConnection, text: str, lang: str) -> typing.Any:
+    """POST text to /sentences and return JSON response"""
+    body = json.dumps({"text": text, "lang": lang}).encode("utf-8")
+    conn.request(
+        "POST", "/sentences", body, headers={"Content-Type": "application/json"}
+    )
+    response = conn.getresponse()
+    response_body = response.read()
+    assert response.status == 200, response_body
+
+    return json.loads(response_body)
+
+
+def get_json(conn: http.client.HTTPConnection, path: str) -> typing.Any:
+    """GET JSON from server"""
+    conn.request("GET", path)
+    response = conn.getresponse()
+    response_body = response.read()
+    conn.close()
+
+    return json.loads(response_body)
+
+
+def percentile(sorted_values: typing.Sequence[float], p: float) -> float:
+    """Nearest-rank percentile of sorted values"""
+    if not sorted_values:
+        return 0.0
+
+    idx = min(len(sorted_values) - 1, max(0, int(round(p * len(sorted_values))) - 1))
+    return sorted_values[idx]
+
+
+# -----------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,13 @@
 #!/usr/bin/env python3
-"""Convert a Phonetisaurus FST (printed with fstprint) to numpy arrays"""
+"""Convert a Phonetisaurus FST (printed with fstprint) to numpy arrays
+
+Writes an .npz file, or a directory of memory-mappable .npy files if the output
+path doesn't end with .npz.
+
+The graph includes an index (CSR out edges, final probabilities for every node,
+and pre-split symbols), so gruut.g2p_phonetisaurus doesn't need to build one
+when loading.
+"""
 import argparse
 import logging
 import typing
@@ -7,6 +15,8 @@ from pathlib import Path
 
 import numpy as np
 
+from gruut.g2p_phonetisaurus import index_graph, save_graph_dir
+
 _LOGGER = logging.getLogger("fst2npy")
 
 # -----------------------------------------------------------------------------
@@ -18,7 +28,9 @@ def main():
     parser.add_argument(
         "fst_text", help="Path to Phonetisaurus text FST (use fstprint)"
     )
-    parser.add_argument("npz", help="Path to write numpy npz file")
+    parser.add_argument(
+        "npz", help="Path to write numpy npz file (or npy directory without .npz)"
+    )
     args = parser.parse_args()
     args.fst_text = Path(args.fst_text)
     args.npz = Path(args.npz)
@@ -31,8 +43,11 @@ def main():
     _LOGGER.info("Converting %s to graph", args.fst_text)
     graph = fst2graph(args.fst_text)
     _LOGGER.info("Writing graph to %s", args.npz)
-    with open(args.npz, "wb") as npz_file:
-        np.savez(npz_file, **graph)
+    if args.npz.suffix == ".npz":
+        with open(args.npz, "wb") as npz_file:
+            np.savez(npz_file, **graph)
+    else:
+        save_graph_dir(graph, args.npz)
 
 
 def fst2graph(fst_path: typing.Union[str, Path]) -> typing.Dict[str, np.ndarray]:
@@ -93,19 +108,29 @@ def fst2graph(fst_path: typing.Union[str, Path]) -> typing.Dict[str, np.ndarray]
 
     assert start_node is not None, "No start node"
 
-    edges = sorted(edges, key=lambda e: e[0])
+    # Sort edges by from_node, keeping probabilities with their edges
+    edge_order = sorted(range(len(edges)), key=lambda i: edges[i][0])
 
-    return {
+    # Final nodes must be sorted for searching
+    final_order = sorted(range(len(final_nodes)), key=lambda i: final_nodes[i])
+
+    graph = {
         "start_node": np.array([start_node], dtype=np.int32),
-        "edges": np.array(edges, dtype=np.int32),
-        "edge_probs": np.array(edge_probs, dtype=np.float32),
-        "final_nodes": np.array(final_nodes, dtype=np.int32),
-        "final_probs": np.array(final_probs, dtype=np.float32),
+        "edges": np.array([edges[i] for i in edge_order], dtype=np.int32),
+        "edge_probs": np.array([edge_probs[i] for i in edge_order], dtype=np.float32),
+        "final_nodes": np.array([final_nodes[i] for i in final_order], dtype=np.int32),
+        "final_probs": np.array(
+            [final_probs[i] for i in final_order], dtype=np.float32
+        ),
         "symbols": np.array(
             [k for k, v in sorted(symbols.items(), key=lambda kv: kv[1])], dtype=object
         ),
     }
 
+    graph.update(index_graph(graph))
+
+    return graph
+
 
 # -----------------------------------------------------------------------------
 
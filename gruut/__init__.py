@@ -1,4 +1,7 @@
 """gruut module"""
+import concurrent.futures
+import functools
+import io
 import itertools
 import logging
 import re
@@ -8,10 +11,16 @@ import typing
 from enum import Enum
 from pathlib import Path
 
-from gruut.const import KNOWN_LANGS, TextProcessorSettings
+from gruut.const import (
+    KNOWN_LANGS,
+    REGEX_MATCH,
+    BreakType,
+    BreakWordNode,
+    TextProcessorSettings,
+)
 from gruut.resources import _DIR, _PACKAGE
 from gruut.text_processor import Sentence, TextProcessor
-from gruut.utils import resolve_lang
+from gruut.utils import leaves, resolve_lang
 
 # -----------------------------------------------------------------------------
 
@@ -21,6 +30,9 @@ __version__ = (_DIR / "VERSION").read_text(encoding="utf-8").strip()
 __author__ = "Michael Hansen (synesthesiam)"
 __all__ = [
     "sentences",
+    "asentences",
+    "sentences_batch",
+    "sentences_stream",
     "is_language_supported",
     "get_supported_languages",
     "TextProcessor",
@@ -29,8 +41,9 @@ __all__ = [
 
 # -----------------------------------------------------------------------------
 
-_LOCAL = threading.local()
-_PROCESSORS_LOCK = threading.RLock()
+# model prefix -> text processor (shared by all threads)
+_PROCESSORS: typing.Dict[str, TextProcessor] = {}
+_PROCESSORS_LOCK = threading.Lock()
 
 
 def sentences(
@@ -64,18 +77,7 @@ def sentences(
         sentences: iterable of Sentence objects
 
     """
-    model_prefix = "" if (not espeak) else "espeak"
-
-    with _PROCESSORS_LOCK:
-        if not hasattr(_LOCAL, "processors"):
-            _LOCAL.processors = {}
-
-        text_processor = _LOCAL.processors.get(model_prefix)
-        if text_processor is None:
-            text_processor = TextProcessor(default_lang=lang, model_prefix=model_prefix)
-            _LOCAL.processors[model_prefix] = text_processor
-
-    assert text_processor is not None
+    text_processor = _get_text_processor(lang=lang, espeak=espeak)
     graph, root = text_processor(text, lang=lang, ssml=ssml, **process_args)
 
     yield from text_processor.sentences(
@@ -91,6 +93,381 @@ def sentences(
     )
 
 
+def sentences_batch(
+    texts: typing.Iterable[str],
+    lang: str = "en_US",
+    ssml: bool = False,
+    espeak: bool = False,
+    major_breaks: bool = True,
+    minor_breaks: bool = True,
+    punctuations: bool = True,
+    explicit_lang: bool = True,
+    phonemes: bool = True,
+    break_phonemes: bool = True,
+    pos: bool = True,
+    batch_size: typing.Optional[int] = None,
+    **process_args,
+) -> typing.Iterable[typing.List[Sentence]]:
+    """
+    Process many texts at once and return the sentences of each text
+
+    Args:
+        texts: input texts or SSML documents (ssml=True)
+        lang: default language of input texts
+        ssml: True if input texts are SSML
+        espeak: True if eSpeak phonemes should be used
+        major_breaks: False if no sentence-breaking symbols in output
+        minor_breaks: False if no phrase-breaking symbols in output
+        punctuations: False if no word-surrounding symbols in output
+        batch_size: number of texts processed together (default: all)
+        **process_args: keyword arguments passed to TextProcessor.process_batch
+
+    Returns:
+        sentences: list of Sentence objects for each text (in order)
+
+    """
+    text_processor = _get_text_processor(lang=lang, espeak=espeak)
+
+    if batch_size is None:
+        batches: typing.Iterable[typing.Sequence[str]] = [list(texts)]
+    else:
+        assert batch_size > 0, "Batch size must be positive"
+        text_iter = iter(texts)
+        batches = iter(lambda: list(itertools.islice(text_iter, batch_size)), [])
+
+    for batch_texts in batches:
+        for graph, root in text_processor.process_batch(
+            batch_texts, lang=lang, ssml=ssml, **process_args
+        ):
+            yield list(
+                text_processor.sentences(
+                    graph,
+                    root,
+                    major_breaks=major_breaks,
+                    minor_breaks=minor_breaks,
+                    punctuations=punctuations,
+                    explicit_lang=explicit_lang,
+                    phonemes=phonemes,
+                    break_phonemes=break_phonemes,
+                    pos=pos,
+                )
+            )
+
+
+def sentences_stream(
+    text: typing.Union[str, typing.TextIO],
+    lang: str = "en_US",
+    espeak: bool = False,
+    major_breaks: bool = True,
+    minor_breaks: bool = True,
+    punctuations: bool = True,
+    explicit_lang: bool = True,
+    phonemes: bool = True,
+    break_phonemes: bool = True,
+    pos: bool = True,
+    chunk_size: int = 1024,
+    max_chunk_size: typing.Optional[int] = 1024 * 1024,
+    **process_args,
+) -> typing.Iterable[Sentence]:
+    """
+    Process plain text incrementally and return sentences as they are finished
+
+    Text is read and processed in chunks that are cut after major breaks
+    (periods, etc.), so only one chunk is in memory at a time. Output is the
+    same as sentences() for the whole text.
+
+    Args:
+        text: input text or file-like object with text (not SSML)
+        lang: default language of input text
+        espeak: True if eSpeak phonemes should be used
+        major_breaks: False if no sentence-breaking symbols in output
+        minor_breaks: False if no phrase-breaking symbols in output
+        punctuations: False if no word-surrounding symbols in output
+        chunk_size: minimum number of characters processed at a time
+        max_chunk_size: cut at whitespace if no major break is found within this many characters (None to disable)
+        **process_args: keyword arguments passed to TextProcessor.process
+
+    Returns:
+        sentences: iterable of Sentence objects
+
+    """
+    assert chunk_size > 0, "Chunk size must be positive"
+    assert not process_args.get("ssml"), "SSML can't be streamed"
+
+    text_processor = _get_text_processor(lang=lang, espeak=espeak)
+    settings = text_processor.get_settings(lang)
+
+    if isinstance(text, str):
+        text_file: typing.TextIO = io.StringIO(text)
+    else:
+        text_file = text
+
+    # Possible sentence boundary: major break at the end of a word, then
+    # whitespace. The whitespace stays with the sentence before it.
+    breaks_str = "|".join(
+        re.escape(b) for b in sorted(settings.major_breaks, key=len, reverse=True)
+    )
+    boundary_pattern = re.compile(r"(?<=\S)(?:{})+\s+(?=\S)".format(breaks_str))
+
+    # Breaks/whitespace at the end of the buffer may become a boundary once
+    # more text is read, so they are scanned again.
+    open_end_pattern = re.compile(r"(?:{}|\s)*\Z".format(breaks_str))
+    max_break_len = max((len(b) for b in settings.major_breaks), default=0)
+
+    buffer = ""
+    is_eof = False
+    min_cut = chunk_size
+    scan_pos = 0
+    sent_offset = 0
+    is_first_chunk = True
+
+    while True:
+        cut: typing.Optional[int] = None
+        is_forced = False
+
+        if is_eof:
+            # Process whatever is left
+            cut = len(buffer)
+        elif settings.major_breaks:
+            # Only scan text that hasn't been ruled out already
+            for match in boundary_pattern.finditer(buffer, scan_pos):
+                if match.end() < min_cut:
+                    continue
+
+                if _ends_with_abbreviation(buffer, match, settings):
+                    # Not a sentence break (e.g., "Dr. Smith")
+                    continue
+
+                cut = match.end()
+                break
+
+            if cut is None:
+                open_end = open_end_pattern.search(buffer, scan_pos)
+                assert open_end is not None
+                scan_pos = max(0, open_end.start() - max_break_len)
+
+        if (
+            (cut is None)
+            and (max_chunk_size is not None)
+            and (len(buffer) >= max_chunk_size)
+        ):
+            # No sentence boundary found, so cut at whitespace
+            cut = max(buffer.rfind("\n"), buffer.rfind(" ")) + 1
+            if cut <= 0:
+                cut = len(buffer)
+
+            is_forced = True
+            _LOGGER.debug("No sentence boundary in %s char(s)", len(buffer))
+
+        if cut is None:
+            # Need more text
+            text_block = text_file.read(chunk_size)
+            if text_block:
+                buffer += text_block
+            else:
+                is_eof = True
+
+            continue
+
+        chunk_text = buffer[:cut]
+        if (not chunk_text) and (not is_first_chunk):
+            # Empty text is still processed once, like sentences()
+            break
+
+        graph, root = text_processor(chunk_text, lang=lang, **process_args)
+
+        if (cut < len(buffer)) and (not is_forced):
+            # Make sure the chunk actually ends in a sentence break.
+            # Abbreviations like "Dr." are not breaks, for example.
+            last_leaf = None
+            for last_leaf in leaves(graph, root):
+                pass
+
+            if not (
+                isinstance(last_leaf, BreakWordNode)
+                and (last_leaf.break_type == BreakType.MAJOR)
+            ):
+                # Try a longer chunk
+                min_cut = cut + 1
+                scan_pos = cut
+                continue
+
+        num_chunk_sentences = 0
+        for sentence in text_processor.sentences(
+            graph,
+            root,
+            major_breaks=major_breaks,
+            minor_breaks=minor_breaks,
+            punctuations=punctuations,
+            explicit_lang=explicit_lang,
+            phonemes=phonemes,
+            break_phonemes=break_phonemes,
+            pos=pos,
+        ):
+            # Number sentences as if the whole text was processed at once
+            sentence.idx += sent_offset
+            for word in sentence.words:
+                word.sent_idx += sent_offset
+
+            num_chunk_sentences += 1
+            yield sentence
+
+        sent_offset += num_chunk_sentences
+        buffer = buffer[cut:]
+        min_cut = chunk_size
+        scan_pos = 0
+        is_first_chunk = False
+
+
+def _ends_with_abbreviation(
+    text: str, boundary: REGEX_MATCH, settings: TextProcessorSettings
+) -> bool:
+    """True if the word before a possible sentence boundary is an abbreviation"""
+    if not settings.abbreviations:
+        return False
+
+    word_start = boundary.start()
+    while (word_start > 0) and (not text[word_start - 1].isspace()):
+        word_start -= 1
+
+    # Word with its break and whitespace, like "Dr. "
+    word_text = text[word_start : boundary.end()]
+
+    settings.update_matchers()
+    assert settings.abbreviations_matcher is not None
+    return settings.abbreviations_matcher.match(word_text) is not None
+
+
+async def asentences(
+    text: str,
+    lang: str = "en_US",
+    ssml: bool = False,
+    espeak: bool = False,
+    major_breaks: bool = True,
+    minor_breaks: bool = True,
+    punctuations: bool = True,
+    explicit_lang: bool = True,
+    phonemes: bool = True,
+    break_phonemes: bool = True,
+    pos: bool = True,
+    executor: typing.Optional[concurrent.futures.Executor] = None,
+    **process_args,
+) -> typing.AsyncIterator[Sentence]:
+    """
+    Process text without blocking the event loop and return sentences
+
+    Processing runs on executor (default: the event loop's thread pool). Plain
+    text is processed in chunks (see sentences_stream), and at most one
+    sentence is processed ahead of the consumer. Models are loaded once and
+    shared by all concurrent calls.
+
+    With a ProcessPoolExecutor, the whole text is processed in a worker
+    process and its sentences are returned together.
+
+    Cancelling stops processing after the current chunk is finished.
+
+    Args:
+        text: input text or SSML (ssml=True)
+        lang: default language of input text
+        ssml: True if input text is SSML
+        espeak: True if eSpeak phonemes should be used
+        major_breaks: False if no sentence-breaking symbols in output
+        minor_breaks: False if no phrase-breaking symbols in output
+        punctuations: False if no word-surrounding symbols in output
+        executor: executor to process text on (None for default)
+        **process_args: keyword arguments passed to TextProcessor.process
+
+    Returns:
+        sentences: async iterable of Sentence objects
+
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    sentences_args = {
+        "lang": lang,
+        "espeak": espeak,
+        "major_breaks": major_breaks,
+        "minor_breaks": minor_breaks,
+        "punctuations": punctuations,
+        "explicit_lang": explicit_lang,
+        "phonemes": phonemes,
+        "break_phonemes": break_phonemes,
+        "pos": pos,
+        **process_args,
+    }
+
+    if isinstance(executor, concurrent.futures.ProcessPoolExecutor):
+        # Generators can't be sent to other processes
+        process_sentences = await loop.run_in_executor(
+            executor,
+            functools.partial(_sentences_list, text, ssml=ssml, **sentences_args),
+        )
+
+        for process_sentence in process_sentences:
+            yield process_sentence
+
+        return
+
+    if ssml:
+        sentence_iter = iter(sentences(text, ssml=True, **sentences_args))
+    else:
+        sentence_iter = iter(sentences_stream(text, **sentences_args))
+
+    # Generator is only advanced/closed by one executor thread at a time
+    iter_lock = threading.Lock()
+
+    def next_sentence() -> typing.Optional[Sentence]:
+        with iter_lock:
+            return next(sentence_iter, None)
+
+    def close_iter():
+        with iter_lock:
+            sentence_iter.close()
+
+    next_future = loop.run_in_executor(executor, next_sentence)
+    try:
+        while True:
+            sentence: typing.Optional[Sentence] = await next_future
+            if sentence is None:
+                break
+
+            # Process next sentence while this one is consumed
+            next_future = loop.run_in_executor(executor, next_sentence)
+            yield sentence
+    finally:
+        if next_future.done():
+            close_iter()
+        else:
+            # Cancelled or consumer stopped early while processing
+            next_future.cancel()
+            loop.run_in_executor(executor, close_iter)
+
+
+def _sentences_list(text: str, **sentences_args) -> typing.List[Sentence]:
+    """Process text and return all sentences (used in worker processes)"""
+    return list(sentences(text, **sentences_args))
+
+
+def _get_text_processor(lang: str, espeak: bool = False) -> TextProcessor:
+    """
+    Get or create text processor shared by all threads.
+
+    Models (lexicons, g2p, POS taggers) are loaded once per process and shared
+    read-only (see gruut.lang.MODEL_REGISTRY).
+    """
+    model_prefix = "" if (not espeak) else "espeak"
+
+    with _PROCESSORS_LOCK:
+        text_processor = _PROCESSORS.get(model_prefix)
+        if text_processor is None:
+            text_processor = TextProcessor(default_lang=lang, model_prefix=model_prefix)
+            _PROCESSORS[model_prefix] = text_processor
+
+    assert text_processor is not None
+    return text_processor
+
+
 # -----------------------------------------------------------------------------
 
 
@@ -3,16 +3,16 @@
 import argparse
 import csv
 import dataclasses
+import itertools
 import logging
 import os
 import sys
+import typing
 from enum import Enum
 from pathlib import Path
 
-import jsonlines
-
-from gruut.const import KNOWN_LANGS
-from gruut.text_processor import TextProcessor
+from gruut.const import G2P_BACKENDS, KNOWN_LANGS
+from gruut.text_processor import Sentence, TextProcessor
 from gruut.utils import print_graph
 
 # -----------------------------------------------------------------------------
@@ -50,6 +50,20 @@ def main():
 
         print(__version__)
         sys.exit(0)
+    elif sys.argv[1] == "serve":
+        # Local HTTP server
+        from gruut import server
+
+        server.serve(server.get_args(sys.argv[2:]))
+        sys.exit(0)
+    elif sys.argv[1:3] == ["lexicon", "optimize"]:
+        # Migrate lexicon databases in place
+        optimize_lexicons(get_optimize_args(sys.argv[3:]))
+        sys.exit(0)
+    elif sys.argv[1:3] == ["lexicon", "compile"]:
+        # Write memory-mappable lexicons next to databases
+        compile_lexicons(get_compile_args(sys.argv[3:]))
+        sys.exit(0)
 
     args = get_args()
 
@@ -65,12 +79,18 @@ def main():
 
     # -------------------------------------------------------------------------
 
-    text_processor = TextProcessor(
-        default_lang=args.language, model_prefix=args.model_prefix,
-    )
+    if args.jobs > 1:
+        # Text is processed in worker processes
+        text_processor = None
+    else:
+        text_processor = TextProcessor(
+            default_lang=args.language,
+            model_prefix=args.model_prefix,
+            **get_settings_args(args),
+        )
 
-    if args.debug:
-        _LOGGER.debug(text_processor.settings)
+        if args.debug:
+            _LOGGER.debug(text_processor.settings)
 
     if args.text:
         # Use arguments
@@ -122,6 +142,8 @@ def main():
             writer.writerow(row)
 
     else:
+        import jsonlines
+
         writer = jsonlines.Writer(sys.stdout, flush=True)
 
         def input_text(lines):
@@ -133,46 +155,324 @@ def main():
                 sentence_dict = dataclasses.asdict(sentence)
                 writer.write(sentence_dict)
 
-    for text, text_data in input_text(lines):
-        try:
-            graph, root = text_processor(
-                text,
-                ssml=args.ssml,
-                pos=(not args.no_pos),
-                phonemize=(not (args.no_lexicon and args.no_g2p)),
-                post_process=(not args.no_post_process),
-                verbalize_numbers=(not args.no_numbers),
-                verbalize_currency=(not args.no_currency),
-                verbalize_dates=(not args.no_dates),
-                verbalize_times=(not args.no_times),
+    process_args = {
+        "ssml": args.ssml,
+        "pos": (not args.no_pos),
+        "lazy_pos": args.lazy_pos,
+        "phonemize": (not (args.no_lexicon and args.no_g2p)),
+        "post_process": (not args.no_post_process),
+        "verbalize_numbers": (not args.no_numbers),
+        "verbalize_currency": (not args.no_currency),
+        "verbalize_dates": (not args.no_dates),
+        "verbalize_times": (not args.no_times),
+    }
+
+    sentences_args = {
+        "major_breaks": (not args.no_major_breaks),
+        "minor_breaks": (not args.no_minor_breaks),
+        "punctuations": (not args.no_punctuation),
+    }
+
+    def output_graph(graph, root, text_data):
+        if args.debug:
+            print_graph(
+                graph,
+                root,
+                print_func=lambda *print_args: _LOGGER.debug(
+                    " ".join(str(a) for a in print_args)
+                ),
             )
 
-            if args.debug:
-                print_graph(
-                    graph,
-                    root,
-                    print_func=lambda *print_args: _LOGGER.debug(
-                        " ".join(str(a) for a in print_args)
-                    ),
+        # Output sentences
+        sentences = list(text_processor.sentences(graph, root, **sentences_args))
+
+        output_sentences(sentences, writer, text_data)
+
+    def handle_error(text, error):
+        _LOGGER.exception(text)
+
+        if not args.no_fail:
+            raise TextProcessingError(text) from error
+
+    def process_text(text, text_data):
+        try:
+            graph, root = text_processor(text, **process_args)
+            output_graph(graph, root, text_data)
+        except Exception as e:
+            handle_error(text, e)
+
+    if args.jobs > 1:
+        # Process chunks of lines in worker processes
+        process_parallel(
+            args,
+            input_text(lines),
+            process_args=process_args,
+            sentences_args=sentences_args,
+            output_sentences=lambda sentences, text_data: output_sentences(
+                sentences, writer, text_data
+            ),
+        )
+    elif args.batch_size > 1:
+        # Process multiple lines at once
+        texts_and_data = input_text(lines)
+        while True:
+            batch = list(itertools.islice(texts_and_data, args.batch_size))
+            if not batch:
+                break
+
+            try:
+                graphs_roots = text_processor.process_batch(
+                    [text for text, _text_data in batch], **process_args
                 )
+            except Exception:
+                # Process lines individually to find which one(s) failed
+                _LOGGER.debug("Batch failed. Processing lines individually.")
+                for text, text_data in batch:
+                    process_text(text, text_data)
+
+                continue
+
+            for (text, text_data), (graph, root) in zip(batch, graphs_roots):
+                try:
+                    output_graph(graph, root, text_data)
+                except Exception as e:
+                    handle_error(text, e)
+    else:
+        for text, text_data in input_text(lines):
+            process_text(text, text_data)
+
+    if (text_processor is not None) and args.lazy_pos:
+        _LOGGER.debug(
+            "Skipped part of speech tagging for %s out of %s sentence(s)",
+            text_processor.num_pos_skipped,
+            text_processor.num_pos_skipped + text_processor.num_pos_tagged,
+        )
+
+
+# -----------------------------------------------------------------------------
 
-            # Output sentences
-            sentences = list(
-                text_processor.sentences(
-                    graph,
-                    root,
-                    major_breaks=(not args.no_major_breaks),
-                    minor_breaks=(not args.no_minor_breaks),
-                    punctuations=(not args.no_punctuation),
+# (sentences, error traceback) for each line processed by a worker
+CHUNK_RESULT_TYPE = typing.Tuple[
+    typing.Optional[typing.List[Sentence]], typing.Optional[str]
+]
+
+# Text processor of a worker process (see process_parallel)
+_WORKER_PROCESSOR: typing.Optional[TextProcessor] = None
+_WORKER_ARGS: typing.Dict[str, typing.Any] = {}
+
+
+def get_settings_args(args: argparse.Namespace) -> typing.Dict[str, typing.Any]:
+    """Language settings from command-line arguments (see gruut.lang.get_settings)"""
+    return {
+        "g2p_cache_path": args.g2p_cache,
+        "g2p_backend": args.g2p_backend,
+        "g2p_beam": args.g2p_beam,
+    }
+
+
+def process_parallel(
+    args: argparse.Namespace,
+    texts_and_data: typing.Iterable[typing.Tuple[str, typing.Any]],
+    process_args: typing.Dict[str, typing.Any],
+    sentences_args: typing.Dict[str, typing.Any],
+    output_sentences: typing.Callable[[typing.List[Sentence], typing.Any], None],
+):
+    """
+    Process lines with a pool of worker processes (gruut --jobs).
+
+    Lines are sent to workers in chunks and output in input order. At most a
+    few chunks per worker are in flight, so input is read as it's needed.
+    """
+    import multiprocessing
+    from collections import deque
+
+    max_pending = 4 * args.jobs
+
+    # (async result, [(text, text_data)])
+    pending: typing.Deque[
+        typing.Tuple[typing.Any, typing.List[typing.Tuple[str, typing.Any]]]
+    ] = deque()
+
+    def output_chunk():
+        chunk_result, chunk = pending.popleft()
+        for (text, text_data), (sentences, error) in zip(chunk, chunk_result.get()):
+            if error is not None:
+                _LOGGER.error("%s\n%s", text, error)
+
+                if not args.no_fail:
+                    raise TextProcessingError(text)
+
+                continue
+
+            output_sentences(sentences, text_data)
+
+    with multiprocessing.Pool(
+        processes=args.jobs,
+        initializer=_init_worker,
+        initargs=(
+            args.language,
+            args.model_prefix,
+            get_settings_args(args),
+            process_args,
+            sentences_args,
+            args.batch_size,
+        ),
+    ) as pool:
+        texts_and_data = iter(texts_and_data)
+        while True:
+            chunk = list(itertools.islice(texts_and_data, args.chunk_size))
+            if not chunk:
+                break
+
+            pending.append(
+                (
+                    pool.apply_async(
+                        _process_chunk, ([text for text, _text_data in chunk],)
+                    ),
+                    chunk,
                 )
             )
 
-            output_sentences(sentences, writer, text_data)
-        except Exception as e:
-            _LOGGER.exception(text)
+            if len(pending) >= max_pending:
+                # Wait for oldest chunk
+                output_chunk()
+
+        while pending:
+            output_chunk()
 
-            if not args.no_fail:
-                raise TextProcessingError(text) from e
+
+def _init_worker(
+    language: str,
+    model_prefix: typing.Optional[str],
+    settings_args: typing.Dict[str, typing.Any],
+    process_args: typing.Dict[str, typing.Any],
+    sentences_args: typing.Dict[str, typing.Any],
+    batch_size: int,
+):
+    """Create text processor and load models in a worker process"""
+    global _WORKER_PROCESSOR
+
+    _WORKER_PROCESSOR = TextProcessor(
+        default_lang=language, model_prefix=model_prefix or "", **settings_args
+    )
+    _WORKER_ARGS.update(
+        process_args=process_args, sentences_args=sentences_args, batch_size=batch_size
+    )
+
+    # Load models before any lines arrive
+    warmup_args = {**process_args, "ssml": False}
+    _WORKER_PROCESSOR("preload", **warmup_args)
+
+
+def _process_chunk(texts: typing.List[str]) -> typing.List[CHUNK_RESULT_TYPE]:
+    """Process lines in a worker process, returning (sentences, error) for each"""
+    import traceback
+
+    assert _WORKER_PROCESSOR is not None
+    text_processor = _WORKER_PROCESSOR
+    process_args = _WORKER_ARGS["process_args"]
+    sentences_args = _WORKER_ARGS["sentences_args"]
+
+    def process_text(text):
+        try:
+            graph, root = text_processor(text, **process_args)
+            return (list(text_processor.sentences(graph, root, **sentences_args)), None)
+        except Exception:
+            return (None, traceback.format_exc())
+
+    batch_size = _WORKER_ARGS["batch_size"]
+    if batch_size > 1:
+        results: typing.List[CHUNK_RESULT_TYPE] = []
+        for start_idx in range(0, len(texts), batch_size):
+            batch_texts = texts[start_idx : start_idx + batch_size]
+            try:
+                graphs_roots = text_processor.process_batch(
+                    batch_texts, **process_args
+                )
+                results.extend(
+                    (list(text_processor.sentences(graph, root, **sentences_args)), None)
+                    for graph, root in graphs_roots
+                )
+            except Exception:
+                # Process lines individually to find which one(s) failed
+                results.extend(process_text(text) for text in batch_texts)
+
+        return results
+
+    return [process_text(text) for text in texts]
+
+
+# -----------------------------------------------------------------------------
+
+
+def optimize_lexicons(args: argparse.Namespace):
+    """Optimize lexicon databases in place (gruut lexicon optimize)"""
+    import sqlite3
+
+    from gruut.lexicon2db import LEXICON_SCHEMA_VERSION, optimize_lexicon_db
+
+    if args.debug:
+        logging.basicConfig(level=logging.DEBUG)
+    else:
+        logging.basicConfig(level=logging.INFO)
+
+    for db_path in get_lexicon_db_paths(args.database):
+        conn = sqlite3.connect(str(db_path))
+        try:
+            if optimize_lexicon_db(conn, page_size=args.page_size, force=args.force):
+                _LOGGER.info(
+                    "Optimized %s (schema version %s)", db_path, LEXICON_SCHEMA_VERSION
+                )
+            else:
+                _LOGGER.info("%s is already optimized", db_path)
+        finally:
+            conn.close()
+
+
+def compile_lexicons(args: argparse.Namespace):
+    """Write compiled lexicons next to databases (gruut lexicon compile)"""
+    import sqlite3
+
+    from gruut.phonemize import PreloadedLexicon
+
+    if args.debug:
+        logging.basicConfig(level=logging.DEBUG)
+    else:
+        logging.basicConfig(level=logging.INFO)
+
+    for db_path in get_lexicon_db_paths(args.database):
+        conn = sqlite3.connect(str(db_path))
+        try:
+            lexicon = PreloadedLexicon(conn)
+        finally:
+            conn.close()
+
+        bin_path = db_path.with_suffix(".bin")
+        lexicon.save(bin_path)
+        _LOGGER.info("Compiled %s word(s) to %s", len(lexicon), bin_path)
+
+
+def get_lexicon_db_paths(
+    db_paths: typing.Iterable[typing.Union[str, Path]]
+) -> typing.List[Path]:
+    """Get lexicon database paths (default: all installed languages)"""
+    from gruut.utils import find_lang_dir
+
+    paths = [Path(p) for p in db_paths]
+    if not paths:
+        # Installed language data files (including prefixes like espeak)
+        for lang in sorted(KNOWN_LANGS):
+            lang_dir = find_lang_dir(lang)
+            if lang_dir is None:
+                continue
+
+            for db_path in itertools.chain(
+                [lang_dir / "lexicon.db"], lang_dir.glob("*/lexicon.db")
+            ):
+                if db_path.is_file() and (db_path not in paths):
+                    paths.append(db_path)
+
+    return paths
 
 
 # -----------------------------------------------------------------------------
@@ -232,6 +532,11 @@ def get_args() -> argparse.Namespace:
     parser.add_argument(
         "--no-pos", action="store_true", help="Disable part of speech tagger",
     )
+    parser.add_argument(
+        "--lazy-pos",
+        action="store_true",
+        help="Only tag sentences with words whose pronunciation depends on part of speech",
+    )
     parser.add_argument(
         "--no-lexicon", action="store_true", help="Disable phoneme lexicon database",
     )
@@ -261,6 +566,38 @@ def get_args() -> argparse.Namespace:
     parser.add_argument(
         "--no-fail", action="store_true", help="Skip lines that result in errors",
     )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1,
+        help="Number of lines to process together (default: 1)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes (default: 1)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=positive_int,
+        default=100,
+        help="Number of lines sent to a worker process at a time with --jobs (default: 100)",
+    )
+    parser.add_argument(
+        "--g2p-cache",
+        help="Path to SQLite database where guessed pronunciations are saved and reused",
+    )
+    parser.add_argument(
+        "--g2p-backend",
+        choices=sorted(G2P_BACKENDS),
+        help="Guess pronunciations with CRF model, Phonetisaurus graph, or both (a+b falls back to b)",
+    )
+    parser.add_argument(
+        "--g2p-beam",
+        type=int,
+        help="Width of Phonetisaurus beam search",
+    )
 
     # Miscellaneous
     parser.add_argument(
@@ -305,6 +642,58 @@ def get_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+def positive_int(value: str) -> int:
+    """Parse an integer argument that must be at least 1"""
+    int_value = int(value)
+    if int_value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1: {value}")
+
+    return int_value
+
+
+def get_optimize_args(argv: typing.Sequence[str]) -> argparse.Namespace:
+    """Parse command-line arguments for gruut lexicon optimize"""
+    from gruut.lexicon2db import DEFAULT_PAGE_SIZE
+
+    parser = argparse.ArgumentParser(prog="gruut lexicon optimize")
+    parser.add_argument(
+        "database",
+        nargs="*",
+        help="Path to lexicon database (default: all installed languages)",
+    )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=DEFAULT_PAGE_SIZE,
+        help=f"Database page size in bytes (default: {DEFAULT_PAGE_SIZE})",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Optimize even if database is already up to date",
+    )
+    parser.add_argument(
+        "--debug", action="store_true", help="Print DEBUG messages to console"
+    )
+
+    return parser.parse_args(argv)
+
+
+def get_compile_args(argv: typing.Sequence[str]) -> argparse.Namespace:
+    """Parse command-line arguments for gruut lexicon compile"""
+    parser = argparse.ArgumentParser(prog="gruut lexicon compile")
+    parser.add_argument(
+        "database",
+        nargs="*",
+        help="Path to lexicon database (default: all installed languages)",
+    )
+    parser.add_argument(
+        "--debug", action="store_true", help="Print DEBUG messages to console"
+    )
+
+    return parser.parse_args(argv)
+
+
 # -----------------------------------------------------------------------------
 
 
@@ -9,9 +9,6 @@ from datetime import datetime
 from decimal import Decimal
 from enum import Enum
 
-import babel
-import babel.core
-import babel.numbers
 
 # alias -> full language name
 LANG_ALIASES = {
@@ -40,6 +37,15 @@ ENGLISH_LANGS = {"en-us", "en-gb"}
 # Languages that are expected to have a model directory
 KNOWN_LANGS = set(itertools.chain(ENGLISH_LANGS, LANG_ALIASES.values()))
 
+# Grapheme to phoneme backends for guessing pronunciations.
+# "a+b" uses backend b when a doesn't return any phonemes.
+G2P_BACKENDS = {
+    "crf": ["crf"],
+    "phonetisaurus": ["phonetisaurus"],
+    "crf+phonetisaurus": ["crf", "phonetisaurus"],
+    "phonetisaurus+crf": ["phonetisaurus", "crf"],
+}
+
 
 try:
     # Python >= 3.7
@@ -62,13 +68,22 @@ NODE_TYPE = int
 # Property used to hold node data in text graph
 DATA_PROP = "data"
 
+# Property used to hold the pipeline stages a node is settled for (no more changes)
+SETTLED_PROP = "settled"
+
+# Graph property used to hold the number of pipeline passes done in TextProcessor.process
+NUM_PASSES_PROP = "num_passes"
+
 
 class GraphType:
-    """Type wrapper for networkx graph"""
+    """Type wrapper for text graph (gruut.graph.TextGraph or networkx.DiGraph)"""
 
     nodes: typing.Dict[NODE_TYPE, typing.Dict[typing.Any, typing.Any]]
     """Get node data for the graph"""
 
+    graph: typing.Dict[typing.Any, typing.Any]
+    """Get properties of the graph itself"""
+
     def add_node(self, node: NODE_TYPE, **kwargs):
         """Add a new node to the graph"""
         pass
@@ -581,6 +596,130 @@ def maybe_compile_regex(
     return re.compile(str_or_pattern)
 
 
+class PatternMatcher:
+    """
+    Ordered regexes that are tried together with as few regex calls as possible.
+
+    Consecutive patterns are joined into one alternation with a group per
+    pattern, so the first pattern (in order) that matches is found with a single
+    call. Patterns with flags, back references, or conditionals can't be joined
+    and are tried on their own in the same order.
+
+    If every pattern is plain text (no regex syntax), has_match uses substring
+    checks instead of a regex.
+
+    The patterns as given are kept in sources, so owners can check whether the
+    matcher is still up to date.
+    """
+
+    # Back references and conditionals depend on group names/numbers
+    UNJOINABLE_PATTERN = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+
+    # Named groups would be duplicated in the alternation
+    NAMED_GROUP_PATTERN = re.compile(r"(?<!\\)\(\?P<\w+>")
+
+    # Characters with special meaning in a regex
+    SPECIAL_CHARS = set(".^$*+?{}[]\\|()")
+
+    def __init__(self, patterns: typing.Iterable[REGEX_TYPE]):
+        self.sources: typing.List[REGEX_TYPE] = list(patterns)
+        self.patterns: typing.List[REGEX_PATTERN] = [
+            maybe_compile_regex(p) for p in self.sources
+        ]
+
+        # (regex, index of first pattern, is joined)
+        self.groups: typing.List[typing.Tuple[REGEX_PATTERN, int, bool]] = []
+
+        joinable: typing.List[int] = []
+        for pattern_idx, pattern in enumerate(self.patterns):
+            if PatternMatcher.is_joinable(pattern):
+                joinable.append(pattern_idx)
+            else:
+                self._add_group(joinable)
+                joinable = []
+                self.groups.append((pattern, pattern_idx, False))
+
+        self._add_group(joinable)
+
+        # Plain text patterns
+        self.literals: typing.Optional[typing.List[str]] = None
+        if all(PatternMatcher.is_literal(p) for p in self.patterns):
+            self.literals = [typing.cast(str, p.pattern) for p in self.patterns]
+
+    def match(self, text: str) -> typing.Optional[REGEX_MATCH]:
+        """Match of the first pattern that matches at the start of text"""
+        for regex, first_idx, is_joined in self.groups:
+            match = regex.match(text)
+            if match is None:
+                continue
+
+            if not is_joined:
+                return match
+
+            # Match winning pattern again for its own groups (_0 -> 0)
+            assert match.lastgroup is not None
+            pattern_idx = first_idx + int(match.lastgroup[1:])
+
+            return self.patterns[pattern_idx].match(text)
+
+        return None
+
+    def has_match(self, text: str) -> bool:
+        """True if any pattern matches anywhere in text"""
+        if self.literals is not None:
+            for literal in self.literals:
+                if literal in text:
+                    return True
+        else:
+            for regex, _, _ in self.groups:
+                if regex.search(text) is not None:
+                    return True
+
+        return False
+
+    def _add_group(self, pattern_idxs: typing.List[int]):
+        if not pattern_idxs:
+            return
+
+        if len(pattern_idxs) > 1:
+            try:
+                joined_str = "|".join(
+                    "(?P<_{0}>{1})".format(
+                        group_idx,
+                        PatternMatcher.NAMED_GROUP_PATTERN.sub(
+                            "(?:", self.patterns[pattern_idx].pattern
+                        ),
+                    )
+                    for group_idx, pattern_idx in enumerate(pattern_idxs)
+                )
+                self.groups.append((re.compile(joined_str), pattern_idxs[0], True))
+                return
+            except re.error:
+                # Fall back to trying patterns one at a time
+                pass
+
+        for pattern_idx in pattern_idxs:
+            self.groups.append((self.patterns[pattern_idx], pattern_idx, False))
+
+    @staticmethod
+    def is_literal(pattern: REGEX_PATTERN) -> bool:
+        """True if pattern only matches its own text"""
+        return (
+            isinstance(pattern.pattern, str)
+            and (pattern.flags == re.UNICODE)
+            and PatternMatcher.SPECIAL_CHARS.isdisjoint(pattern.pattern)
+        )
+
+    @staticmethod
+    def is_joinable(pattern: REGEX_PATTERN) -> bool:
+        """True if pattern can be part of an alternation without changing it"""
+        return (
+            isinstance(pattern.pattern, str)
+            and (pattern.flags == re.UNICODE)
+            and (PatternMatcher.UNJOINABLE_PATTERN.search(pattern.pattern) is None)
+        )
+
+
 # -----------------------------------------------------------------------------
 
 
@@ -634,6 +773,16 @@ class TextProcessorSettings:
     abbreviations: typing.Dict[REGEX_TYPE, str] = field(default_factory=dict)
     """Regex, replacement template pairs that may expand words after minor breaks are matched"""
 
+    replacements_matcher: typing.Optional[PatternMatcher] = field(
+        default=None, init=False, repr=False
+    )
+    """Combined replacement patterns (see update_matchers)"""
+
+    abbreviations_matcher: typing.Optional[PatternMatcher] = field(
+        default=None, init=False, repr=False
+    )
+    """Combined abbreviation patterns in order (see update_matchers)"""
+
     spell_out_words: typing.Dict[str, str] = field(default_factory=dict)
     """Written form, spoken form pairs that are applied with interpret-as="spell-out" in <say-as>"""
 
@@ -731,6 +880,9 @@ class TextProcessorSettings:
     post_process_sentence: typing.Optional[PostProcessSentence] = None
     """Optional function to post-process each sentence in the graph before post_process_graph"""
 
+    post_process_needs_pos: bool = False
+    """True if post_process_sentence uses part of speech tags (sentences are always tagged)"""
+
     def __post_init__(self):
         # Languages/locales
         if self.babel_locale is None:
@@ -775,6 +927,9 @@ class TextProcessorSettings:
 
         self.abbreviations = compiled_abbreviations
 
+        # Find the first matching abbreviation or any replacement in one regex call
+        self.update_matchers()
+
         # Strings that should be separated from words, but do not cause any breaks
         if (self.begin_punctuations_pattern is None) and self.begin_punctuations:
             pattern_str = "|".join(re.escape(b) for b in self.begin_punctuations)
@@ -830,6 +985,9 @@ class TextProcessorSettings:
         # Currency
         if not self.currencies:
             try:
+                import babel
+                import babel.numbers
+
                 # Look up currencies for locale
                 locale_obj = babel.Locale(self.babel_locale)
 
@@ -848,5 +1006,25 @@ class TextProcessorSettings:
                 self.currencies, key=operator.length_hint, reverse=True
             )
 
+    def update_matchers(self):
+        """
+        Rebuild abbreviations_matcher and replacements_matcher if the patterns
+        in abbreviations or replacements have changed since they were built.
+
+        Called by TextProcessor before each text, so the matchers can be used
+        without checks while words are processed.
+        """
+        abbreviation_patterns = list(self.abbreviations)
+        if (self.abbreviations_matcher is None) or (
+            self.abbreviations_matcher.sources != abbreviation_patterns
+        ):
+            self.abbreviations_matcher = PatternMatcher(abbreviation_patterns)
+
+        replacement_patterns = [pattern for pattern, _ in self.replacements]
+        if (self.replacements_matcher is None) or (
+            self.replacements_matcher.sources != replacement_patterns
+        ):
+            self.replacements_matcher = PatternMatcher(replacement_patterns)
+
 
 # -----------------------------------------------------------------------------
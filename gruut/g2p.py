@@ -33,15 +33,19 @@ Pre-trained models have the following settings:
 import argparse
 import base64
 import itertools
+import json
 import logging
 import os
+import sqlite3
 import sys
+import threading
 import time
 import typing
 import unicodedata
 from pathlib import Path
 
-import pycrfsuite
+if typing.TYPE_CHECKING:
+    import pycrfsuite
 
 _LOGGER = logging.getLogger("gruut.g2p")
 
@@ -57,10 +61,12 @@ class GraphemesToPhonemes:
 
     def __init__(
         self,
-        crf_tagger: typing.Union[str, Path, pycrfsuite.Tagger],
+        crf_tagger: typing.Union[str, Path, "pycrfsuite.Tagger"],
         eps_phoneme: str = EPS_PHONEME,
         phoneme_join: str = PHONEME_JOIN,
     ):
+        import pycrfsuite
+
         if isinstance(crf_tagger, pycrfsuite.Tagger):
             self.crf_tagger = crf_tagger
         else:
@@ -68,6 +74,10 @@ class GraphemesToPhonemes:
             self.crf_tagger = pycrfsuite.Tagger()
             self.crf_tagger.open(str(crf_tagger))
 
+        # CRF tagger keeps state between set and tag, so it can't be used by
+        # multiple threads at once.
+        self.tagger_lock = threading.Lock()
+
         # Empty phoneme (dropped)
         self.eps_phoneme = eps_phoneme
 
@@ -77,7 +87,10 @@ class GraphemesToPhonemes:
     def __call__(self, word: str, normalize: bool = True) -> typing.Sequence[str]:
         """Guess phonemes for word"""
         features = GraphemesToPhonemes.word2features(word, normalize=normalize)
-        coded_phonemes = self.crf_tagger.tag(features)
+
+        with self.tagger_lock:
+            coded_phonemes = self.crf_tagger.tag(features)
+
         phonemes: typing.List[str] = []
 
         for coded_ps in coded_phonemes:
@@ -158,6 +171,80 @@ class GraphemesToPhonemes:
         return base64.b64decode(s.encode("ascii")).decode()
 
 
+class GuessStore:
+    """
+    On-disk store of guessed phonemes (SQLite).
+
+    Can be shared by every process on a host. Words are keyed by a model id,
+    so guesses from different models don't mix.
+    """
+
+    def __init__(self, db_path: typing.Union[str, Path]):
+        self.db_path = Path(db_path)
+        self._local = threading.local()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Database connection for the current thread"""
+        conn = getattr(self._local, "connection", None)
+        if conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+            # Autocommit, and wait for other processes that are writing
+            conn = sqlite3.connect(
+                str(self.db_path), timeout=30, isolation_level=None
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS guesses "
+                + "(model TEXT, word TEXT, phonemes TEXT, PRIMARY KEY (model, word))"
+            )
+
+            self._local.connection = conn
+
+        return conn
+
+    def get(self, model_id: str, word: str) -> typing.Optional[typing.List[str]]:
+        """Get guessed phonemes for a word, if stored"""
+        for row in self.connection.execute(
+            "SELECT phonemes FROM guesses WHERE model = ? AND word = ?",
+            (model_id, word),
+        ):
+            return json.loads(row[0])
+
+        return None
+
+    def add(self, model_id: str, word: str, phonemes: typing.Sequence[str]):
+        """Store guessed phonemes for a word"""
+        self.connection.execute(
+            "INSERT OR REPLACE INTO guesses (model, word, phonemes) VALUES (?, ?, ?)",
+            (model_id, word, json.dumps(list(phonemes), ensure_ascii=False)),
+        )
+
+    def items(
+        self, model_id: str, limit: typing.Optional[int] = None
+    ) -> typing.Iterable[typing.Tuple[str, typing.List[str]]]:
+        """Yield (word, phonemes) for a model, most recently stored last"""
+        rows = self.connection.execute(
+            "SELECT word, phonemes FROM "
+            + "(SELECT rowid, word, phonemes FROM guesses WHERE model = ? "
+            + "ORDER BY rowid DESC LIMIT ?) ORDER BY rowid",
+            (model_id, -1 if limit is None else limit),
+        )
+
+        for word, phonemes_str in rows:
+            yield word, json.loads(phonemes_str)
+
+    @staticmethod
+    def get_model_id(model_path: typing.Union[str, Path]) -> str:
+        """Id for a model file that changes when the file does"""
+        model_path = Path(model_path).absolute()
+        model_stat = model_path.stat()
+
+        return f"{model_path}:{model_stat.st_size}:{model_stat.st_mtime_ns}"
+
+
 # -----------------------------------------------------------------------------
 
 
@@ -180,6 +267,8 @@ def train(
 
     remove_phonemes = set(remove_phonemes or [])
 
+    import pycrfsuite
+
     trainer = pycrfsuite.Trainer(verbose=False)
 
     with open(corpus_path, "r", encoding="utf-8") as corpus:
@@ -1,10 +1,16 @@
 #!/usr/bin/env python3
 """Guess word pronunciations using a Phonetisaurus FST
 
-See bin/fst2npz.py to convert an FST to a numpy graph.
+See bin/fst2npy.py to convert an FST to a numpy graph.
+
+Graphs are either a single .npz file or a directory of uncompressed .npy files
+(one per array). A directory is memory-mapped when loaded, so it opens in
+constant time and its pages are shared by all processes that use it.
+Use the "convert" command to create a directory from an .npz file.
 """
 import argparse
 import logging
+import math
 import os
 import sys
 import time
@@ -37,7 +43,9 @@ def main():
         "predict", help="Predict phonemes for word(s)"
     )
     predict_parser.add_argument(
-        "--graph", required=True, help="Path to graph npz file from fst2npy.py"
+        "--graph",
+        required=True,
+        help="Path to graph npz file or directory from fst2npy.py",
     )
     predict_parser.add_argument(
         "words", nargs="*", help="Words to guess pronunciations for"
@@ -88,7 +96,9 @@ def main():
     # ----
     test_parser = sub_parsers.add_parser("test", help="Test G2P model on a lexicon")
     test_parser.add_argument(
-        "--graph", required=True, help="Path to graph npz file from fst2npy.py"
+        "--graph",
+        required=True,
+        help="Path to graph npz file or directory from fst2npy.py",
     )
     test_parser.add_argument(
         "texts", nargs="*", help="Lines with '<word> <phoneme> <phoneme> ...'"
@@ -116,12 +126,34 @@ def main():
         action="store_true",
         help="Preload graph into memory before starting",
     )
+    test_parser.add_argument(
+        "--compare-engines",
+        action="store_true",
+        help="Also run the other search engine and compare words/sec",
+    )
     test_parser.set_defaults(func=do_test)
 
+    # -------
+    # Convert
+    # -------
+    convert_parser = sub_parsers.add_parser(
+        "convert", help="Convert npz graph to a directory of memory-mappable npy files"
+    )
+    convert_parser.add_argument("npz", help="Path to graph npz file from fst2npy.py")
+    convert_parser.add_argument("graph_dir", help="Path to output directory")
+    convert_parser.set_defaults(func=do_convert)
+
     # ----------------
     # Shared arguments
     # ----------------
     for sub_parser in [predict_parser, test_parser]:
+        sub_parser.add_argument(
+            "--vectorized",
+            action="store_true",
+            help="Use vectorized (numpy) beam search",
+        )
+
+    for sub_parser in [predict_parser, test_parser, convert_parser]:
         sub_parser.add_argument(
             "--debug", action="store_true", help="Print DEBUG messages to console"
         )
@@ -167,6 +199,7 @@ def do_predict(args):
         beam=args.beam,
         min_beam=args.min_beam,
         beam_scale=args.beam_scale,
+        vectorized=args.vectorized,
     ):
         if not phonemes:
             _LOGGER.warning("No pronunciation for %s (%s)", word, graphemes)
@@ -211,23 +244,35 @@ def do_test(args):
         lexicon[word] = actual_phonemes
 
     # Predict phonemes
-    predicted_phonemes = {}
-    start_time = time.perf_counter()
+    predicted_phonemes, predict_seconds = predict_lexicon(
+        phon_graph, lexicon, args, vectorized=args.vectorized
+    )
 
-    for word in lexicon:
-        for _, _, guessed_phonemes in phon_graph.g2p(
-            [word],
-            beam=args.beam,
-            min_beam=args.min_beam,
-            beam_scale=args.beam_scale,
-            max_guesses=1,
-        ):
-            predicted_phonemes[word] = " ".join(guessed_phonemes)
+    if args.compare_engines:
+        # Run the other search engine on the same words
+        other_phonemes, other_seconds = predict_lexicon(
+            phon_graph, lexicon, args, vectorized=not args.vectorized
+        )
 
-            # Only one guess
-            break
+        num_different = sum(
+            1
+            for word, phonemes in predicted_phonemes.items()
+            if other_phonemes.get(word) != phonemes
+        )
 
-    end_time = time.perf_counter()
+        if args.vectorized:
+            python_seconds, numpy_seconds = other_seconds, predict_seconds
+        else:
+            python_seconds, numpy_seconds = predict_seconds, other_seconds
+
+        print(
+            "python words/sec:",
+            round(len(lexicon) / python_seconds, 2),
+            "vectorized words/sec:",
+            round(len(lexicon) / numpy_seconds, 2),
+            "different guesses:",
+            num_different,
+        )
 
     # Calculate PER
     num_errors = 0
@@ -249,24 +294,152 @@ def do_test(args):
 
     # Calculate results
     per = round(num_errors / num_phonemes, 2)
-    wps = round(len(predicted_phonemes) / (end_time - start_time), 2)
+    wps = round(len(predicted_phonemes) / predict_seconds, 2)
     print("PER:", per, "Errors:", num_errors, "words/sec:", wps)
 
     if num_missing > 0:
         print("Total missing:", num_missing)
 
 
+def predict_lexicon(
+    phon_graph: "PhonetisaurusGraph",
+    lexicon: typing.Dict[str, str],
+    args: argparse.Namespace,
+    vectorized: bool = False,
+) -> typing.Tuple[typing.Dict[str, str], float]:
+    """Guess one pronunciation for each lexicon word. Returns guesses and seconds."""
+    predicted_phonemes = {}
+    start_time = time.perf_counter()
+
+    for word in lexicon:
+        for _, _, guessed_phonemes in phon_graph.g2p(
+            [word],
+            beam=args.beam,
+            min_beam=args.min_beam,
+            beam_scale=args.beam_scale,
+            max_guesses=1,
+            vectorized=vectorized,
+        ):
+            predicted_phonemes[word] = " ".join(guessed_phonemes)
+
+            # Only one guess
+            break
+
+    end_time = time.perf_counter()
+
+    return predicted_phonemes, end_time - start_time
+
+
 # -----------------------------------------------------------------------------
 
-_NOT_FINAL = object()
+
+def do_convert(args):
+    """Convert npz graph to a directory of npy files"""
+    _LOGGER.debug("Loading graph from %s", args.npz)
+    convert_graph(args.npz, args.graph_dir)
+
+    _LOGGER.info("Wrote graph to %s", args.graph_dir)
+
+
+def convert_graph(
+    npz_path: typing.Union[str, Path], graph_dir: typing.Union[str, Path]
+):
+    """Convert npz graph to a directory of npy files (adding index if missing)"""
+    with np.load(npz_path, allow_pickle=True) as np_graph:
+        graph = dict(np_graph)
+
+    if "out_offsets" not in graph:
+        # Graph from older fst2npy.py
+        graph.update(index_graph(graph))
+
+    save_graph_dir(graph, graph_dir)
+
+
+def split_symbol(symbol_str: str) -> typing.List[str]:
+    """Split FST symbol into graphemes/phonemes ("_" is empty)"""
+    return symbol_str.replace("_", "").split("|")
+
+
+def index_graph(graph: NUMPY_GRAPH) -> NUMPY_GRAPH:
+    """Create arrays that let PhonetisaurusGraph search without building caches.
+
+    Edges must be sorted by from_node.
+
+    * out_offsets - out edges of node n are out_offsets[n]:out_offsets[n + 1] (CSR)
+    * node_final_probs - final probability of every node (NaN if not final)
+    * symbol_parts - unique graphemes/phonemes from split symbols
+    * symbol_part_ids/symbol_part_offsets - parts of each symbol (CSR)
+    """
+    edges = np.asarray(graph["edges"])
+    final_nodes = np.asarray(graph["final_nodes"])
+
+    num_nodes = 1 + max(
+        int(np.asarray(graph["start_node"]).item()),
+        int(edges[:, :2].max()) if len(edges) > 0 else 0,
+        int(final_nodes.max()) if len(final_nodes) > 0 else 0,
+    )
+
+    out_offsets = np.searchsorted(
+        edges[:, 0], np.arange(num_nodes + 1, dtype=np.int64)
+    ).astype(np.int64)
+
+    node_final_probs = np.full(num_nodes, np.nan, dtype=np.float32)
+    node_final_probs[final_nodes] = graph["final_probs"]
+
+    # str -> id
+    part_ids: typing.Dict[str, int] = {}
+    symbol_part_ids: typing.List[int] = []
+    symbol_part_offsets = [0]
+    for symbol_str in graph["symbols"]:
+        for part in split_symbol(str(symbol_str)):
+            symbol_part_ids.append(part_ids.setdefault(part, len(part_ids)))
+
+        symbol_part_offsets.append(len(symbol_part_ids))
+
+    return {
+        "out_offsets": out_offsets,
+        "node_final_probs": node_final_probs,
+        "symbol_parts": np.array(list(part_ids.keys()), dtype=str),
+        "symbol_part_ids": np.array(symbol_part_ids, dtype=np.int32),
+        "symbol_part_offsets": np.array(symbol_part_offsets, dtype=np.int64),
+    }
+
+
+def save_graph_dir(graph: NUMPY_GRAPH, graph_dir: typing.Union[str, Path]):
+    """Save graph as a directory of uncompressed npy files (no pickled objects)"""
+    graph_dir = Path(graph_dir)
+    graph_dir.mkdir(parents=True, exist_ok=True)
+
+    for array_name in graph.keys():
+        array = np.asarray(graph[array_name])
+        if array.dtype == object:
+            # Fixed-width unicode strings instead of pickled objects
+            array = array.astype(str)
+
+        np.save(graph_dir / f"{array_name}.npy", array, allow_pickle=False)
+
+
+def load_graph_dir(graph_dir: typing.Union[str, Path]) -> NUMPY_GRAPH:
+    """Memory-map a directory of npy files written by save_graph_dir"""
+    # Plain ndarray views avoid np.memmap overhead when indexing (no copy)
+    return {
+        npy_path.stem: np.asarray(
+            np.load(npy_path, mmap_mode="r", allow_pickle=False)
+        )
+        for npy_path in Path(graph_dir).glob("*.npy")
+    }
+
+
+# -----------------------------------------------------------------------------
 
 
 class PhonetisaurusGraph:
     """Graph of numpy arrays that represents a Phonetisaurus FST
 
-    Also contains shared cache of edges and final state probabilities.
-    These caches are necessary to ensure that the .npz file stays small and fast
-    to load.
+    Graphs from bin/fst2npy.py (or the convert command) contain an index with
+    out edges in CSR form, final probabilities for every node, and pre-split
+    symbols (see index_graph). Older graphs without the index use a shared cache
+    of edges and final state probabilities that is filled during search.
     """
 
     def __init__(self, graph: NUMPY_GRAPH, preload: bool = False):
@@ -279,10 +452,23 @@ class PhonetisaurusGraph:
         self.edge_probs = self.graph["edge_probs"]
 
         # int -> [str]
-        self.symbols = []
-        for symbol_str in self.graph["symbols"]:
-            symbol_list = symbol_str.replace("_", "").split("|")
-            self.symbols.append((len(symbol_list), symbol_list))
+        self.symbols: typing.List[typing.Tuple[int, typing.List[str]]] = []
+        if "symbol_parts" in self.graph:
+            # Pre-split
+            symbol_parts = self.graph["symbol_parts"].tolist()
+            part_ids = self.graph["symbol_part_ids"].tolist()
+            part_offsets = self.graph["symbol_part_offsets"].tolist()
+            for part_start, part_end in zip(part_offsets[:-1], part_offsets[1:]):
+                self.symbols.append(
+                    (
+                        part_end - part_start,
+                        [symbol_parts[i] for i in part_ids[part_start:part_end]],
+                    )
+                )
+        else:
+            for symbol_str in self.graph["symbols"]:
+                symbol_list = split_symbol(symbol_str)
+                self.symbols.append((len(symbol_list), symbol_list))
 
         # nodes that are accepting states
         self.final_nodes = self.graph["final_nodes"]
@@ -290,12 +476,36 @@ class PhonetisaurusGraph:
         # node -> probability
         self.final_probs = self.graph["final_probs"]
 
+        # Index from fst2npy.py
+        # node -> first out edge (CSR)
+        self.out_offsets: typing.Optional[np.ndarray] = None
+
+        # node -> final probability (NaN if not final)
+        self.node_final_probs: typing.Optional[np.ndarray] = None
+
+        if ("out_offsets" in self.graph) and ("node_final_probs" in self.graph):
+            self.out_offsets = self.graph["out_offsets"]
+            self.node_final_probs = self.graph["node_final_probs"]
+
+        # Created on first use of g2p_one_vectorized
+        self.search_index: typing.Optional["_SearchIndex"] = None
+
         # Cache
         self.preloaded = preload
         self.out_edges: typing.Dict[int, typing.List[int]] = defaultdict(list)
-        self.final_node_probs: typing.Dict[int, typing.Any] = {}
-
-        if preload:
+        # None if node is not final
+        self.final_node_probs: typing.Dict[int, typing.Optional[float]] = {}
+
+        if self.out_offsets is not None:
+            # Index makes caches unnecessary
+            self.preloaded = False
+            if preload:
+                # Read arrays into memory instead of mapping them
+                self.edges = np.array(self.edges)
+                self.edge_probs = np.array(self.edge_probs)
+                self.out_offsets = np.array(self.out_offsets)
+                self.node_final_probs = np.array(self.node_final_probs)
+        elif preload:
             # Load out edges
             for edge_idx, (from_node, *_) in enumerate(self.edges):
                 self.out_edges[from_node].append(edge_idx)
@@ -305,12 +515,33 @@ class PhonetisaurusGraph:
 
     @staticmethod
     def load(graph_path: typing.Union[str, Path], **kwargs) -> "PhonetisaurusGraph":
-        """Load .npz file with numpy graph"""
-        np_graph = np.load(graph_path, allow_pickle=True)
+        """Load .npz file or memory-map directory of .npy files with numpy graph"""
+        if Path(graph_path).is_dir():
+            np_graph = load_graph_dir(graph_path)
+        else:
+            np_graph = np.load(graph_path, allow_pickle=True)
+
         return PhonetisaurusGraph(np_graph, **kwargs)
 
+    def _first_edge(self, node: int) -> int:
+        """Index of first edge from node (edges are sorted by from_node)"""
+        # Binary search without np.searchsorted, which would copy the edges[:, 0]
+        # column and read the whole (memory-mapped) edge array.
+        low, high = 0, len(self.edges)
+        while low < high:
+            mid = (low + high) // 2
+            if self.edges[mid, 0] < node:
+                low = mid + 1
+            else:
+                high = mid
+
+        return low
+
     def g2p(
-        self, words: typing.Iterable[typing.Union[str, typing.Sequence[str]]], **kwargs
+        self,
+        words: typing.Iterable[typing.Union[str, typing.Sequence[str]]],
+        vectorized: bool = False,
+        **kwargs,
     ) -> typing.Iterable[
         typing.Tuple[
             typing.Union[str, typing.Sequence[str]],
@@ -318,9 +549,10 @@ class PhonetisaurusGraph:
             typing.Sequence[str],
         ],
     ]:
-        """Guess phonemes for words"""
+        """Guess phonemes for words (vectorized uses g2p_one_vectorized)"""
+        g2p_one = self.g2p_one_vectorized if vectorized else self.g2p_one
         for word in words:
-            for graphemes, phonemes in self.g2p_one(word, **kwargs):
+            for graphemes, phonemes in g2p_one(word, **kwargs):
                 yield word, graphemes, phonemes
 
     def g2p_one(
@@ -398,41 +630,53 @@ class PhonetisaurusGraph:
                 assert node is not None
 
                 if not next_graphemes:
-                    if self.preloaded:
-                        final_prob = self.final_node_probs.get(node, _NOT_FINAL)
-                    else:
+                    final_prob: typing.Optional[float] = None
+                    if self.node_final_probs is not None:
+                        # Indexed
+                        final_prob = float(self.node_final_probs[node])
+                        if math.isnan(final_prob):
+                            # Not a final state
+                            final_prob = None
+                    elif self.preloaded or (node in self.final_node_probs):
                         final_prob = self.final_node_probs.get(node)
-                        if final_prob is None:
-                            final_idx = int(np.searchsorted(self.final_nodes, node))
-                            if self.final_nodes[final_idx] == node:
-                                # Cache
-                                final_prob = float(self.final_probs[final_idx])
-                                self.final_node_probs[node] = final_prob
-                            else:
-                                # Not a final state
-                                final_prob = _NOT_FINAL
-                                self.final_node_probs[node] = final_prob
-
-                    if final_prob != _NOT_FINAL:
-                        final_prob = typing.cast(float, final_prob)
+                    else:
+                        final_idx = int(np.searchsorted(self.final_nodes, node))
+                        if (final_idx < len(self.final_nodes)) and (
+                            self.final_nodes[final_idx] == node
+                        ):
+                            final_prob = float(self.final_probs[final_idx])
+
+                        # Cache (None if not a final state)
+                        self.final_node_probs[node] = final_prob
+
+                    if final_prob is not None:
                         q_next.append((prob + final_prob, None, [], output, True))
 
                 len_next_graphemes = len(next_graphemes)
-                if self.preloaded:
+                edge_idxs: typing.Sequence[int]
+                if self.out_offsets is not None:
+                    # Indexed
+                    edge_idxs = range(
+                        self.out_offsets[node], self.out_offsets[node + 1]
+                    )
+                elif self.preloaded:
                     # Was pre-loaded in __init__
                     edge_idxs = self.out_edges[node]
                 else:
                     # Build cache during search
                     maybe_edge_idxs = self.out_edges.get(node)
                     if maybe_edge_idxs is None:
-                        edge_idx = int(np.searchsorted(self.edges[:, 0], node))
-                        edge_idxs = []
-                        while self.edges[edge_idx][0] == node:
-                            edge_idxs.append(edge_idx)
+                        edge_idx = self._first_edge(node)
+                        edge_list: typing.List[int] = []
+                        while (edge_idx < len(self.edges)) and (
+                            self.edges[edge_idx][0] == node
+                        ):
+                            edge_list.append(edge_idx)
                             edge_idx += 1
 
                         # Cache
-                        self.out_edges[node] = edge_idxs
+                        self.out_edges[node] = edge_list
+                        edge_idxs = edge_list
                     else:
                         edge_idxs = maybe_edge_idxs
 
@@ -479,6 +723,291 @@ class PhonetisaurusGraph:
             # No guesses
             yield graphemes, []
 
+    def g2p_one_vectorized(
+        self,
+        word: typing.Union[str, typing.Sequence[str]],
+        eps: str = "<eps>",
+        beam: int = 5000,
+        min_beam: int = 100,
+        beam_scale: float = 0.6,
+        grapheme_separator: str = "",
+        max_guesses: int = 1,
+    ) -> typing.Iterable[typing.Tuple[typing.Sequence[str], typing.Sequence[str]]]:
+        """Guess phonemes for word with a beam search over numpy arrays.
+
+        Gives the same guesses as g2p_one. All edges of the search frontier are
+        expanded at once, and phonemes are only gathered for complete guesses
+        by following back-pointers.
+        """
+        current_beam = beam
+        graphemes: typing.Sequence[str] = []
+
+        if isinstance(word, str):
+            word = word.strip()
+
+            if grapheme_separator:
+                graphemes = word.split(grapheme_separator)
+            else:
+                graphemes = list(word)
+        else:
+            graphemes = word
+
+        if not graphemes:
+            return
+
+        index = self._get_search_index(eps)
+        num_graphemes = len(graphemes)
+
+        # symbol -> position -> True if symbol's graphemes match at position.
+        # Epsilon matches anywhere except the end of the word.
+        symbol_matches = np.zeros(
+            (len(self.symbols), num_graphemes + 1), dtype=np.bool_
+        )
+        symbol_matches[index.eps_symbols, :num_graphemes] = True
+        for position in range(num_graphemes):
+            for symbol_len in range(
+                1, min(index.max_symbol_len, num_graphemes - position) + 1
+            ):
+                symbol_idxs = index.grapheme_symbols.get(
+                    tuple(graphemes[position : position + symbol_len])
+                )
+                if symbol_idxs is not None:
+                    symbol_matches[symbol_idxs, position] = True
+
+        # Back-pointers for every hypothesis that survived pruning.
+        # Output symbol is -1 when no phonemes were added.
+        hyp_parents: typing.List[int] = [-1]
+        hyp_olabels: typing.List[int] = [-1]
+
+        # Frontier (in the same order as the q list of g2p_one)
+        nodes = np.array([self.start_node], dtype=np.int64)
+        probs = np.zeros(1, dtype=np.float64)
+        positions = np.zeros(1, dtype=np.int64)
+        hyps = np.zeros(1, dtype=np.int64)
+        is_final = np.zeros(1, dtype=np.bool_)
+
+        # (prob, phonemes)
+        best_heap: typing.List[typing.Tuple[float, typing.Sequence[str]]] = []
+
+        # Avoid duplicate guesses
+        guessed_phonemes: typing.Set[typing.Tuple[str, ...]] = set()
+
+        while len(nodes) > 0:
+            done_with_word = False
+
+            # Complete guesses
+            for frontier_idx in np.flatnonzero(is_final):
+                phonemes = self._backtrack(
+                    int(hyps[frontier_idx]), hyp_parents, hyp_olabels
+                )
+                if phonemes not in guessed_phonemes:
+                    best_heap.append((probs[frontier_idx], phonemes))
+                    guessed_phonemes.add(phonemes)
+
+                if len(best_heap) >= max_guesses:
+                    done_with_word = True
+                    break
+
+            if done_with_word:
+                break
+
+            active_idxs = np.flatnonzero(~is_final)
+
+            # Hypotheses that consumed all graphemes and are in a final state
+            end_idxs = active_idxs[positions[active_idxs] == num_graphemes]
+            end_final_probs = index.final_probs[nodes[end_idxs]]
+            end_is_final = ~np.isnan(end_final_probs)
+            end_idxs = end_idxs[end_is_final]
+            end_probs = probs[end_idxs] + end_final_probs[end_is_final]
+
+            # All out edges of active hypotheses
+            edge_starts = index.out_offsets[nodes[active_idxs]]
+            edge_counts = index.out_offsets[nodes[active_idxs] + 1] - edge_starts
+            edge_frontier_idxs = np.repeat(active_idxs, edge_counts)
+            edge_idxs = np.arange(len(edge_frontier_idxs), dtype=np.int64) + np.repeat(
+                edge_starts - (np.cumsum(edge_counts) - edge_counts), edge_counts
+            )
+
+            edge_rows = self.edges[edge_idxs]
+            edge_positions = positions[edge_frontier_idxs]
+            edge_ilabels = edge_rows[:, 2]
+            edge_ok = symbol_matches[edge_ilabels, edge_positions]
+
+            edge_idxs = edge_idxs[edge_ok]
+            edge_rows = edge_rows[edge_ok]
+            edge_frontier_idxs = edge_frontier_idxs[edge_ok]
+            edge_ilabels = edge_ilabels[edge_ok]
+
+            edge_probs = probs[edge_frontier_idxs] + self.edge_probs[edge_idxs]
+            edge_positions = (
+                edge_positions[edge_ok] + index.symbol_consumes[edge_ilabels]
+            )
+            edge_olabels = np.where(
+                index.symbol_is_eps[edge_ilabels], -1, edge_rows[:, 3]
+            )
+
+            # Candidates in the order g2p_one creates them: by hypothesis, with
+            # the final state first and then edges in order.
+            cand_frontier_idxs = np.concatenate((end_idxs, edge_frontier_idxs))
+            cand_order = np.lexsort(
+                (
+                    np.concatenate((np.full(len(end_idxs), -1), edge_idxs)),
+                    cand_frontier_idxs,
+                )
+            )
+
+            cand_frontier_idxs = cand_frontier_idxs[cand_order]
+            cand_probs = np.concatenate((end_probs, edge_probs))[cand_order]
+            cand_nodes = np.concatenate(
+                (np.full(len(end_idxs), -1), edge_rows[:, 1])
+            )[cand_order]
+            cand_positions = np.concatenate(
+                (np.full(len(end_idxs), num_graphemes), edge_positions)
+            )[cand_order]
+            cand_olabels = np.concatenate((np.full(len(end_idxs), -1), edge_olabels))[
+                cand_order
+            ]
+            cand_is_final = np.concatenate(
+                (
+                    np.ones(len(end_idxs), dtype=np.bool_),
+                    np.zeros(len(edge_idxs), dtype=np.bool_),
+                )
+            )[cand_order]
+
+            # Keep best hypotheses.
+            # Ties are broken by creation order, like the stable sort in g2p_one.
+            if len(cand_probs) > current_beam:
+                partition_idxs = np.argpartition(cand_probs, current_beam - 1)
+                kth_prob = cand_probs[partition_idxs[current_beam - 1]]
+                better_idxs = np.flatnonzero(cand_probs < kth_prob)
+                tied_idxs = np.flatnonzero(cand_probs == kth_prob)
+                keep_idxs = np.sort(
+                    np.concatenate(
+                        (better_idxs, tied_idxs[: current_beam - len(better_idxs)])
+                    )
+                )
+            else:
+                keep_idxs = np.arange(len(cand_probs))
+
+            keep_idxs = keep_idxs[np.argsort(cand_probs[keep_idxs], kind="stable")]
+
+            # New hypotheses point back to the ones they were expanded from
+            first_hyp = len(hyp_parents)
+            hyp_parents.extend(hyps[cand_frontier_idxs[keep_idxs]].tolist())
+            hyp_olabels.extend(cand_olabels[keep_idxs].tolist())
+
+            nodes = cand_nodes[keep_idxs]
+            probs = cand_probs[keep_idxs]
+            positions = cand_positions[keep_idxs]
+            is_final = cand_is_final[keep_idxs]
+            hyps = np.arange(first_hyp, first_hyp + len(keep_idxs), dtype=np.int64)
+
+            current_beam = max(min_beam, (int(current_beam * beam_scale)))
+
+        # Yield guesses
+        if best_heap:
+            for _, guess_phonemes in sorted(best_heap, key=lambda item: item[0])[
+                :max_guesses
+            ]:
+                yield graphemes, [p for p in guess_phonemes if p]
+        else:
+            # No guesses
+            yield graphemes, []
+
+    def _backtrack(
+        self, hyp: int, hyp_parents: typing.List[int], hyp_olabels: typing.List[int]
+    ) -> typing.Tuple[str, ...]:
+        """Gather output phonemes of a hypothesis from its back-pointers"""
+        olabels: typing.List[int] = []
+        while hyp > 0:
+            olabel = hyp_olabels[hyp]
+            if olabel >= 0:
+                olabels.append(olabel)
+
+            hyp = hyp_parents[hyp]
+
+        return tuple(
+            phoneme
+            for olabel in reversed(olabels)
+            for phoneme in self.symbols[olabel][1]
+        )
+
+    def _get_search_index(self, eps: str) -> "_SearchIndex":
+        """Create (once) the arrays needed by g2p_one_vectorized"""
+        if (self.search_index is None) or (self.search_index.eps != eps):
+            self.search_index = _SearchIndex.create(self, eps)
+
+        return self.search_index
+
+
+class _SearchIndex:
+    """Out edges in CSR form and symbol tables for the vectorized search"""
+
+    def __init__(
+        self,
+        eps: str,
+        out_offsets: np.ndarray,
+        final_probs: np.ndarray,
+        grapheme_symbols: typing.Dict[typing.Tuple[str, ...], typing.List[int]],
+        eps_symbols: typing.List[int],
+        symbol_consumes: np.ndarray,
+        symbol_is_eps: np.ndarray,
+    ):
+        self.eps = eps
+
+        # node -> first out edge (edges are sorted by from_node)
+        self.out_offsets = out_offsets
+
+        # node -> final probability (NaN if not final)
+        self.final_probs = final_probs
+
+        # graphemes -> symbol indexes
+        self.grapheme_symbols = grapheme_symbols
+        self.max_symbol_len = max((len(g) for g in grapheme_symbols), default=0)
+
+        self.eps_symbols = eps_symbols
+
+        # symbol -> number of graphemes consumed (0 for epsilon)
+        self.symbol_consumes = symbol_consumes
+        self.symbol_is_eps = symbol_is_eps
+
+    @staticmethod
+    def create(phon_graph: PhonetisaurusGraph, eps: str) -> "_SearchIndex":
+        """Build index from graph arrays"""
+        if (phon_graph.out_offsets is not None) and (
+            phon_graph.node_final_probs is not None
+        ):
+            # From fst2npy.py
+            out_offsets = phon_graph.out_offsets
+            final_probs = phon_graph.node_final_probs
+        else:
+            graph_index = index_graph(phon_graph.graph)
+            out_offsets = graph_index["out_offsets"]
+            final_probs = graph_index["node_final_probs"]
+
+        grapheme_symbols: typing.Dict[typing.Tuple[str, ...], typing.List[int]] = {}
+        eps_symbols: typing.List[int] = []
+        symbol_consumes = np.zeros(len(phon_graph.symbols), dtype=np.int64)
+        symbol_is_eps = np.zeros(len(phon_graph.symbols), dtype=np.bool_)
+
+        for symbol_idx, (symbol_len, symbol_list) in enumerate(phon_graph.symbols):
+            if symbol_list == [eps]:
+                eps_symbols.append(symbol_idx)
+                symbol_is_eps[symbol_idx] = True
+            else:
+                grapheme_symbols.setdefault(tuple(symbol_list), []).append(symbol_idx)
+                symbol_consumes[symbol_idx] = symbol_len
+
+        return _SearchIndex(
+            eps=eps,
+            out_offsets=out_offsets,
+            final_probs=final_probs,
+            grapheme_symbols=grapheme_symbols,
+            eps_symbols=eps_symbols,
+            symbol_consumes=symbol_consumes,
+            symbol_is_eps=symbol_is_eps,
+        )
+
 
 # -----------------------------------------------------------------------------
 
@@ -0,0 +1,489 @@
+"""Compact ordered tree used as the text processing graph"""
+import typing
+
+from gruut.const import NODE_TYPE
+
+# Initial space between labels of neighboring leaves in the frontier
+_LABEL_GAP = 2 ** 32
+
+# -----------------------------------------------------------------------------
+
+
+class TextGraph:
+    """
+    Ordered tree of text processing nodes backed by parallel lists.
+
+    Implements the subset of the networkx.DiGraph API described by GraphType,
+    so existing pipeline functions and post-processors keep working. Node ids
+    are expected to be small, mostly contiguous integers (len(graph) is used to
+    create new ones).
+
+    Children are kept in insertion order, and appending a child is O(1).
+    A node may have more than one parent (e.g., collapsed times), in which case
+    it is only visited once during depth-first traversal.
+
+    The graph also keeps a live frontier: the leaves under the first root in
+    depth-first order, as a linked list with ordering labels. Every node has a
+    change stamp that is updated when it is created or marked as changed, so
+    pipeline stages can visit only the leaves that are new or changed since
+    they last ran (see changed_leaves). Removing edges invalidates the frontier,
+    which is then rebuilt with a full traversal the next time it is needed.
+    """
+
+    def __init__(self):
+        # node -> attributes (node data is stored under DATA_PROP)
+        self.nodes: typing.Dict[NODE_TYPE, typing.Dict[typing.Any, typing.Any]] = {}
+
+        # Properties of the graph itself (like networkx.DiGraph.graph)
+        self.graph: typing.Dict[typing.Any, typing.Any] = {}
+
+        # node -> [child node] in order
+        self._children: typing.List[typing.List[NODE_TYPE]] = []
+
+        # node -> [parent node]
+        self._parents: typing.List[typing.List[NODE_TYPE]] = []
+
+        # Number of nodes that have more than one parent
+        self._num_shared: int = 0
+
+        # Node whose leaves make up the frontier (first node to get a child)
+        self._root: typing.Optional[NODE_TYPE] = None
+
+        # Frontier of leaves as a linked list.
+        # Labels increase in depth-first order.
+        self._leaf_prev: typing.Dict[NODE_TYPE, typing.Optional[NODE_TYPE]] = {}
+        self._leaf_next: typing.Dict[NODE_TYPE, typing.Optional[NODE_TYPE]] = {}
+        self._leaf_label: typing.Dict[NODE_TYPE, int] = {}
+        self._first_leaf: typing.Optional[NODE_TYPE] = None
+        self._last_leaf: typing.Optional[NODE_TYPE] = None
+        self._frontier_valid: bool = True
+
+        # Change log: stamp -> node
+        self._changes: typing.List[NODE_TYPE] = []
+
+        # node -> last change stamp
+        self._stamps: typing.Dict[NODE_TYPE, int] = {}
+
+        # stage -> stamp when the stage last started
+        self._stage_stamps: typing.Dict[typing.Any, int] = {}
+
+    # -------------------------------------------------------------------------
+    # GraphType
+    # -------------------------------------------------------------------------
+
+    def add_node(self, node: NODE_TYPE, **kwargs):
+        """Add a new node to the graph (or update its attributes)"""
+        attrs = self.nodes.get(node)
+        if attrs is None:
+            self._ensure_node(node)
+            self.nodes[node] = kwargs
+            self.mark_changed(node)
+        else:
+            attrs.update(kwargs)
+
+    def add_edge(self, src: NODE_TYPE, dst: NODE_TYPE):
+        """Add a new edge to the graph"""
+        if src not in self.nodes:
+            self.add_node(src)
+
+        if dst not in self.nodes:
+            self.add_node(dst)
+
+        dst_parents = self._parents[dst]
+        if src in dst_parents:
+            # Edge already exists
+            return
+
+        if self._frontier_valid:
+            self._update_frontier(src, dst)
+
+        if len(dst_parents) == 1:
+            self._num_shared += 1
+
+        dst_parents.append(src)
+        self._children[src].append(dst)
+
+    def out_degree(self, node: NODE_TYPE) -> int:
+        """Get number of outgoing edges from a node"""
+        return len(self._children[node])
+
+    def successors(self, node: NODE_TYPE) -> typing.Iterable[NODE_TYPE]:
+        """Yield nodes on outgoing edges"""
+        return iter(self._children[node])
+
+    def predecessors(self, node: NODE_TYPE) -> typing.Iterable[NODE_TYPE]:
+        """Yield nodes from incoming edges"""
+        return iter(self._parents[node])
+
+    def out_edges(
+        self, node: NODE_TYPE
+    ) -> typing.Iterable[typing.Tuple[NODE_TYPE, NODE_TYPE]]:
+        """Yield outgoing edges from a node"""
+        return [(node, child) for child in self._children[node]]
+
+    def add_edges_from(
+        self, edges: typing.Iterable[typing.Tuple[NODE_TYPE, NODE_TYPE]]
+    ):
+        """Add edges from iterable"""
+        for src, dst in edges:
+            self.add_edge(src, dst)
+
+    def remove_edges_from(
+        self, edges: typing.Iterable[typing.Tuple[NODE_TYPE, NODE_TYPE]]
+    ):
+        """Remove edges from iterable"""
+        # Children to remove are grouped by parent so each child list is only
+        # rebuilt once (removing many edges one at a time is quadratic).
+        removed_children: typing.Dict[NODE_TYPE, typing.Set[NODE_TYPE]] = {}
+        for src, dst in list(edges):
+            if (src not in self.nodes) or (dst not in self.nodes):
+                continue
+
+            dst_parents = self._parents[dst]
+            if src not in dst_parents:
+                continue
+
+            if len(dst_parents) == 2:
+                self._num_shared -= 1
+
+            dst_parents.remove(src)
+            removed_children.setdefault(src, set()).add(dst)
+
+        for src, dsts in removed_children.items():
+            src_children = self._children[src]
+            src_children[:] = [child for child in src_children if child not in dsts]
+            self._frontier_valid = False
+
+            if not src_children:
+                # Node is a leaf again
+                self.mark_changed(src)
+
+    def __len__(self) -> int:
+        """Get number of nodes in the graph"""
+        return len(self.nodes)
+
+    # -------------------------------------------------------------------------
+    # networkx compatibility (e.g., nx.dfs_preorder_nodes)
+    # -------------------------------------------------------------------------
+
+    def __iter__(self) -> typing.Iterator[NODE_TYPE]:
+        return iter(self.nodes)
+
+    def __contains__(self, node: typing.Any) -> bool:
+        return node in self.nodes
+
+    def __getitem__(self, node: NODE_TYPE) -> typing.Sequence[NODE_TYPE]:
+        """Ordered children of a node (adjacency)"""
+        return self._children[node]
+
+    def neighbors(self, node: NODE_TYPE) -> typing.Iterable[NODE_TYPE]:
+        """Same as successors"""
+        return self.successors(node)
+
+    def is_directed(self) -> bool:
+        """Always a directed graph"""
+        return True
+
+    def is_multigraph(self) -> bool:
+        """Never a multi-graph"""
+        return False
+
+    # -------------------------------------------------------------------------
+    # Traversal
+    # -------------------------------------------------------------------------
+
+    def dfs_preorder_nodes(self, source: NODE_TYPE) -> typing.Iterable[NODE_TYPE]:
+        """Yield nodes in depth-first pre-order starting from source"""
+        children = self._children
+        stack = [source]
+
+        if self._num_shared < 1:
+            # Strictly a tree, so no node can be reached twice
+            while stack:
+                node = stack.pop()
+                yield node
+
+                node_children = children[node]
+                if node_children:
+                    stack.extend(reversed(node_children))
+        else:
+            visited: typing.Set[NODE_TYPE] = set()
+            while stack:
+                node = stack.pop()
+                if node in visited:
+                    continue
+
+                visited.add(node)
+                yield node
+
+                node_children = children[node]
+                if node_children:
+                    stack.extend(reversed(node_children))
+
+    def leaves(self, source: NODE_TYPE) -> typing.Iterable[NODE_TYPE]:
+        """Yield nodes without children in depth-first order starting from source"""
+        children = self._children
+        for node in self.dfs_preorder_nodes(source):
+            if not children[node]:
+                yield node
+
+    # -------------------------------------------------------------------------
+    # Frontier
+    # -------------------------------------------------------------------------
+
+    def mark_changed(self, node: NODE_TYPE):
+        """Record that a node was created or modified"""
+        self._stamps[node] = len(self._changes)
+        self._changes.append(node)
+
+    def changed_leaves(
+        self, source: NODE_TYPE, stage: typing.Any
+    ) -> typing.Optional[typing.List[NODE_TYPE]]:
+        """
+        Get leaves in depth-first order that were created or changed since stage last ran.
+
+        Args:
+            source: node to get leaves under (must be the root)
+            stage: hashable key of pipeline stage (e.g., bound method)
+
+        Returns:
+            leaves or None if the frontier can't be used (caller should visit all leaves)
+        """
+        since = self._stage_stamps.get(stage, 0)
+        self._stage_stamps[stage] = len(self._changes)
+
+        if not self._ensure_frontier(source):
+            return None
+
+        stamps = self._stamps
+        leaf_label = self._leaf_label
+        changed = [
+            node
+            for stamp, node in enumerate(self._changes[since:], start=since)
+            if (stamps[node] == stamp) and (node in leaf_label)
+        ]
+        changed.sort(key=leaf_label.__getitem__)
+
+        return changed
+
+    def changed_windows(
+        self, source: NODE_TYPE, stage: typing.Any, window_size: int
+    ) -> typing.Optional[typing.List[typing.Tuple[NODE_TYPE, ...]]]:
+        """
+        Get sliding windows of leaves that contain at least one leaf created or changed since stage last ran.
+
+        Args:
+            source: node to get leaves under (must be the root)
+            stage: hashable key of pipeline stage (e.g., bound method)
+            window_size: number of leaves in each window
+
+        Returns:
+            windows in depth-first order or None if the frontier can't be used
+        """
+        changed = self.changed_leaves(source, stage)
+        if changed is None:
+            return None
+
+        leaf_prev, leaf_next, leaf_label = (
+            self._leaf_prev,
+            self._leaf_next,
+            self._leaf_label,
+        )
+        windows: typing.List[typing.Tuple[NODE_TYPE, ...]] = []
+        last_start_label: typing.Optional[int] = None
+
+        for node in changed:
+            # Back up to the first window that contains this leaf
+            start: NODE_TYPE = node
+            for _ in range(window_size - 1):
+                maybe_prev = leaf_prev[start]
+                if maybe_prev is None:
+                    break
+
+                start = maybe_prev
+
+            # Windows starting from start up to (and including) node
+            while True:
+                start_label = leaf_label[start]
+                if (last_start_label is None) or (start_label > last_start_label):
+                    window = [start]
+                    while len(window) < window_size:
+                        maybe_next = leaf_next[window[-1]]
+                        if maybe_next is None:
+                            break
+
+                        window.append(maybe_next)
+
+                    if len(window) < window_size:
+                        # Not enough leaves left
+                        break
+
+                    windows.append(tuple(window))
+                    last_start_label = start_label
+
+                maybe_next = leaf_next[start]
+                if (start == node) or (maybe_next is None):
+                    break
+
+                start = maybe_next
+
+        return windows
+
+    def _ensure_frontier(self, source: NODE_TYPE) -> bool:
+        """True if frontier is valid for source (rebuilds if necessary)"""
+        if (self._root is None) or (source != self._root):
+            return False
+
+        if not self._frontier_valid:
+            self._rebuild_frontier()
+
+        return True
+
+    def _rebuild_frontier(self):
+        """Recreate frontier with a full traversal from the root"""
+        assert self._root is not None
+
+        self._leaf_prev.clear()
+        self._leaf_next.clear()
+        self._leaf_label.clear()
+        self._first_leaf = None
+        self._last_leaf = None
+
+        for leaf_node in self.leaves(self._root):
+            self._append_leaf(leaf_node)
+
+        self._frontier_valid = True
+
+    def _update_frontier(self, src: NODE_TYPE, dst: NODE_TYPE):
+        """Update frontier before edge src -> dst is added"""
+        if self._children[dst]:
+            # Moving a sub-tree
+            self._frontier_valid = False
+            return
+
+        if self._parents[dst]:
+            # Shared node (e.g., a collapsed time).
+            # Only handle the case where dst just replaced the leaf before src.
+            if (src in self._leaf_label) and (self._leaf_next.get(dst) == src):
+                self._remove_leaf(src)
+            else:
+                self._frontier_valid = False
+
+            return
+
+        if src in self._leaf_label:
+            # First child replaces leaf
+            self._replace_leaf(src, dst)
+            return
+
+        src_children = self._children[src]
+        if not src_children:
+            if (self._root is None) and (not self._parents[src]):
+                # First root
+                self._root = src
+                self._append_leaf(dst)
+
+            # Otherwise, src is not under the root
+            return
+
+        # Find the last leaf under src
+        last_node = src
+        while self._children[last_node]:
+            last_node = self._children[last_node][-1]
+            if len(self._parents[last_node]) > 1:
+                # Shared node may be visited elsewhere
+                self._frontier_valid = False
+                return
+
+        if last_node in self._leaf_label:
+            self._insert_leaf_after(last_node, dst)
+
+        # Otherwise, src is not under the root
+
+    def _append_leaf(self, node: NODE_TYPE):
+        """Add leaf to the end of the frontier"""
+        last_leaf = self._last_leaf
+        self._leaf_prev[node] = last_leaf
+        self._leaf_next[node] = None
+
+        if last_leaf is None:
+            self._first_leaf = node
+            self._leaf_label[node] = 0
+        else:
+            self._leaf_next[last_leaf] = node
+            self._leaf_label[node] = self._leaf_label[last_leaf] + _LABEL_GAP
+
+        self._last_leaf = node
+
+    def _insert_leaf_after(self, prev_node: NODE_TYPE, node: NODE_TYPE):
+        """Add leaf to the frontier right after another leaf"""
+        next_node = self._leaf_next[prev_node]
+        if next_node is None:
+            self._append_leaf(node)
+            return
+
+        prev_label = self._leaf_label[prev_node]
+        label = (prev_label + self._leaf_label[next_node]) // 2
+
+        self._leaf_prev[node] = prev_node
+        self._leaf_next[node] = next_node
+        self._leaf_next[prev_node] = node
+        self._leaf_prev[next_node] = node
+        self._leaf_label[node] = label
+
+        if label == prev_label:
+            # Out of space between labels
+            self._relabel_frontier()
+
+    def _replace_leaf(self, old_node: NODE_TYPE, node: NODE_TYPE):
+        """Put a new leaf in the place of an old one"""
+        prev_node = self._leaf_prev.pop(old_node)
+        next_node = self._leaf_next.pop(old_node)
+
+        self._leaf_prev[node] = prev_node
+        self._leaf_next[node] = next_node
+        self._leaf_label[node] = self._leaf_label.pop(old_node)
+
+        if prev_node is None:
+            self._first_leaf = node
+        else:
+            self._leaf_next[prev_node] = node
+
+        if next_node is None:
+            self._last_leaf = node
+        else:
+            self._leaf_prev[next_node] = node
+
+    def _remove_leaf(self, node: NODE_TYPE):
+        """Remove a leaf from the frontier"""
+        prev_node = self._leaf_prev.pop(node)
+        next_node = self._leaf_next.pop(node)
+        del self._leaf_label[node]
+
+        if prev_node is None:
+            self._first_leaf = next_node
+        else:
+            self._leaf_next[prev_node] = next_node
+
+        if next_node is None:
+            self._last_leaf = prev_node
+        else:
+            self._leaf_prev[next_node] = prev_node
+
+    def _relabel_frontier(self):
+        """Spread out labels evenly"""
+        label = 0
+        node = self._first_leaf
+        while node is not None:
+            self._leaf_label[node] = label
+            label += _LABEL_GAP
+            node = self._leaf_next[node]
+
+    # -------------------------------------------------------------------------
+
+    def _ensure_node(self, node: NODE_TYPE):
+        """Grow parallel lists so that node is a valid index"""
+        num_missing = (node + 1) - len(self._children)
+        if num_missing > 0:
+            self._children.extend([] for _ in range(num_missing))
+            self._parents.extend([] for _ in range(num_missing))
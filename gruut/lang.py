@@ -2,21 +2,36 @@
 """Language-specific settings"""
 import logging
 import re
-import sqlite3
+import threading
 import typing
 from pathlib import Path
 
-import networkx as nx
-
-from gruut.const import PHONEMES_TYPE, GraphType, SentenceNode, Time
-from gruut.g2p import GraphemesToPhonemes
-from gruut.phonemize import SqlitePhonemizer
+from gruut.const import (
+    G2P_BACKENDS,
+    PHONEMES_TYPE,
+    GraphType,
+    GuessPhonemes,
+    SentenceNode,
+    Time,
+)
+from gruut.g2p import GraphemesToPhonemes, GuessStore
+from gruut.phonemize import SqlitePhonemizer, ThreadLocalConnection
 from gruut.pos import PartOfSpeechTagger
 from gruut.text_processor import InterpretAsFormat, TextProcessorSettings
-from gruut.utils import find_lang_dir, remove_non_word_chars, resolve_lang
+from gruut.utils import (
+    CacheStats,
+    LRUCache,
+    dfs_preorder_nodes,
+    find_lang_dir,
+    remove_non_word_chars,
+    resolve_lang,
+)
 
 _LOGGER = logging.getLogger("gruut")
 
+# Number of guessed pronunciations kept in memory for each g2p model
+DEFAULT_GUESS_CACHE_SIZE = 50000
+
 # -----------------------------------------------------------------------------
 
 
@@ -28,9 +43,32 @@ def get_settings(
     load_pos_tagger: bool = True,
     load_phoneme_lexicon: bool = True,
     load_g2p_guesser: bool = True,
+    preload_lexicon: bool = False,
+    g2p_cache_path: typing.Optional[typing.Union[str, Path]] = None,
+    g2p_backend: typing.Optional[str] = None,
+    g2p_beam: typing.Optional[int] = None,
+    g2p_min_beam: typing.Optional[int] = None,
+    g2p_beam_scale: typing.Optional[float] = None,
     **settings_args,
 ) -> TextProcessorSettings:
-    """Get settings for a specific language"""
+    """
+    Get settings for a specific language
+
+    If preload_lexicon is True, the entire phoneme lexicon is loaded into memory
+    on first use and the database is not queried afterwards.
+
+    If a compiled lexicon (lexicon.bin) is next to the lexicon database, it is
+    memory-mapped and used instead of the database.
+
+    If g2p_cache_path is set, guessed pronunciations are saved to an SQLite
+    database at that path and reused by later runs (and other processes).
+
+    g2p_backend is one of G2P_BACKENDS. The CRF model is g2p/model.crf, and the
+    Phonetisaurus graph is g2p/graph (npy directory) or g2p/graph.npz from
+    bin/fst2npy.py. The default is the CRF model if it exists, otherwise the
+    graph. g2p_beam, g2p_min_beam, and g2p_beam_scale control the Phonetisaurus
+    beam search.
+    """
     model_prefix = model_prefix or ""
 
     # Resolve language
@@ -78,10 +116,26 @@ def get_settings(
                     "word_transform_funcs": [
                         str.lower,
                         remove_non_word_chars,
-                        lambda s: remove_non_word_chars(s.lower()),
+                        lower_remove_non_word_chars,
                     ],
+                    "preload": preload_lexicon,
                 }
 
+                # Compiled lexicon next to database (see gruut lexicon compile)
+                lexicon_bin_path = lexicon_db_path.with_suffix(".bin")
+                if lexicon_bin_path.is_file():
+                    if (
+                        lexicon_bin_path.stat().st_mtime
+                        >= lexicon_db_path.stat().st_mtime
+                    ):
+                        phonemizer_args["mapped_path"] = lexicon_bin_path
+                    else:
+                        _LOGGER.warning(
+                            "(%s) ignoring compiled lexicon that is older than database: %s",
+                            lang,
+                            lexicon_bin_path,
+                        )
+
                 settings_args["lookup_phonemes"] = DelayedSqlitePhonemizer(
                     lexicon_db_path, **phonemizer_args
                 )
@@ -94,19 +148,64 @@ def get_settings(
 
         # Grapheme to phoneme model
         if load_g2p_guesser and ("guess_phonemes" not in settings_args):
-            g2p_model_path = lang_dir / lang_model_prefix / "g2p" / "model.crf"
-            if g2p_model_path.is_file():
-                settings_args["guess_phonemes"] = DelayedGraphemesToPhonemes(
-                    g2p_model_path, transform_func=str.lower
-                )
+            g2p_dir = lang_dir / lang_model_prefix / "g2p"
+            g2p_model_path = g2p_dir / "model.crf"
 
-            else:
-                _LOGGER.debug(
-                    "(%s) no grapheme to phoneme CRF model found at %s",
-                    lang,
-                    g2p_model_path,
+            # Memory-mapped directory is preferred
+            g2p_graph_path = g2p_dir / "graph"
+            if not g2p_graph_path.is_dir():
+                g2p_graph_path = g2p_dir / "graph.npz"
+
+            if g2p_backend is None:
+                g2p_backend = "crf" if g2p_model_path.is_file() else "phonetisaurus"
+
+            backend_names = G2P_BACKENDS.get(g2p_backend)
+            if backend_names is None:
+                raise ValueError(
+                    f"Unknown g2p backend: {g2p_backend} (expected one of {list(G2P_BACKENDS)})"
                 )
 
+            guessers: typing.List[GuessPhonemes] = []
+            for backend_name in backend_names:
+                if backend_name == "crf":
+                    if g2p_model_path.is_file():
+                        guessers.append(
+                            DelayedGraphemesToPhonemes(
+                                g2p_model_path,
+                                transform_func=str.lower,
+                                store_path=g2p_cache_path,
+                            )
+                        )
+                    else:
+                        _LOGGER.debug(
+                            "(%s) no grapheme to phoneme CRF model found at %s",
+                            lang,
+                            g2p_model_path,
+                        )
+                elif backend_name == "phonetisaurus":
+                    if g2p_graph_path.exists():
+                        guessers.append(
+                            DelayedPhonetisaurusGraph(
+                                g2p_graph_path,
+                                transform_func=str.lower,
+                                store_path=g2p_cache_path,
+                                beam=g2p_beam,
+                                min_beam=g2p_min_beam,
+                                beam_scale=g2p_beam_scale,
+                            )
+                        )
+                    else:
+                        _LOGGER.debug(
+                            "(%s) no grapheme to phoneme Phonetisaurus graph found at %s",
+                            lang,
+                            g2p_graph_path,
+                        )
+
+            if len(guessers) == 1:
+                settings_args["guess_phonemes"] = guessers[0]
+            elif guessers:
+                settings_args["guess_phonemes"] = GuessPhonemesWithFallback(guessers)
+
     # ---------------------------------
     # Create language-specific settings
     # ---------------------------------
@@ -490,7 +589,7 @@ def fa_post_process_sentence(
     """Add e̞ for genitive case"""
     from gruut.text_processor import DATA_PROP, WordNode
 
-    for dfs_node in nx.dfs_preorder_nodes(graph, sent_node.node):
+    for dfs_node in dfs_preorder_nodes(graph, sent_node.node):
         if not graph.out_degree(dfs_node) == 0:
             # Only leave
             continue
@@ -516,6 +615,7 @@ def get_fa_settings(lang_dir=None, **settings_args) -> TextProcessorSettings:
         "default_date_format": InterpretAsFormat.DATE_DMY,
         "replacements": [("’", "'")],  # normalize apostrophe
         "post_process_sentence": fa_post_process_sentence,
+        "post_process_needs_pos": True,
         **settings_args,
     }
 
@@ -538,7 +638,7 @@ def fr_post_process_sentence(
     from gruut.utils import sliding_window
 
     words = []
-    for dfs_node in nx.dfs_preorder_nodes(graph, sent_node.node):
+    for dfs_node in dfs_preorder_nodes(graph, sent_node.node):
         if not graph.out_degree(dfs_node) == 0:
             # Only leave
             continue
@@ -653,6 +753,7 @@ def get_fr_settings(lang_dir=None, **settings_args) -> TextProcessorSettings:
         "default_date_format": InterpretAsFormat.DATE_DMY_ORDINAL,
         "replacements": [("’", "'")],  # normalize apostrophe
         "post_process_sentence": fr_post_process_sentence,
+        "post_process_needs_pos": True,
         **settings_args,
     }
     return TextProcessorSettings(lang="fr_FR", **settings_args)
@@ -675,6 +776,7 @@ def get_it_settings(lang_dir=None, **settings_args) -> TextProcessorSettings:
         "default_date_format": InterpretAsFormat.DATE_DMY,
         "replacements": [("’", "'")],  # normalize apostrophe
         "post_process_sentence": fr_post_process_sentence,
+        "post_process_needs_pos": True,
         **settings_args,
     }
     return TextProcessorSettings(lang="it_IT", **settings_args)
@@ -830,39 +932,298 @@ def get_zh_settings(lang_dir=None, **settings_args) -> TextProcessorSettings:
 # -----------------------------------------------------------------------------
 
 
-class DelayedGraphemesToPhonemes:
-    """Grapheme to phoneme guesser that loads on first use"""
+def lower_remove_non_word_chars(s: str) -> str:
+    """Lower-case word and remove non-word characters (lexicon word transform)"""
+    return remove_non_word_chars(s.lower())
+
+
+class ModelRegistry:
+    """
+    Thread-safe registry of models that are loaded once per process.
+
+    Models are shared read-only by all threads (and text processors) that
+    request the same key.
+    """
+
+    def __init__(self):
+        self.models: typing.Dict[typing.Hashable, typing.Any] = {}
+        self._key_locks: typing.Dict[typing.Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self, key: typing.Hashable, load_model: typing.Callable[[], typing.Any]
+    ) -> typing.Any:
+        """Get model for key, calling load_model only if it isn't loaded yet"""
+        model = self.models.get(key)
+        if model is not None:
+            return model
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Models with different keys can load at the same time
+        with key_lock:
+            model = self.models.get(key)
+            if model is None:
+                model = load_model()
+                self.models[key] = model
+
+        return model
+
+    def clear(self):
+        """Forget all loaded models"""
+        with self._lock:
+            self.models.clear()
+            self._key_locks.clear()
+
+    def __contains__(self, key: typing.Hashable) -> bool:
+        return key in self.models
+
+    def __len__(self) -> int:
+        return len(self.models)
+
+
+MODEL_REGISTRY = ModelRegistry()
+
+
+def _model_key(
+    model_type: str, model_path: typing.Union[str, Path], model_args: typing.Dict
+) -> typing.Hashable:
+    """Registry key for a model file loaded with specific arguments"""
+
+    def hashable(value):
+        if isinstance(value, (list, tuple)):
+            return tuple(hashable(v) for v in value)
+
+        if isinstance(value, dict):
+            return tuple(sorted((k, hashable(v)) for k, v in value.items()))
+
+        if isinstance(value, Path):
+            return str(value.absolute())
+
+        return value
+
+    key = (model_type, str(Path(model_path).absolute()), hashable(model_args))
+
+    try:
+        hash(key)
+    except TypeError:
+        # Can't be shared (e.g., custom lexicon dict)
+        key = (model_type, str(Path(model_path).absolute()), id(model_args))
+
+    return key
+
+
+# -----------------------------------------------------------------------------
+
+
+class DelayedGraphemesToPhonemes(GuessPhonemes):
+    """
+    Grapheme to phoneme guesser that loads on first use (shared by all threads)
+
+    Guesses are kept in an LRU cache that is shared by all guessers with the
+    same model. If store_path is set, guesses are also saved to an on-disk
+    store that warms the cache at startup and can be shared by other processes.
+    """
+
+    # Registry key prefix of models and caches
+    model_type = "g2p"
 
     def __init__(
         self,
         model_path: typing.Union[str, Path],
         transform_func: typing.Optional[typing.Callable[[str], str]] = None,
+        cache_size: typing.Optional[int] = DEFAULT_GUESS_CACHE_SIZE,
+        store_path: typing.Optional[typing.Union[str, Path]] = None,
         **g2p_args,
     ):
         self.model_path = model_path
-        self.g2p: typing.Optional[GraphemesToPhonemes] = None
+        self.g2p: typing.Optional[typing.Callable[[str], PHONEMES_TYPE]] = None
         self.transform_func = transform_func
         self.g2p_args = g2p_args
 
+        self.cache_size = cache_size
+        self.cache: typing.Optional[LRUCache] = None
+
+        self.store_path = store_path
+        self.store: typing.Optional[GuessStore] = None
+        self.store_stats = CacheStats()
+        self.model_id = ""
+
     def __call__(
         self, word: str, role: typing.Optional[str] = None
     ) -> typing.Optional[PHONEMES_TYPE]:
         if self.g2p is None:
-            _LOGGER.debug(
-                "Loading grapheme to phoneme CRF model from %s", self.model_path
-            )
-            self.g2p = GraphemesToPhonemes(self.model_path, **self.g2p_args)
+            self._load()
 
         assert self.g2p is not None
+        assert self.cache is not None
 
         if self.transform_func is not None:
             word = self.transform_func(word)
 
-        return self.g2p(word)
+        phonemes = self.cache.get(word)
+        if phonemes is None:
+            if self.store is not None:
+                # Another process may have guessed it
+                phonemes = self.store.get(self.model_id, word)
+                if phonemes is None:
+                    self.store_stats.misses += 1
+                else:
+                    self.store_stats.hits += 1
+
+            if phonemes is None:
+                phonemes = self.g2p(word)
+
+                if self.store is not None:
+                    self.store.add(self.model_id, word, phonemes)
+
+            self.cache[word] = phonemes
+
+        # Copy so callers can modify phonemes
+        return list(phonemes)
+
+    @property
+    def cache_stats(self) -> typing.Dict[str, CacheStats]:
+        """Hit/miss counters for the in-memory cache and on-disk store"""
+        stats = {"store": self.store_stats}
+        if self.cache is not None:
+            stats["guesses"] = self.cache.stats
+
+        return stats
+
+    def _load(self):
+        self.g2p = MODEL_REGISTRY.get(
+            _model_key(self.model_type, self.model_path, self.g2p_args),
+            self._load_g2p,
+        )
+
+        # Same cache for all guessers with this model
+        self.cache = MODEL_REGISTRY.get(
+            _model_key(
+                f"{self.model_type}-cache",
+                self.model_path,
+                {"cache_size": self.cache_size, **self.g2p_args},
+            ),
+            self._load_cache,
+        )
+
+        if self.store_path is not None:
+            self.model_id = GuessStore.get_model_id(self.model_path)
+            if self.g2p_args:
+                # Arguments may change guesses
+                self.model_id += ":" + ",".join(
+                    f"{key}={value}" for key, value in sorted(self.g2p_args.items())
+                )
+            self.store = MODEL_REGISTRY.get(
+                _model_key("g2p-store", self.store_path, {}),
+                lambda: GuessStore(self.store_path),
+            )
+
+            # Warm up cache once per process
+            MODEL_REGISTRY.get(
+                _model_key("g2p-store-warm", self.store_path, {"model": self.model_id}),
+                self._warm_cache,
+            )
+
+    def _load_g2p(self) -> typing.Callable[[str], PHONEMES_TYPE]:
+        _LOGGER.debug("Loading grapheme to phoneme CRF model from %s", self.model_path)
+        return GraphemesToPhonemes(self.model_path, **self.g2p_args)
+
+    def _load_cache(self) -> LRUCache:
+        return LRUCache(max_size=self.cache_size)
+
+    def _warm_cache(self) -> bool:
+        assert self.cache is not None
+        assert self.store is not None
+
+        # Most recent guesses end up most recently used
+        num_loaded = 0
+        for word, phonemes in self.store.items(self.model_id, limit=self.cache_size):
+            self.cache[word] = phonemes
+            num_loaded += 1
+
+        _LOGGER.debug("Loaded %s guess(es) from %s", num_loaded, self.store_path)
+
+        return True
+
+
+class DelayedPhonetisaurusGraph(DelayedGraphemesToPhonemes):
+    """
+    Grapheme to phoneme guesser with a Phonetisaurus graph from bin/fst2npy.py
+    that loads on first use (shared by all threads)
+
+    Takes the best guess of a vectorized beam search. beam, min_beam, and
+    beam_scale are passed to PhonetisaurusGraph.g2p_one_vectorized (None uses
+    its default).
+    """
+
+    model_type = "phonetisaurus"
+
+    def __init__(
+        self,
+        graph_path: typing.Union[str, Path],
+        transform_func: typing.Optional[typing.Callable[[str], str]] = None,
+        cache_size: typing.Optional[int] = DEFAULT_GUESS_CACHE_SIZE,
+        store_path: typing.Optional[typing.Union[str, Path]] = None,
+        beam: typing.Optional[int] = None,
+        min_beam: typing.Optional[int] = None,
+        beam_scale: typing.Optional[float] = None,
+    ):
+        search_args = {
+            key: value
+            for key, value in [
+                ("beam", beam),
+                ("min_beam", min_beam),
+                ("beam_scale", beam_scale),
+            ]
+            if value is not None
+        }
+
+        super().__init__(
+            graph_path,
+            transform_func=transform_func,
+            cache_size=cache_size,
+            store_path=store_path,
+            **search_args,
+        )
+
+    def _load_g2p(self) -> typing.Callable[[str], PHONEMES_TYPE]:
+        from gruut.g2p_phonetisaurus import PhonetisaurusGraph
+
+        _LOGGER.debug("Loading Phonetisaurus graph from %s", self.model_path)
+        phon_graph = PhonetisaurusGraph.load(self.model_path)
+        search_args = self.g2p_args
+
+        def guess_phonemes(word: str) -> PHONEMES_TYPE:
+            for _, phonemes in phon_graph.g2p_one_vectorized(word, **search_args):
+                return phonemes
+
+            return []
+
+        return guess_phonemes
+
+
+class GuessPhonemesWithFallback(GuessPhonemes):
+    """Uses guesses from the first guesser that returns any phonemes"""
+
+    def __init__(self, guessers: typing.Sequence[GuessPhonemes]):
+        self.guessers = guessers
+
+    def __call__(
+        self, word: str, role: typing.Optional[str] = None
+    ) -> typing.Optional[PHONEMES_TYPE]:
+        phonemes: typing.Optional[PHONEMES_TYPE] = None
+        for guesser in self.guessers:
+            phonemes = guesser(word, role)
+            if phonemes:
+                break
+
+        return phonemes
 
 
 class DelayedPartOfSpeechTagger:
-    """POS tagger that loads on first use"""
+    """POS tagger that loads on first use (shared by all threads)"""
 
     def __init__(self, model_path: typing.Union[str, Path], **tagger_args):
 
@@ -871,16 +1232,35 @@ class DelayedPartOfSpeechTagger:
         self.tagger_args = tagger_args
 
     def __call__(self, words: typing.Sequence[str]) -> typing.Sequence[str]:
+        return self._get_tagger()(words)
+
+    def tag_sentences(
+        self, sentences: typing.Iterable[typing.Sequence[str]]
+    ) -> typing.List[typing.Sequence[str]]:
+        """Returns POS tags for each sentence"""
+        return self._get_tagger().tag_sentences(sentences)
+
+    def _get_tagger(self) -> PartOfSpeechTagger:
         if self.tagger is None:
-            _LOGGER.debug("Loading part of speech tagger from %s", self.model_path)
-            self.tagger = PartOfSpeechTagger(self.model_path, **self.tagger_args)
+            self.tagger = MODEL_REGISTRY.get(
+                _model_key("pos", self.model_path, self.tagger_args), self._load_tagger
+            )
 
         assert self.tagger is not None
-        return self.tagger(words)
+        return self.tagger
+
+    def _load_tagger(self) -> PartOfSpeechTagger:
+        _LOGGER.debug("Loading part of speech tagger from %s", self.model_path)
+        return PartOfSpeechTagger(self.model_path, **self.tagger_args)
 
 
 class DelayedSqlitePhonemizer:
-    """Phonemizer that loads on first use"""
+    """
+    Phonemizer that loads on first use (shared by all threads).
+
+    preload=True loads entire lexicon into memory, mapped_path uses compiled lexicon.
+    Each thread gets its own read-only database connection.
+    """
 
     def __init__(self, db_path: typing.Union[str, Path], **phonemizer_args):
 
@@ -891,10 +1271,34 @@ class DelayedSqlitePhonemizer:
     def __call__(
         self, word: str, role: typing.Optional[str] = None, do_transforms: bool = True
     ) -> typing.Optional[PHONEMES_TYPE]:
+        return self._get_phonemizer()(word, role=role, do_transforms=do_transforms)
+
+    def lookup_batch(
+        self,
+        words_roles: typing.Sequence[typing.Tuple[str, typing.Optional[str]]],
+        do_transforms: bool = True,
+    ) -> typing.List[typing.Optional[PHONEMES_TYPE]]:
+        """Look up phonemes for many (word, role) pairs at once"""
+        return self._get_phonemizer().lookup_batch(
+            words_roles, do_transforms=do_transforms
+        )
+
+    def is_heteronym(self, word: str, do_transforms: bool = True) -> bool:
+        """True if the word's pronunciation can change with its part of speech"""
+        return self._get_phonemizer().is_heteronym(word, do_transforms=do_transforms)
+
+    def _get_phonemizer(self) -> SqlitePhonemizer:
         if self.phonemizer is None:
-            _LOGGER.debug("Connecting to lexicon database at %s", self.db_path)
-            db_conn = sqlite3.connect(str(self.db_path))
-            self.phonemizer = SqlitePhonemizer(db_conn=db_conn, **self.phonemizer_args)
+            self.phonemizer = MODEL_REGISTRY.get(
+                _model_key("lexicon", self.db_path, self.phonemizer_args),
+                self._load_phonemizer,
+            )
 
         assert self.phonemizer is not None
-        return self.phonemizer(word, role=role, do_transforms=do_transforms)
+        return self.phonemizer
+
+    def _load_phonemizer(self) -> SqlitePhonemizer:
+        _LOGGER.debug("Connecting to lexicon database at %s", self.db_path)
+        return SqlitePhonemizer(
+            db_conn=ThreadLocalConnection(self.db_path), **self.phonemizer_args
+        )
@@ -1,9 +1,18 @@
 #!/usr/bin/env python3
 """Converts a text lexicon to a gruut sqlite3 database"""
 import argparse
+import logging
 import sqlite3
 import sys
 
+_LOGGER = logging.getLogger("gruut.lexicon2db")
+
+# Recorded in PRAGMA user_version once a database has been optimized
+LEXICON_SCHEMA_VERSION = 1
+
+# Database page size after optimization (bytes)
+DEFAULT_PAGE_SIZE = 8192
+
 # -----------------------------------------------------------------------------
 
 
@@ -30,6 +39,12 @@ def main():
         default="_",
         help="String used to identify empty word role (see --role)",
     )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=DEFAULT_PAGE_SIZE,
+        help=f"Database page size in bytes (default: {DEFAULT_PAGE_SIZE})",
+    )
     args = parser.parse_args()
 
     # -------------------------------------------------------------------------
@@ -105,6 +120,60 @@ def main():
                 print("Error on line", i + 1, "-", line)
                 raise e
 
+    # Tables were re-created, so always optimize
+    optimize_lexicon_db(conn, page_size=args.page_size, force=True)
+    conn.close()
+
+
+# -----------------------------------------------------------------------------
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Get optimized schema version of a lexicon database (0 if not optimized)"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def optimize_lexicon_db(
+    conn: sqlite3.Connection, page_size: int = DEFAULT_PAGE_SIZE, force: bool = False
+) -> bool:
+    """
+    Optimize a lexicon database in place for word look ups.
+
+    Adds a covering index on (word, pron_order) so look ups never touch the
+    table, gathers query planner statistics, and rebuilds the database with the
+    given page size. The schema version is recorded in PRAGMA user_version.
+
+    Args:
+        conn: Connection to lexicon database
+        page_size: Database page size in bytes
+        force: Optimize even if database already has the current schema version
+
+    Returns:
+        True if database was optimized, False if it was already up to date
+    """
+    if (not force) and (get_schema_version(conn) >= LEXICON_SCHEMA_VERSION):
+        return False
+
+    with conn:
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS word_phonemes_word "
+            + "ON word_phonemes (word, pron_order, role, phonemes)"
+        )
+        conn.execute("ANALYZE")
+        conn.execute(f"PRAGMA user_version = {LEXICON_SCHEMA_VERSION}")
+
+    # Page size only changes when the database is rebuilt
+    conn.execute(f"PRAGMA page_size = {page_size}")
+    conn.execute("VACUUM")
+
+    _LOGGER.debug(
+        "Optimized lexicon database (schema version=%s, page size=%s)",
+        LEXICON_SCHEMA_VERSION,
+        page_size,
+    )
+
+    return True
+
 
 # -----------------------------------------------------------------------------
 
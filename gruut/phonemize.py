@@ -1,11 +1,22 @@
 """Class for getting phonetic pronunciations for tokenized text"""
+import array
+import bisect
 import itertools
+import json
 import logging
+import mmap
 import sqlite3
+import struct
+import sys
+import threading
+import time
 import typing
+import weakref
+import zlib
 from pathlib import Path
 
-from gruut.const import PHONEMES_TYPE
+from gruut.const import PHONEMES_TYPE, WordRole
+from gruut.utils import CacheStats, LRUCache
 
 # -----------------------------------------------------------------------------
 
@@ -15,6 +26,15 @@ ROLE_TO_PHONEMES = typing.Dict[str, PHONEMES_TYPE]
 
 WORD_TRANSFORM_TYPE = typing.Callable[[str], str]
 
+# Maximum number of words in a single bulk SELECT (SQLite variable limit is 999)
+MAX_WORDS_PER_QUERY = 500
+
+# Default maximum number of words cached from the database
+DEFAULT_CACHE_SIZE = 50000
+
+# Default maximum number of words cached as missing from the database
+DEFAULT_MISSING_CACHE_SIZE = 50000
+
 
 # -----------------------------------------------------------------------------
 
@@ -26,90 +46,792 @@ class SqlitePhonemizer:
 
     def __init__(
         self,
-        db_conn: sqlite3.Connection,
+        db_conn: typing.Union[sqlite3.Connection, "ThreadLocalConnection"],
         lexicon: typing.Optional[typing.Dict[str, ROLE_TO_PHONEMES]] = None,
         g2p_model: typing.Optional[typing.Dict[str, typing.Union[str, Path]]] = None,
         word_transform_funcs: typing.Optional[
             typing.Iterable[WORD_TRANSFORM_TYPE]
         ] = None,
         casing_func: typing.Optional[WORD_TRANSFORM_TYPE] = None,
+        preload: bool = False,
+        mapped_path: typing.Optional[typing.Union[str, Path]] = None,
+        cache_size: typing.Optional[int] = DEFAULT_CACHE_SIZE,
+        missing_cache_size: typing.Optional[int] = DEFAULT_MISSING_CACHE_SIZE,
     ):
         self.db_conn = db_conn
 
-        # word -> role -> [phonemes]
+        # word -> role -> [phonemes] (never evicted)
         self.lexicon = lexicon if lexicon is not None else {}
 
+        # word -> role -> [phonemes] loaded from database
+        self.cache = LRUCache(max_size=cache_size)
+
+        # (word, do_transforms) -> True for words not in database
+        self.missing_cache = LRUCache(max_size=missing_cache_size)
+
         # [functions]
         self.word_transform_funcs = word_transform_funcs or []
 
         self.casing_func = casing_func
 
+        # Entire database table in memory or memory-mapped (no queries)
+        self.preloaded: typing.Optional[
+            typing.Union[PreloadedLexicon, MappedLexicon]
+        ] = None
+
+        if mapped_path is not None:
+            self.preloaded = MappedLexicon(mapped_path)
+            _LOGGER.debug(
+                "Memory-mapped %s word(s) from %s (%0.1f MB)",
+                len(self.preloaded),
+                mapped_path,
+                self.preloaded.nbytes / (1024 * 1024),
+            )
+        elif preload:
+            self.preloaded = PreloadedLexicon(db_conn)
+            _LOGGER.debug(
+                "Preloaded %s word(s) in %0.2f second(s) (%0.1f MB)",
+                len(self.preloaded),
+                self.preloaded.load_seconds,
+                self.preloaded.nbytes / (1024 * 1024),
+            )
+
+        # Words whose pronunciation depends on part of speech (built on first use)
+        self._heteronyms: typing.Optional[typing.Set[str]] = None
+        self._heteronyms_lock = threading.Lock()
+
     def __call__(
         self, word: str, role: typing.Optional[str] = None, do_transforms: bool = True
     ) -> typing.Optional[PHONEMES_TYPE]:
-        # Look up in cache first
         if self.casing_func is not None:
             word = self.casing_func(word)
 
+        is_cached, role_to_word = self._get_cached(word, do_transforms)
+        if not is_cached:
+            # Load from database
+            role_to_word = self._load_words([word], do_transforms).get(word)
+
+        if role_to_word is None:
+            # Not in lexicon
+            return None
+
+        return SqlitePhonemizer._get_role_phonemes(role_to_word, role)
+
+    def lookup_batch(
+        self,
+        words_roles: typing.Sequence[typing.Tuple[str, typing.Optional[str]]],
+        do_transforms: bool = True,
+    ) -> typing.List[typing.Optional[PHONEMES_TYPE]]:
+        """
+        Look up phonemes for many (word, role) pairs.
+
+        Same as calling the phonemizer for each pair, but words that aren't
+        cached yet are loaded from the database with bulk queries and each
+        unique word is only looked up once.
+        """
+        cased_words = [word for word, _role in words_roles]
+        if self.casing_func is not None:
+            cased_words = [self.casing_func(word) for word in cased_words]
+
+        # word -> role -> [phonemes] or None if not in lexicon
+        word_roles: typing.Dict[str, typing.Optional[ROLE_TO_PHONEMES]] = {}
+        words_to_load: typing.List[str] = []
+
+        for word in cased_words:
+            if word in word_roles:
+                continue
+
+            is_cached, role_to_word = self._get_cached(word, do_transforms)
+            if not is_cached:
+                words_to_load.append(word)
+
+            word_roles[word] = role_to_word
+
+        if words_to_load:
+            word_roles.update(self._load_words(words_to_load, do_transforms))
+
+        words_phonemes: typing.List[typing.Optional[PHONEMES_TYPE]] = []
+        for word, (_word, role) in zip(cased_words, words_roles):
+            role_to_word = word_roles[word]
+            if role_to_word is not None:
+                words_phonemes.append(
+                    SqlitePhonemizer._get_role_phonemes(role_to_word, role)
+                )
+            else:
+                # Not in lexicon
+                words_phonemes.append(None)
+
+        return words_phonemes
+
+    def is_heteronym(self, word: str, do_transforms: bool = True) -> bool:
+        """
+        True if the word's pronunciation can change with its part of speech role.
+
+        Words not in the lexicon are never heteronyms.
+        """
+        if self.casing_func is not None:
+            word = self.casing_func(word)
+
+        heteronyms = self.heteronyms
+        if word in heteronyms:
+            return True
+
+        if do_transforms:
+            for transform_func in self.word_transform_funcs:
+                if transform_func(word) in heteronyms:
+                    return True
+
+        return False
+
+    @property
+    def heteronyms(self) -> typing.Set[str]:
+        """Words with a part of speech role that changes their pronunciation"""
+        if self._heteronyms is None:
+            with self._heteronyms_lock:
+                if self._heteronyms is None:
+                    self._heteronyms = self._load_heteronyms()
+
+        return self._heteronyms
+
+    def _load_heteronyms(self) -> typing.Set[str]:
+        start_time = time.perf_counter()
+
+        # Only words with a non-default role can be heteronyms
+        word_roles = dict(self.lexicon)
+        cursor = self.db_conn.execute(
+            "SELECT word, role, phonemes FROM word_phonemes "
+            + "WHERE word IN (SELECT word FROM word_phonemes WHERE role != '') "
+            + "ORDER BY word, pron_order"
+        )
+
+        for db_word, db_role, db_phonemes in cursor:
+            if db_word in self.lexicon:
+                # Overridden by in-memory lexicon
+                continue
+
+            role_to_word = word_roles.get(db_word)
+            if role_to_word is None:
+                role_to_word = {}
+                word_roles[db_word] = role_to_word
+
+            if db_role not in role_to_word:
+                role_to_word[db_role] = db_phonemes.split()
+
+        heteronyms = {
+            word
+            for word, role_to_word in word_roles.items()
+            if SqlitePhonemizer._has_pos_roles(role_to_word)
+        }
+
+        _LOGGER.debug(
+            "Found %s heteronym(s) in %0.2f second(s)",
+            len(heteronyms),
+            time.perf_counter() - start_time,
+        )
+
+        return heteronyms
+
+    @staticmethod
+    def _has_pos_roles(role_to_word: ROLE_TO_PHONEMES) -> bool:
+        """True if a part of speech role would select different phonemes"""
+        untagged_phonemes = SqlitePhonemizer._get_role_phonemes(role_to_word)
+        special_roles = {role.value for role in WordRole}
+
+        for role, phonemes in role_to_word.items():
+            if (not role) or (role in special_roles):
+                # Roles like gruut:letter don't come from a POS tagger
+                continue
+
+            if list(phonemes) != list(untagged_phonemes or []):
+                return True
+
+        return False
+
+    @property
+    def cache_stats(self) -> typing.Dict[str, CacheStats]:
+        """Hit/miss/eviction counters for found ("words") and missing words ("missing")"""
+        return {"words": self.cache.stats, "missing": self.missing_cache.stats}
+
+    def _get_cached(
+        self, word: str, do_transforms: bool
+    ) -> typing.Tuple[bool, typing.Optional[ROLE_TO_PHONEMES]]:
+        """
+        Get (is_cached, role -> phonemes).
+
+        role -> phonemes is None if the word is known to be missing or isn't
+        cached.
+        """
         role_to_word = self.lexicon.get(word)
+        if role_to_word is not None:
+            return True, role_to_word
 
+        if self.preloaded is not None:
+            # Preloaded lexicon is the cache
+            return False, None
+
+        role_to_word = self.cache.get(word)
         if role_to_word is not None:
-            if role is not None:
-                # Exact role
-                phonemes = role_to_word.get(role)
-                if phonemes is not None:
-                    return phonemes
-
-            # Default role
-            phonemes = role_to_word.get(SqlitePhonemizer.DEFAULT_ROLE)
-            if phonemes is not None:
-                return phonemes
+            return True, role_to_word
 
-            # Any role
-            if role_to_word:
-                return next(iter(role_to_word.values()))
+        if self.missing_cache.get((word, do_transforms)):
+            # Not in lexicon for sure
+            return True, None
 
-            # Not in lexicon (or database) for sure because role_to_word was present.
-            return None
+        return False, None
+
+    def _load_words(
+        self, words: typing.Iterable[str], do_transforms: bool
+    ) -> typing.Dict[str, ROLE_TO_PHONEMES]:
+        """
+        Load words from database (or preloaded lexicon) and cache the results.
 
+        The transforms of each word are tried in order, but all candidates are
+        selected with a single query.
+        """
         transforms = self.word_transform_funcs
         if not do_transforms:
             # No transforms
             transforms = []
 
-        for transform_func in itertools.chain([None], transforms):
-            if transform_func is not None:
-                lookup_word = transform_func(word)
+        # word -> [lookup word]
+        word_candidates: typing.Dict[str, typing.List[str]] = {}
+        for word in words:
+            candidates: typing.List[str] = []
+            for transform_func in itertools.chain([None], transforms):
+                if transform_func is not None:
+                    lookup_word = transform_func(word)
+                else:
+                    # No transform
+                    lookup_word = word
+
+                if lookup_word and (lookup_word not in candidates):
+                    candidates.append(lookup_word)
+
+            word_candidates[word] = candidates
+
+        if self.preloaded is not None:
+            # Look up in memory instead of database
+            preloaded = self.preloaded
+            loaded_words: typing.Dict[str, ROLE_TO_PHONEMES] = {}
+            for word, candidates in word_candidates.items():
+                for lookup_word in candidates:
+                    role_to_word = preloaded.get(lookup_word)
+                    if role_to_word is not None:
+                        loaded_words[word] = role_to_word
+                        break
+
+            return loaded_words
+
+        # Load pronunciations for all candidates from database
+        lookup_words: typing.Dict[str, None] = {}
+        for candidates in word_candidates.values():
+            lookup_words.update((lookup_word, None) for lookup_word in candidates)
+
+        found_words = self._select_words(lookup_words)
+
+        loaded_words = {}
+        for word, candidates in word_candidates.items():
+            for lookup_word in candidates:
+                role_to_word = found_words.get(lookup_word)
+                if role_to_word is None:
+                    continue
+
+                self.cache[word] = role_to_word
+                loaded_words[word] = role_to_word
+
+                if lookup_word != word:
+                    # Link to transformed word
+                    self.cache[lookup_word] = role_to_word
+
+                break
             else:
-                # No transform
-                lookup_word = word
+                # Not in lexicon
+                self.missing_cache[(word, do_transforms)] = True
 
-            if not lookup_word:
-                continue
+        return loaded_words
+
+    def _select_words(
+        self, words: typing.Iterable[str]
+    ) -> typing.Dict[str, ROLE_TO_PHONEMES]:
+        """Load pronunciations for many words from database"""
+        words = list(words)
+        word_roles: typing.Dict[str, ROLE_TO_PHONEMES] = {}
 
-            # Load pronunciations for word from database.
+        for chunk_start in range(0, len(words), MAX_WORDS_PER_QUERY):
+            chunk_words = words[chunk_start : chunk_start + MAX_WORDS_PER_QUERY]
+            placeholders = ", ".join("?" * len(chunk_words))
             cursor = self.db_conn.execute(
-                "SELECT role, phonemes FROM word_phonemes WHERE word = ? ORDER BY pron_order",
-                (lookup_word,),
+                "SELECT word, role, phonemes FROM word_phonemes "
+                + f"WHERE word IN ({placeholders}) ORDER BY word, pron_order",
+                chunk_words,
             )
 
             for row in cursor:
+                db_word, db_role, db_phonemes = row[0], row[1], row[2].split()
+                role_to_word = word_roles.get(db_word)
                 if role_to_word is None:
-                    # Create new lexicon entry for original word
                     role_to_word = {}
-                    self.lexicon[word] = role_to_word
-
-                db_role, db_phonemes = row[0], row[1].split()
+                    word_roles[db_word] = role_to_word
 
                 if db_role not in role_to_word:
                     role_to_word[db_role] = db_phonemes
 
-            if role_to_word is not None:
-                # Link to transformed word
-                self.lexicon[lookup_word] = self.lexicon[word]
+        return word_roles
+
+    @staticmethod
+    def _get_role_phonemes(
+        role_to_word: ROLE_TO_PHONEMES, role: typing.Optional[str] = None
+    ) -> typing.Optional[PHONEMES_TYPE]:
+        """Get phonemes for role, falling back to default role and then any role"""
+        if role is not None:
+            # Exact role
+            phonemes = role_to_word.get(role)
+            if phonemes is not None:
+                return phonemes
 
-                # Successfully looked up in the database
-                return self(word, role=role)
+        # Default role
+        phonemes = role_to_word.get(SqlitePhonemizer.DEFAULT_ROLE)
+        if phonemes is not None:
+            return phonemes
 
-        # Not in lexicon
+        # Any role
+        if role_to_word:
+            return next(iter(role_to_word.values()))
+
+        # Not in lexicon (or database) for sure because role_to_word was present.
         return None
+
+
+# -----------------------------------------------------------------------------
+
+
+class ThreadLocalConnection:
+    """
+    Read-only connections to an sqlite database, one for each thread.
+
+    Lets a single SqlitePhonemizer (and its caches) be shared by many threads,
+    since sqlite connections can't be used outside the thread that created them.
+    A thread's connection is closed when the thread ends.
+    """
+
+    def __init__(self, db_path: typing.Union[str, Path]):
+        self.db_path = Path(db_path)
+        self._local = threading.local()
+
+        # Open connections of all threads (for close)
+        self._thread_conns: "weakref.WeakSet[_ThreadConnection]" = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def execute(self, sql: str, parameters: typing.Sequence[typing.Any] = ()):
+        """Execute a query with this thread's connection"""
+        return self.connection.execute(sql, parameters)
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Connection for the current thread (connects on first use)"""
+        thread_conn = getattr(self._local, "thread_conn", None)
+        if thread_conn is None:
+            _LOGGER.debug(
+                "Connecting to %s (thread=%s)", self.db_path, threading.get_ident()
+            )
+            db_uri = f"{self.db_path.absolute().as_uri()}?mode=ro"
+
+            # Only used by this thread, but may be closed from another one
+            thread_conn = _ThreadConnection(
+                sqlite3.connect(db_uri, uri=True, check_same_thread=False)
+            )
+            self._local.thread_conn = thread_conn
+
+            with self._lock:
+                self._thread_conns.add(thread_conn)
+
+        return thread_conn.db_conn
+
+    def close(self):
+        """Close the connections of all threads"""
+        with self._lock:
+            thread_conns = list(self._thread_conns)
+            self._thread_conns.clear()
+            self._local = threading.local()
+
+        for thread_conn in thread_conns:
+            thread_conn.close()
+
+
+class _ThreadConnection:
+    """sqlite connection of a single thread, closed when the thread ends"""
+
+    def __init__(self, db_conn: sqlite3.Connection):
+        self.db_conn = db_conn
+
+    def close(self):
+        """Close connection"""
+        self.db_conn.close()
+
+    def __del__(self):
+        # Thread-local data is deleted when its thread ends
+        self.close()
+
+
+# -----------------------------------------------------------------------------
+
+
+class PreloadedLexicon:
+    """
+    Read-only copy of an entire word_phonemes table.
+
+    Words are interned and sorted (looked up with binary search). Each word
+    has a range of pronunciations, and each pronunciation has a role id and a
+    range in a single array of phoneme ids. Only the first pronunciation of
+    each role is kept, since it's the only one that SqlitePhonemizer returns.
+
+    Use save to write a compiled lexicon for MappedLexicon.
+    """
+
+    def __init__(
+        self, db_conn: typing.Union[sqlite3.Connection, ThreadLocalConnection]
+    ):
+        start_time = time.perf_counter()
+
+        # Sorted words
+        self.words: typing.List[str] = []
+
+        # Word index -> index of first pronunciation (plus end)
+        self.word_offsets = array.array("I", [0])
+
+        # Pronunciation index -> role id
+        self.pron_roles = array.array("H")
+
+        # Pronunciation index -> index of first phoneme (plus end)
+        self.pron_offsets = array.array("I", [0])
+
+        # Phoneme ids for all pronunciations
+        self.phonemes = array.array("H")
+
+        # Role/phoneme id -> string
+        self.roles: typing.List[typing.Optional[str]] = []
+        self.phoneme_strs: typing.List[str] = []
+
+        role_ids: typing.Dict[typing.Optional[str], int] = {}
+        phoneme_ids: typing.Dict[str, int] = {}
+
+        last_word: typing.Optional[str] = None
+        word_roles: typing.Set[typing.Optional[str]] = set()
+
+        # Words are sorted by code point (same as Python string ordering)
+        cursor = db_conn.execute(
+            "SELECT word, role, phonemes FROM word_phonemes ORDER BY word, pron_order"
+        )
+
+        for db_word, db_role, db_phonemes in cursor:
+            if db_word != last_word:
+                if last_word is not None:
+                    # End of previous word
+                    self.word_offsets.append(len(self.pron_roles))
+
+                self.words.append(sys.intern(db_word))
+                last_word = db_word
+                word_roles.clear()
+
+            if db_role in word_roles:
+                # Only first pronunciation of each role is used
+                continue
+
+            word_roles.add(db_role)
+
+            role_id = role_ids.get(db_role)
+            if role_id is None:
+                role_id = len(self.roles)
+                role_ids[db_role] = role_id
+                self.roles.append(db_role)
+
+            self.pron_roles.append(role_id)
+
+            for phoneme in db_phonemes.split():
+                phoneme_id = phoneme_ids.get(phoneme)
+                if phoneme_id is None:
+                    phoneme_id = len(self.phoneme_strs)
+                    phoneme_ids[phoneme] = phoneme_id
+                    self.phoneme_strs.append(phoneme)
+
+                self.phonemes.append(phoneme_id)
+
+            self.pron_offsets.append(len(self.phonemes))
+
+        if last_word is not None:
+            # End of final word
+            self.word_offsets.append(len(self.pron_roles))
+
+        self.load_seconds = time.perf_counter() - start_time
+
+    def get(self, word: str) -> typing.Optional[ROLE_TO_PHONEMES]:
+        """Get role -> phonemes for a word or None if word is not in the lexicon"""
+        word_idx = bisect.bisect_left(self.words, word)
+        if (word_idx >= len(self.words)) or (self.words[word_idx] != word):
+            return None
+
+        role_to_word: ROLE_TO_PHONEMES = {}
+        for pron_idx in range(
+            self.word_offsets[word_idx], self.word_offsets[word_idx + 1]
+        ):
+            phoneme_ids = self.phonemes[
+                self.pron_offsets[pron_idx] : self.pron_offsets[pron_idx + 1]
+            ]
+            role = self.roles[self.pron_roles[pron_idx]]
+            role_to_word[role or ""] = [
+                self.phoneme_strs[phoneme_id] for phoneme_id in phoneme_ids
+            ]
+
+        return role_to_word
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by the lexicon in bytes"""
+        num_bytes = sum(
+            sys.getsizeof(obj)
+            for obj in (self.words, self.roles, self.phoneme_strs)
+            + (self.word_offsets, self.pron_roles, self.pron_offsets, self.phonemes)
+        )
+        num_bytes += sum(
+            sys.getsizeof(s)
+            for s in itertools.chain(self.words, self.roles, self.phoneme_strs)
+        )
+
+        return num_bytes
+
+    def save(self, bin_path: typing.Union[str, Path]):
+        """Write lexicon to a compiled file that can be opened with MappedLexicon"""
+        inventory_bytes = json.dumps(
+            {"roles": self.roles, "phonemes": self.phoneme_strs}, ensure_ascii=False
+        ).encode("utf-8")
+
+        # Word index -> offset of UTF-8 word in blob (plus end)
+        word_key_offsets = array.array("I", [0])
+        words_bytes = bytearray()
+        for word in self.words:
+            words_bytes.extend(word.encode("utf-8"))
+            word_key_offsets.append(len(words_bytes))
+
+        # Open addressing hash table: slot -> word index + 1 (0 is empty)
+        num_slots = 1
+        while num_slots < (2 * len(self.words)):
+            num_slots *= 2
+
+        word_slots = array.array("I", bytes(4 * num_slots))
+        for word_idx in range(len(self.words)):
+            word_key = words_bytes[
+                word_key_offsets[word_idx] : word_key_offsets[word_idx + 1]
+            ]
+            slot = zlib.crc32(word_key) & (num_slots - 1)
+            while word_slots[slot] != 0:
+                slot = (slot + 1) & (num_slots - 1)
+
+            word_slots[slot] = word_idx + 1
+
+        header = MappedLexicon.HEADER.pack(
+            MappedLexicon.MAGIC,
+            MappedLexicon.VERSION,
+            len(self.words),
+            len(self.pron_roles),
+            len(self.phonemes),
+            len(inventory_bytes),
+            len(words_bytes),
+            num_slots,
+        )
+
+        with open(bin_path, "wb") as bin_file:
+            bin_file.write(header)
+            for section in (
+                inventory_bytes,
+                word_slots,
+                word_key_offsets,
+                self.word_offsets,
+                self.pron_offsets,
+                self.pron_roles,
+                self.phonemes,
+                words_bytes,
+            ):
+                if isinstance(section, array.array) and (sys.byteorder != "little"):
+                    # File is always little endian
+                    section = array.array(section.typecode, section)
+                    section.byteswap()
+
+                section_bytes = bytes(section)
+                bin_file.write(section_bytes)
+                bin_file.write(bytes(_pad4(len(section_bytes))))
+
+    def __contains__(self, word: str) -> bool:
+        word_idx = bisect.bisect_left(self.words, word)
+        return (word_idx < len(self.words)) and (self.words[word_idx] == word)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+
+# -----------------------------------------------------------------------------
+
+
+class MappedLexicon:
+    """
+    Read-only lexicon in a compiled file that is memory-mapped.
+
+    Has the same layout as PreloadedLexicon, plus a hash table of the words
+    (crc32 with linear probing). Nothing is loaded up front
+    except the (small) role and phoneme inventories. Pages of the file are
+    shared between all processes that open it.
+
+    Create the file with PreloadedLexicon.save or "gruut lexicon compile".
+    """
+
+    MAGIC = b"GRUUTLEX"
+    VERSION = 1
+
+    # magic, version, words, pronunciations, phonemes, inventory bytes, word bytes,
+    # hash table slots
+    HEADER = struct.Struct("<8sIIIIIII")
+
+    def __init__(self, bin_path: typing.Union[str, Path]):
+        start_time = time.perf_counter()
+
+        self.bin_path = Path(bin_path)
+
+        with open(self.bin_path, "rb") as bin_file:
+            self.mmap = mmap.mmap(bin_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (
+            magic,
+            version,
+            num_words,
+            num_prons,
+            num_phonemes,
+            inventory_len,
+            words_len,
+            num_slots,
+        ) = MappedLexicon.HEADER.unpack_from(self.mmap)
+
+        if (magic != MappedLexicon.MAGIC) or (version != MappedLexicon.VERSION):
+            raise ValueError(f"Not a compiled lexicon (version 1): {self.bin_path}")
+
+        self.num_words = num_words
+        self.slot_mask = num_slots - 1
+        offset = MappedLexicon.HEADER.size
+
+        def next_section(num_bytes: int) -> int:
+            nonlocal offset
+            section_offset = offset
+            offset += num_bytes + _pad4(num_bytes)
+            return section_offset
+
+        inventory_offset = next_section(inventory_len)
+        inventory = json.loads(
+            self.mmap[inventory_offset : inventory_offset + inventory_len].decode(
+                "utf-8"
+            )
+        )
+
+        # Role/phoneme id -> string
+        self.roles: typing.List[typing.Optional[str]] = inventory["roles"]
+        self.phoneme_strs: typing.List[str] = [
+            sys.intern(p) for p in inventory["phonemes"]
+        ]
+
+        # Hash of UTF-8 word -> word index + 1 (0 is empty)
+        self.word_slots = self._array("I", next_section, num_slots)
+
+        # Word index -> offset of UTF-8 word in blob (plus end)
+        self.word_key_offsets = self._array("I", next_section, num_words + 1)
+
+        # Word index -> index of first pronunciation (plus end)
+        self.word_offsets = self._array("I", next_section, num_words + 1)
+
+        # Pronunciation index -> index of first phoneme (plus end)
+        self.pron_offsets = self._array("I", next_section, num_prons + 1)
+
+        # Pronunciation index -> role id
+        self.pron_roles = self._array("H", next_section, num_prons)
+
+        # Phoneme ids for all pronunciations
+        self.phonemes = self._array("H", next_section, num_phonemes)
+
+        # Sorted UTF-8 words (byte order is the same as string order)
+        self.words_offset = next_section(words_len)
+
+        self.load_seconds = time.perf_counter() - start_time
+
+    def _array(
+        self, typecode: str, next_section: typing.Callable[[int], int], length: int
+    ) -> typing.Sequence[int]:
+        """Get a view of a little endian integer array in the file"""
+        num_bytes = length * array.array(typecode).itemsize
+        section_offset = next_section(num_bytes)
+        view = memoryview(self.mmap)[section_offset : section_offset + num_bytes]
+
+        if sys.byteorder != "little":
+            # Copy and convert (not shared between processes)
+            values = array.array(typecode, bytes(view))
+            values.byteswap()
+            return values
+
+        # String type, since typing.Literal needs Python 3.8
+        return view.cast(typing.cast("typing.Literal['I', 'H']", typecode))
+
+    def _find(self, word: str) -> int:
+        """Get index of word or -1 if word is not in the lexicon"""
+        key = word.encode("utf-8")
+        key_offsets = self.word_key_offsets
+        words_offset = self.words_offset
+
+        slot = zlib.crc32(key) & self.slot_mask
+        word_idx = self.word_slots[slot] - 1
+        while word_idx >= 0:
+            if (
+                self.mmap[
+                    words_offset
+                    + key_offsets[word_idx] : words_offset
+                    + key_offsets[word_idx + 1]
+                ]
+                == key
+            ):
+                return word_idx
+
+            # Linear probing
+            slot = (slot + 1) & self.slot_mask
+            word_idx = self.word_slots[slot] - 1
+
+        return -1
+
+    def get(self, word: str) -> typing.Optional[ROLE_TO_PHONEMES]:
+        """Get role -> phonemes for a word or None if word is not in the lexicon"""
+        word_idx = self._find(word)
+        if word_idx < 0:
+            return None
+
+        role_to_word: ROLE_TO_PHONEMES = {}
+        for pron_idx in range(
+            self.word_offsets[word_idx], self.word_offsets[word_idx + 1]
+        ):
+            phoneme_ids = self.phonemes[
+                self.pron_offsets[pron_idx] : self.pron_offsets[pron_idx + 1]
+            ]
+            role = self.roles[self.pron_roles[pron_idx]]
+            role_to_word[role or ""] = [
+                self.phoneme_strs[phoneme_id] for phoneme_id in phoneme_ids
+            ]
+
+        return role_to_word
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the memory-mapped file in bytes"""
+        return len(self.mmap)
+
+    def __contains__(self, word: str) -> bool:
+        return self._find(word) >= 0
+
+    def __len__(self) -> int:
+        return self.num_words
+
+
+def _pad4(num_bytes: int) -> int:
+    """Number of padding bytes to keep sections 4-byte aligned"""
+    return (4 - (num_bytes % 4)) % 4
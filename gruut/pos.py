@@ -33,12 +33,15 @@ import logging
 import os
 import string
 import sys
+import threading
 import time
 import typing
 from pathlib import Path
 
-import jsonlines
-import pycrfsuite
+from gruut.utils import LRUCache
+
+if typing.TYPE_CHECKING:
+    import pycrfsuite
 
 _LOGGER = logging.getLogger("gruut.pos")
 
@@ -48,13 +51,21 @@ FEATURES_TYPE = typing.Dict[
     str, typing.Union[str, bool, int, float, typing.Sequence[str]]
 ]
 
+# Number of words whose local features are kept between sentences
+DEFAULT_FEATURES_CACHE_SIZE = 10000
+
 
 class PartOfSpeechTagger:
     """Part of speech tagger using a pre-trained CRF model"""
 
     def __init__(
-        self, crf_tagger: typing.Union[str, Path, pycrfsuite.Tagger], **kwargs
+        self,
+        crf_tagger: typing.Union[str, Path, "pycrfsuite.Tagger"],
+        features_cache_size: typing.Optional[int] = DEFAULT_FEATURES_CACHE_SIZE,
+        **kwargs,
     ):
+        import pycrfsuite
+
         if isinstance(crf_tagger, pycrfsuite.Tagger):
             self.crf_tagger = crf_tagger
         else:
@@ -62,10 +73,42 @@ class PartOfSpeechTagger:
             self.crf_tagger = pycrfsuite.Tagger()
             self.crf_tagger.open(str(crf_tagger))
 
+        # CRF tagger keeps state between set and tag, so it can't be used by
+        # multiple threads at once.
+        self.tagger_lock = threading.Lock()
+
+        # word -> local features for each context position (0 disables cache)
+        self.features_cache: typing.Optional[LRUCache] = None
+        if (features_cache_size is None) or (features_cache_size > 0):
+            self.features_cache = LRUCache(max_size=features_cache_size)
+
     def __call__(self, words: typing.Sequence[str]) -> typing.Sequence[str]:
         """Returns POS tag for each word"""
-        features = PartOfSpeechTagger.sent2features(words)
-        return self.crf_tagger.tag(features)
+        features = PartOfSpeechTagger.sent2features(
+            words, features_cache=self.features_cache
+        )
+
+        with self.tagger_lock:
+            return self.crf_tagger.tag(features)
+
+    def tag_sentences(
+        self, sentences: typing.Iterable[typing.Sequence[str]]
+    ) -> typing.List[typing.Sequence[str]]:
+        """Returns POS tags for each sentence (identical sentences are tagged once)"""
+        # words -> tags
+        sentence_tags: typing.Dict[typing.Tuple[str, ...], typing.Sequence[str]] = {}
+        all_tags: typing.List[typing.Sequence[str]] = []
+
+        for words in sentences:
+            words_key = tuple(words)
+            tags = sentence_tags.get(words_key)
+            if tags is None:
+                tags = self(words)
+                sentence_tags[words_key] = tags
+
+            all_tags.append(tags)
+
+        return all_tags
 
     @staticmethod
     def local_features(
@@ -147,12 +190,81 @@ class PartOfSpeechTagger:
 
     @staticmethod
     def sent2features(
-        sentence: typing.Sequence[str], **kwargs
+        sentence: typing.Sequence[str],
+        add_bos: bool = True,
+        add_eos: bool = True,
+        words_backward: int = 2,
+        words_forward: int = 2,
+        features_cache: typing.Optional[LRUCache] = None,
+        **kwargs,
+    ) -> typing.List[FEATURES_TYPE]:
+        """
+        Get features for all words in a sentence.
+
+        Same as word2features for each word, but local features are computed
+        only once per word. features_cache keeps them between sentences, and
+        must only be used with the same feature arguments.
+        """
+        # "", -1:, -2:, ..., +1:, +2:, ...
+        prefixes = (
+            [""]
+            + [f"-{j}:" for j in range(1, words_backward + 1)]
+            + [f"+{j}:" for j in range(1, words_forward + 1)]
+        )
+
+        # Local features of each word, one dict per prefix
+        word_features: typing.List[typing.Sequence[FEATURES_TYPE]] = []
+        for word in sentence:
+            prefixed_features = None
+            if features_cache is not None:
+                prefixed_features = features_cache.get(word)
+
+            if prefixed_features is None:
+                prefixed_features = PartOfSpeechTagger.prefixed_features(
+                    word, prefixes, **kwargs
+                )
+
+                if features_cache is not None:
+                    features_cache[word] = prefixed_features
+
+            word_features.append(prefixed_features)
+
+        num_words = len(sentence)
+        sentence_features: typing.List[FEATURES_TYPE] = []
+
+        for i in range(num_words):
+            # Copy, since cached features are shared
+            features = dict(word_features[i][0])
+
+            if (i == 0) and add_bos:
+                features["BOS"] = True
+
+            if (i == (num_words - 1)) and add_eos:
+                features["EOS"] = True
+
+            for j in range(1, words_backward + 1):
+                if i >= j:
+                    features.update(word_features[i - j][j])
+
+            for j in range(1, words_forward + 1):
+                if i < (num_words - j):
+                    features.update(word_features[i + j][words_backward + j])
+
+            sentence_features.append(features)
+
+        return sentence_features
+
+    @staticmethod
+    def prefixed_features(
+        word: str, prefixes: typing.Sequence[str], **kwargs
     ) -> typing.List[FEATURES_TYPE]:
-        """Get features for all words in a sentence"""
-        return [
-            PartOfSpeechTagger.word2features(sentence, i, **kwargs)
-            for i in range(len(sentence))
+        """Get local features for a word once for each prefix"""
+        features = PartOfSpeechTagger.local_features(word, prefix=prefixes[0], **kwargs)
+        prefix_len = len(prefixes[0])
+
+        return [features] + [
+            {f"{prefix}{key[prefix_len:]}": value for key, value in features.items()}
+            for prefix in prefixes[1:]
         ]
 
     @staticmethod
@@ -194,6 +306,8 @@ def train_model(
         train_sents = conllu.parse(conllu_file.read())
 
     _LOGGER.debug("Training model for %s max iteration(s)", max_iterations)
+    import pycrfsuite
+
     trainer = pycrfsuite.Trainer(verbose=False)
 
     _LOGGER.debug("Getting features for %s training sentence(s)", len(train_sents))
@@ -289,6 +403,8 @@ def do_predict(args):
         if os.isatty(sys.stdin.fileno()):
             print("Reading sentences from stdin...", file=sys.stderr)
 
+    import jsonlines
+
     writer = jsonlines.Writer(sys.stdout, flush=True)
     for line in lines:
         line = line.strip()
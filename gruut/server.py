@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""
+Local HTTP server that keeps gruut models loaded (gruut serve).
+
+Requests that arrive within a short window are processed together with
+TextProcessor.process_batch, so they share lexicon look ups and g2p guesses.
+
+POST /sentences with a JSON object::
+
+    {"text": "...", "lang": "en_US", "ssml": false, ...}
+
+or with a plain text body (lang and ssml may be given in the query string).
+Returns a JSON list of sentences.
+
+GET /health returns request and batch counters, and the number of sentences
+that skipped part of speech tagging (lazy_pos).
+"""
+import argparse
+import concurrent.futures
+import dataclasses
+import json
+import logging
+import os
+import queue
+import socketserver
+import stat
+import sys
+import threading
+import time
+import typing
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from gruut.text_processor import TextProcessor
+
+_LOGGER = logging.getLogger("gruut.server")
+
+# Request fields passed to TextProcessor.process
+PROCESS_ARGS = {
+    "pos": True,
+    "lazy_pos": False,
+    "phonemize": True,
+    "post_process": True,
+    "verbalize_numbers": True,
+    "verbalize_currency": True,
+    "verbalize_dates": True,
+    "verbalize_times": True,
+}
+
+# Request fields passed to TextProcessor.sentences
+SENTENCES_ARGS = {
+    "major_breaks": True,
+    "minor_breaks": True,
+    "punctuations": True,
+    "explicit_lang": True,
+    "phonemes": True,
+    "break_phonemes": True,
+    "pos": True,
+}
+
+# Seconds a request waits for its batch before 503 is returned
+DEFAULT_REQUEST_TIMEOUT = 60.0
+
+# Request fields that are true/false
+BOOL_ARGS = {"ssml", *PROCESS_ARGS, *SENTENCES_ARGS}
+
+# String values of true/false request fields
+TRUE_STRINGS = {"1", "true", "yes"}
+FALSE_STRINGS = {"0", "false", "no"}
+
+# -----------------------------------------------------------------------------
+
+
+@dataclasses.dataclass
+class BatchRequest:
+    """Text waiting to be processed in a batch"""
+
+    text: str
+    lang: str
+    ssml: bool
+    process_args: typing.Dict[str, typing.Any]
+    sentences_args: typing.Dict[str, typing.Any]
+    future: concurrent.futures.Future = dataclasses.field(
+        default_factory=concurrent.futures.Future
+    )
+
+
+class BatchProcessor:
+    """
+    Collects requests from many threads and processes them in small batches.
+
+    The first request of a batch waits at most batch_window seconds for more
+    requests to arrive. Requests with the same language and options are
+    processed together.
+    """
+
+    def __init__(
+        self,
+        text_processor: TextProcessor,
+        batch_window: float = 0.005,
+        max_batch_size: int = 32,
+    ):
+        self.text_processor = text_processor
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+
+        self.num_requests = 0
+        self.num_batches = 0
+
+        self._queue: "queue.Queue[BatchRequest]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(
+        self,
+        text: str,
+        lang: str,
+        ssml: bool = False,
+        process_args: typing.Optional[typing.Dict[str, typing.Any]] = None,
+        sentences_args: typing.Optional[typing.Dict[str, typing.Any]] = None,
+    ) -> concurrent.futures.Future:
+        """Queue text for processing. Future result is a list of sentence dicts."""
+        request = BatchRequest(
+            text=text,
+            lang=lang,
+            ssml=ssml,
+            process_args=process_args or {},
+            sentences_args=sentences_args or {},
+        )
+        self._queue.put(request)
+
+        return request.future
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+
+            try:
+                self._process_batch(batch)
+            except Exception as e:
+                # Keep running, but don't leave any request waiting
+                _LOGGER.exception("Unexpected error while processing batch")
+                for request in batch:
+                    if not request.future.done():
+                        request.future.set_exception(e)
+
+    def _process_batch(self, batch: typing.List[BatchRequest]):
+        """Add requests that arrive within the window to batch, then process it"""
+        deadline = time.monotonic() + self.batch_window
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+
+        self.num_requests += len(batch)
+        self.num_batches += 1
+
+        # Only requests with the same options can share a batch
+        groups: typing.Dict[typing.Hashable, typing.List[BatchRequest]] = {}
+        for request in batch:
+            group_key = (
+                request.lang,
+                request.ssml,
+                tuple(sorted(request.process_args.items())),
+            )
+            groups.setdefault(group_key, []).append(request)
+
+        for group in groups.values():
+            self._process_group(group)
+
+    def _process_group(self, group: typing.List[BatchRequest]):
+        first_request = group[0]
+
+        try:
+            graphs_roots = self.text_processor.process_batch(
+                [request.text for request in group],
+                lang=first_request.lang,
+                ssml=first_request.ssml,
+                **first_request.process_args,
+            )
+        except Exception:
+            if len(group) > 1:
+                # Process requests individually to find which one(s) failed
+                for request in group:
+                    self._process_group([request])
+            else:
+                _LOGGER.exception(first_request.text)
+                first_request.future.set_exception(
+                    ValueError(f"Failed to process text: {first_request.text}")
+                )
+
+            return
+
+        for request, (graph, root) in zip(group, graphs_roots):
+            try:
+                request.future.set_result(
+                    [
+                        dataclasses.asdict(sentence)
+                        for sentence in self.text_processor.sentences(
+                            graph, root, **request.sentences_args
+                        )
+                    ]
+                )
+            except Exception as e:
+                _LOGGER.exception(request.text)
+                request.future.set_exception(e)
+
+
+# -----------------------------------------------------------------------------
+
+
+class SentencesHandler(BaseHTTPRequestHandler):
+    """Handles /sentences and /health requests"""
+
+    # Set on server
+    server: typing.Any
+
+    def do_GET(self):
+        """Health check with counters"""
+        if urlparse(self.path).path != "/health":
+            self.send_error(404)
+            return
+
+        batcher = self.server.batcher
+        self._send_json(
+            {
+                "status": "ok",
+                "requests": batcher.num_requests,
+                "batches": batcher.num_batches,
+                "pos_skipped": batcher.text_processor.num_pos_skipped,
+            }
+        )
+
+    def do_POST(self):
+        """Process text/SSML and return sentences"""
+        url = urlparse(self.path)
+        if url.path != "/sentences":
+            self.send_error(404)
+            return
+
+        content_length = int(self.headers.get("Content-Length", 0))
+        body_bytes = self.rfile.read(content_length)
+
+        try:
+            body = body_bytes.decode("utf-8")
+            request = self._parse_request(body, url.query)
+            text = request["text"]
+            assert isinstance(text, str), "text must be a string"
+        except Exception as e:
+            self.send_error(400, explain=str(e))
+            return
+
+        future = self.server.batcher.submit(
+            text,
+            lang=request.get("lang", self.server.default_lang),
+            ssml=request.get("ssml", False),
+            process_args={
+                key: request.get(key, default) for key, default in PROCESS_ARGS.items()
+            },
+            sentences_args={
+                key: request.get(key, default)
+                for key, default in SENTENCES_ARGS.items()
+            },
+        )
+
+        try:
+            sentences = future.result(
+                timeout=getattr(self.server, "request_timeout", DEFAULT_REQUEST_TIMEOUT)
+            )
+        except concurrent.futures.TimeoutError:
+            self.send_error(503, explain="Timed out waiting for text to be processed")
+            return
+        except Exception as e:
+            self.send_error(500, explain=str(e))
+            return
+
+        self._send_json(sentences)
+
+    def _parse_request(self, body: str, query: str) -> typing.Dict[str, typing.Any]:
+        content_type = self.headers.get("Content-Type", "")
+        if content_type.startswith("application/json"):
+            request = json.loads(body)
+            assert isinstance(request, dict), "Expected JSON object"
+        else:
+            # Plain text or SSML with options in query string
+            request = {key: values[0] for key, values in parse_qs(query).items()}
+            if content_type.startswith("application/ssml+xml"):
+                request["ssml"] = True
+
+            request["text"] = body
+
+        for key in BOOL_ARGS:
+            if key in request:
+                request[key] = parse_bool(key, request[key])
+
+        return request
+
+    def _send_json(self, value: typing.Any):
+        response = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def address_string(self) -> str:
+        # Unix socket clients don't have an address
+        if isinstance(self.client_address, tuple) and self.client_address:
+            return str(self.client_address[0])
+
+        return "unix"
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        _LOGGER.debug("%s - %s", self.address_string(), format % args)
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """HTTP server on a Unix domain socket"""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class TCPHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    """HTTP server on a TCP port"""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+
+# -----------------------------------------------------------------------------
+
+
+def parse_bool(key: str, value: typing.Any) -> bool:
+    """Convert a true/false request field from JSON or the query string"""
+    if isinstance(value, bool):
+        return value
+
+    if isinstance(value, str):
+        value_str = value.strip().lower()
+        if value_str in TRUE_STRINGS:
+            return True
+
+        if value_str in FALSE_STRINGS:
+            return False
+    elif isinstance(value, int) and (value in (0, 1)):
+        return bool(value)
+
+    raise ValueError(f"{key} must be true or false, got {value!r}")
+
+
+def serve(args: argparse.Namespace):
+    """Run server until interrupted (gruut serve)"""
+    if args.debug:
+        logging.basicConfig(level=logging.DEBUG)
+    else:
+        logging.basicConfig(level=logging.INFO)
+
+    model_prefix = "espeak" if args.espeak else args.model_prefix
+
+    text_processor = TextProcessor(
+        default_lang=args.language,
+        model_prefix=model_prefix or "",
+        g2p_cache_path=args.g2p_cache,
+    )
+
+    # Load models before accepting requests
+    text_processor("preload", lang=args.language)
+
+    batcher = BatchProcessor(
+        text_processor,
+        batch_window=args.batch_window_ms / 1000,
+        max_batch_size=args.max_batch_size,
+    )
+
+    server: socketserver.BaseServer
+    if args.unix_socket:
+        if os.path.exists(args.unix_socket):
+            if not stat.S_ISSOCK(os.stat(args.unix_socket).st_mode):
+                _LOGGER.fatal("Not a socket, won't replace: %s", args.unix_socket)
+                sys.exit(1)
+
+            # Left over from a previous server
+            os.unlink(args.unix_socket)
+
+        server = UnixHTTPServer(args.unix_socket, SentencesHandler)
+        _LOGGER.info("Listening on %s", args.unix_socket)
+    else:
+        server = TCPHTTPServer((args.host, args.port), SentencesHandler)
+        _LOGGER.info("Listening on http://%s:%s", args.host, args.port)
+
+    setattr(server, "batcher", batcher)
+    setattr(server, "default_lang", args.language)
+    setattr(server, "request_timeout", args.request_timeout)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+        if args.unix_socket and os.path.exists(args.unix_socket):
+            os.unlink(args.unix_socket)
+
+
+def get_args(argv: typing.Sequence[str]) -> argparse.Namespace:
+    """Parse command-line arguments for gruut serve"""
+    parser = argparse.ArgumentParser(prog="gruut serve")
+    parser.add_argument(
+        "-l",
+        "--language",
+        default="en-us",
+        help="Default language code (default: en-us)",
+    )
+    parser.add_argument(
+        "--host", default="127.0.0.1", help="Host to listen on (default: 127.0.0.1)"
+    )
+    parser.add_argument(
+        "--port", type=int, default=5000, help="Port to listen on (default: 5000)"
+    )
+    parser.add_argument(
+        "--unix-socket", help="Listen on a Unix domain socket instead of a port"
+    )
+    parser.add_argument(
+        "--batch-window-ms",
+        type=float,
+        default=5.0,
+        help="Milliseconds to wait for more requests to batch (default: 5)",
+    )
+    parser.add_argument(
+        "--max-batch-size",
+        type=int,
+        default=32,
+        help="Maximum number of requests in a batch (default: 32)",
+    )
+    parser.add_argument(
+        "--request-timeout",
+        type=float,
+        default=DEFAULT_REQUEST_TIMEOUT,
+        help="Seconds to wait for a request to be processed before returning 503 (default: 60)",
+    )
+    parser.add_argument(
+        "--espeak",
+        action="store_true",
+        help="Use eSpeak versions of lexicons (overrides --model-prefix)",
+    )
+    parser.add_argument(
+        "--model-prefix",
+        help="Sub-directory of gruut language data files with different lexicon, etc. (e.g., espeak)",
+    )
+    parser.add_argument(
+        "--g2p-cache",
+        help="Path to SQLite database where guessed pronunciations are saved and reused",
+    )
+    parser.add_argument(
+        "--debug", action="store_true", help="Print DEBUG messages to console"
+    )
+
+    return parser.parse_args(argv)
@@ -1,22 +1,19 @@
 #!/usr/bin/env python3
 """Tokenizes, verbalizes, and phonemizes text and SSML"""
+import concurrent.futures
+import functools
 import itertools
 import logging
 import re
+import threading
 import typing
 import xml.etree.ElementTree as etree
 from decimal import Decimal
 from pathlib import Path
 
-import babel
-import babel.numbers
-import dateparser
-import networkx as nx
-from gruut_ipa import IPA
-from num2words import num2words
-
 from gruut.const import (
     DATA_PROP,
+    NUM_PASSES_PROP,
     PHONEMES_TYPE,
     REGEX_PATTERN,
     BreakNode,
@@ -42,12 +39,18 @@ from gruut.const import (
     WordNode,
     WordRole,
 )
+from gruut.graph import TextGraph
 from gruut.lang import get_settings
 from gruut.utils import (
+    CacheStats,
+    LRUCache,
+    NumberParser,
+    NumericDateParser,
     attrib_no_namespace,
-    leaves,
+    dfs_preorder_nodes,
     load_lexicon,
     maybe_split_ipa,
+    pipeline_leaves,
     pipeline_split,
     pipeline_transform,
     pipeline_transform_window,
@@ -62,6 +65,12 @@ _LOGGER = logging.getLogger("gruut.text_processor")
 
 DEFAULT_LEXICON_ID = ""
 
+# Default maximum number of parsed/verbalized values cached for each kind
+DEFAULT_VERBALIZE_CACHE_SIZE = 10000
+
+# Returned from cache when value needs to be computed
+_NOT_CACHED = object()
+
 
 # -----------------------------------------------------------------------------
 
@@ -78,6 +87,8 @@ class TextProcessor:
         settings: typing.Optional[
             typing.MutableMapping[str, TextProcessorSettings]
         ] = None,
+        graph_class: typing.Optional[typing.Callable[[], GraphType]] = None,
+        verbalize_cache_size: typing.Optional[int] = DEFAULT_VERBALIZE_CACHE_SIZE,
         **kwargs,
     ):
         self.default_lang = default_lang
@@ -99,6 +110,41 @@ class TextProcessor:
 
         self.settings = settings
 
+        # Type of graph created in process (e.g., networkx.DiGraph)
+        self.graph_class = graph_class or TextGraph
+
+        # Settings are created on demand by any thread
+        self._settings_lock = threading.RLock()
+
+        # Sentences tagged/not tagged with lazy_pos=True
+        self.num_pos_tagged = 0
+        self.num_pos_skipped = 0
+
+        # Numbers, currency, and dates repeat often, so parsing babel and
+        # num2words results are cached. Keys include the locale/language.
+        self.parse_number_cache = LRUCache(max_size=verbalize_cache_size)
+        self.verbalize_number_cache = LRUCache(max_size=verbalize_cache_size)
+        self.verbalize_currency_cache = LRUCache(max_size=verbalize_cache_size)
+        self.verbalize_date_cache = LRUCache(max_size=verbalize_cache_size)
+        self.parse_date_cache = LRUCache(max_size=verbalize_cache_size)
+
+        # babel locale -> number parser
+        self.number_parsers: typing.Dict[str, NumberParser] = {}
+
+        # date format -> numeric date parser
+        self.date_parsers: typing.Dict[str, NumericDateParser] = {}
+
+    @property
+    def cache_stats(self) -> typing.Dict[str, CacheStats]:
+        """Hit/miss/eviction counters for number/date parsing and verbalization"""
+        return {
+            "parse_number": self.parse_number_cache.stats,
+            "parse_date": self.parse_date_cache.stats,
+            "verbalize_number": self.verbalize_number_cache.stats,
+            "verbalize_currency": self.verbalize_currency_cache.stats,
+            "verbalize_date": self.verbalize_date_cache.stats,
+        }
+
     def sentences(
         self,
         graph: GraphType,
@@ -133,7 +179,7 @@ class TextProcessor:
 
         sentences: typing.List[Sentence] = []
 
-        for dfs_node in nx.dfs_preorder_nodes(graph, root.node):
+        for dfs_node in dfs_preorder_nodes(graph, root.node):
             node = graph.nodes[dfs_node][DATA_PROP]
             if isinstance(node, ParagraphNode):
                 par_idx += 1
@@ -404,31 +450,37 @@ class TextProcessor:
         if lang_settings is not None:
             return lang_settings
 
-        # Try again with resolved language
-        resolved_lang = resolve_lang(lang)
-        lang_settings = self.settings.get(resolved_lang)
-        if lang_settings is not None:
-            # Patch for the future
-            self.settings[lang] = self.settings[resolved_lang]
-            return lang_settings
-
-        _LOGGER.debug(
-            "No custom settings for language %s (%s). Creating default settings.",
-            lang,
-            resolved_lang,
-        )
+        with self._settings_lock:
+            lang_settings = self.settings.get(lang)
+            if lang_settings is not None:
+                # Created by another thread
+                return lang_settings
+
+            # Try again with resolved language
+            resolved_lang = resolve_lang(lang)
+            lang_settings = self.settings.get(resolved_lang)
+            if lang_settings is not None:
+                # Patch for the future
+                self.settings[lang] = self.settings[resolved_lang]
+                return lang_settings
+
+            _LOGGER.debug(
+                "No custom settings for language %s (%s). Creating default settings.",
+                lang,
+                resolved_lang,
+            )
 
-        # Create default settings for language
-        lang_dir = self.lang_dirs.get(lang)
-        lang_settings = get_settings(
-            lang,
-            lang_dir=lang_dir,
-            model_prefix=self.model_prefix,
-            search_dirs=self.search_dirs,
-            **self.default_settings_kwargs,
-        )
-        self.settings[lang] = lang_settings
-        self.settings[resolved_lang] = lang_settings
+            # Create default settings for language
+            lang_dir = self.lang_dirs.get(lang)
+            lang_settings = get_settings(
+                lang,
+                lang_dir=lang_dir,
+                model_prefix=self.model_prefix,
+                search_dirs=self.search_dirs,
+                **self.default_settings_kwargs,
+            )
+            self.settings[lang] = lang_settings
+            self.settings[resolved_lang] = lang_settings
 
         return lang_settings
 
@@ -448,6 +500,7 @@ class TextProcessor:
         pos: bool = True,
         phonemize: bool = True,
         post_process: bool = True,
+        lazy_pos: bool = False,
         add_speak_tag: bool = True,
         detect_numbers: bool = True,
         detect_currency: bool = True,
@@ -469,6 +522,7 @@ class TextProcessor:
             pos: False if part of speech tagging should be disabled
             phonemize: False if phonemization should be disabled
             post_process: False if sentence/graph post-processing should be disabled
+            lazy_pos: True if only sentences whose pronunciation depends on part of speech should be tagged
             add_speak_tag: True if <speak> should be automatically added to input text when ssml=True
             detect_numbers: True if numbers should be annotated in text (interpret_as="number")
             detect_currency: True if currency amounts should be annotated in text (interpret_as="currency")
@@ -478,11 +532,124 @@ class TextProcessor:
             verbalize_currency: True if annotated currency amounts should be expanded into words
             verbalize_dates: True if annotated dates should be expanded into words
             verbalize_times: True if annotated clock times should be expanded into words
+            max_passes: maximum number of passes over the graph (stops early when nothing changes)
 
         Returns:
             graph, root: text graph and root node
 
         """
+        graph, root, inline_lexicons = self._process_text(
+            text,
+            lang=lang,
+            ssml=ssml,
+            add_speak_tag=add_speak_tag,
+            detect_numbers=detect_numbers,
+            detect_currency=detect_currency,
+            detect_dates=detect_dates,
+            detect_times=detect_times,
+            verbalize_numbers=verbalize_numbers,
+            verbalize_currency=verbalize_currency,
+            verbalize_dates=verbalize_dates,
+            verbalize_times=verbalize_times,
+            max_passes=max_passes,
+        )
+
+        self._process_words(
+            [(graph, root, inline_lexicons)],
+            pos=pos,
+            phonemize=phonemize,
+            lazy_pos=lazy_pos,
+        )
+
+        if post_process:
+            self._post_process(graph, root)
+
+        return graph, root
+
+    async def aprocess(
+        self,
+        text: str,
+        executor: typing.Optional[concurrent.futures.Executor] = None,
+        **process_args,
+    ) -> typing.Tuple[GraphType, Node]:
+        """
+        Processes text or SSML on an executor without blocking the event loop.
+
+        Uses the event loop's default executor if executor is None. Only thread
+        executors are supported, since the processor and graph are not sent
+        between processes (see gruut.asentences for process pools).
+        """
+        if isinstance(executor, concurrent.futures.ProcessPoolExecutor):
+            raise ValueError("aprocess requires a thread executor")
+
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor, functools.partial(self.process, text, **process_args)
+        )
+
+    def process_batch(
+        self,
+        texts: typing.Iterable[str],
+        pos: bool = True,
+        phonemize: bool = True,
+        post_process: bool = True,
+        lazy_pos: bool = False,
+        **process_args,
+    ) -> typing.List[typing.Tuple[GraphType, Node]]:
+        """
+        Processes many texts or SSML documents at once
+
+        Words are deduplicated across the whole batch: lexicon lookups are done
+        with bulk queries per language, phonemes are guessed once per unique
+        out-of-vocabulary word, and all sentences are tagged together.
+
+        Args:
+            texts: input texts or SSML documents (ssml=True)
+            pos: False if part of speech tagging should be disabled
+            phonemize: False if phonemization should be disabled
+            post_process: False if sentence/graph post-processing should be disabled
+            lazy_pos: True if only sentences whose pronunciation depends on part of speech should be tagged
+            **process_args: keyword arguments passed to TextProcessor.process
+
+        Returns:
+            graphs_roots: text graph and root node for each text (in order)
+
+        """
+        docs = [self._process_text(text, **process_args) for text in texts]
+        self._process_words(docs, pos=pos, phonemize=phonemize, lazy_pos=lazy_pos)
+
+        graphs_roots: typing.List[typing.Tuple[GraphType, Node]] = []
+        for graph, root, _inline_lexicons in docs:
+            if post_process:
+                self._post_process(graph, root)
+
+            graphs_roots.append((graph, root))
+
+        return graphs_roots
+
+    def _process_text(
+        self,
+        text: str,
+        lang: typing.Optional[str] = None,
+        ssml: bool = False,
+        add_speak_tag: bool = True,
+        detect_numbers: bool = True,
+        detect_currency: bool = True,
+        detect_dates: bool = True,
+        detect_times: bool = True,
+        verbalize_numbers: bool = True,
+        verbalize_currency: bool = True,
+        verbalize_dates: bool = True,
+        verbalize_times: bool = True,
+        max_passes: int = 5,
+    ) -> typing.Tuple[GraphType, Node, typing.Dict[str, InlineLexicon]]:
+        """Parses text or SSML into a graph and runs pipeline (see process)"""
+        # Patterns may have been changed since the last text
+        for settings in list(self.settings.values()):
+            settings.update_matchers()
+
         if ssml:
             try:
                 root_element = etree.fromstring(text)
@@ -503,7 +670,7 @@ class TextProcessor:
             def iter_elements():
                 yield text
 
-        graph = typing.cast(GraphType, nx.DiGraph())
+        graph = typing.cast(GraphType, self.graph_class())
 
         # Parse XML
         last_paragraph: typing.Optional[ParagraphNode] = None
@@ -1000,9 +1167,13 @@ class TextProcessor:
 
         assert root is not None
 
-        # Do multiple passes over the graph
-        num_passes_left = max_passes
-        while num_passes_left > 0:
+        # Do multiple passes over the graph until nothing changes.
+        #
+        # Each stage only visits leaves that are new or changed since it last
+        # ran, and only reports a change when it actually modified the graph.
+        num_passes = 0
+        while num_passes < max_passes:
+            num_passes += 1
             was_changed = False
 
             # Do replacements before minor/major breaks
@@ -1095,109 +1266,241 @@ class TextProcessor:
                 # No changes, so we can stop
                 break
 
-            num_passes_left -= 1
+        # Number of passes is available to callers as graph.graph["num_passes"]
+        graph.graph[NUM_PASSES_PROP] = num_passes
+        _LOGGER.debug("Processed text in %s pass(es)", num_passes)
+
+        return graph, root, inline_lexicons
+
+    def _process_words(
+        self,
+        docs: typing.Sequence[
+            typing.Tuple[GraphType, Node, typing.Dict[str, InlineLexicon]]
+        ],
+        pos: bool = True,
+        phonemize: bool = True,
+        lazy_pos: bool = False,
+    ):
+        """Tags and phonemizes words from all sentences of (graph, root, inline lexicons)"""
+        if not (pos or phonemize):
+            return
 
         # Gather words from leaves of the tree, group by sentence
-        def process_sentence(words: typing.List[WordNode]):
-            if pos:
-                pos_settings = self.get_settings(node.lang)
-                if pos_settings.get_parts_of_speech is not None:
-                    pos_tags = pos_settings.get_parts_of_speech(
-                        [word.text for word in words]
-                    )
-                    for word, pos_tag in zip(words, pos_tags):
-                        word.pos = pos_tag
+        # [(words, inline lexicons)]
+        doc_sentences: typing.List[
+            typing.Tuple[typing.List[WordNode], typing.Dict[str, InlineLexicon]]
+        ] = []
 
-                        if not word.role:
-                            word.role = f"gruut:{pos_tag}"
+        for graph, root, inline_lexicons in docs:
+            sentence_words: typing.List[WordNode] = []
 
-            if phonemize:
-                # Add phonemes to word
-                for word in words:
-                    if word.phonemes:
-                        # Word already has phonemes
+            for dfs_node in dfs_preorder_nodes(graph, root.node):
+                node = graph.nodes[dfs_node][DATA_PROP]
+                if isinstance(node, SentenceNode):
+                    if sentence_words:
+                        doc_sentences.append((sentence_words, inline_lexicons))
+                        sentence_words = []
+                elif graph.out_degree(dfs_node) == 0:
+                    if isinstance(node, WordNode):
+                        word_node = typing.cast(WordNode, node)
+                        sentence_words.append(word_node)
+
+            if sentence_words:
+                # Final sentence
+                doc_sentences.append((sentence_words, inline_lexicons))
+
+        if pos:
+            if lazy_pos:
+                # Skip sentences where tags can't change pronunciations
+                sentences_to_tag = [
+                    words
+                    for words, inline_lexicons in doc_sentences
+                    if self._needs_pos(words, inline_lexicons)
+                ]
+
+                self.num_pos_tagged += len(sentences_to_tag)
+                self.num_pos_skipped += len(doc_sentences) - len(sentences_to_tag)
+            else:
+                sentences_to_tag = [words for words, _ in doc_sentences]
+
+            self._tag_sentences(sentences_to_tag)
+
+        if phonemize:
+            self._phonemize_sentences(doc_sentences)
+
+    def _needs_pos(
+        self,
+        words: typing.Sequence[WordNode],
+        inline_lexicons: typing.Dict[str, InlineLexicon],
+    ) -> bool:
+        """True if part of speech tags may change the sentence's pronunciations"""
+        for word in words:
+            word_settings = self.get_settings(word.lang)
+            if word_settings.get_parts_of_speech is None:
+                continue
+
+            if word_settings.post_process_needs_pos:
+                return True
+
+            if word.phonemes or word.role:
+                # Tags won't change phonemes or role
+                continue
+
+            for lexicon in inline_lexicons.values():
+                role_phonemes = lexicon.words.get(word.text)
+                if role_phonemes and any(
+                    role not in {WordRole.DEFAULT, WordRole.LETTER}
+                    for role in role_phonemes
+                ):
+                    return True
+
+            if word_settings.lookup_phonemes is not None:
+                is_heteronym = getattr(
+                    word_settings.lookup_phonemes, "is_heteronym", None
+                )
+                if (is_heteronym is None) or is_heteronym(word.text):
+                    # Role-ambiguous (or unknown)
+                    return True
+
+        return False
+
+    def _tag_sentences(self, sentences: typing.Sequence[typing.List[WordNode]]):
+        """Adds part of speech tags to words, tagging all sentences of a language together"""
+        # lang -> [sentence words]
+        # The language of a sentence's last word selects the tagger.
+        lang_sentences: typing.Dict[str, typing.List[typing.List[WordNode]]] = {}
+        for words in sentences:
+            lang_sentences.setdefault(words[-1].lang, []).append(words)
+
+        for lang, words_to_tag in lang_sentences.items():
+            pos_settings = self.get_settings(lang)
+            if pos_settings.get_parts_of_speech is None:
+                continue
+
+            word_texts = [[word.text for word in words] for words in words_to_tag]
+            tag_sentences = getattr(
+                pos_settings.get_parts_of_speech, "tag_sentences", None
+            )
+            if tag_sentences is not None:
+                # Tag all sentences at once
+                sentences_tags = tag_sentences(word_texts)
+            else:
+                sentences_tags = [
+                    pos_settings.get_parts_of_speech(texts) for texts in word_texts
+                ]
+
+            for words, pos_tags in zip(words_to_tag, sentences_tags):
+                for word, pos_tag in zip(words, pos_tags):
+                    word.pos = pos_tag
+
+                    if not word.role:
+                        word.role = f"gruut:{pos_tag}"
+
+    def _phonemize_sentences(
+        self,
+        doc_sentences: typing.Sequence[
+            typing.Tuple[typing.List[WordNode], typing.Dict[str, InlineLexicon]]
+        ],
+    ):
+        """Adds phonemes to words from inline lexicons, phoneme lexicon, or guesser"""
+        # lang -> [word]
+        lang_words: typing.Dict[str, typing.List[WordNode]] = {}
+
+        for words, inline_lexicons in doc_sentences:
+            for word in words:
+                if word.phonemes:
+                    # Word already has phonemes
+                    continue
+
+                lexicon_ids: typing.List[str] = []
+
+                if word.lexicon_ids:
+                    lexicon_ids.extend(word.lexicon_ids)
+
+                lexicon_ids.append(DEFAULT_LEXICON_ID)
+
+                # Look up phonemes from inline <lexicon>
+                for lexicon_id in lexicon_ids:
+                    lexicon = inline_lexicons.get(lexicon_id)
+                    if lexicon is None:
                         continue
 
-                    lexicon_ids: typing.List[str] = []
+                    maybe_role_phonemes = lexicon.words.get(word.text)
+                    if maybe_role_phonemes is None:
+                        continue
 
-                    if word.lexicon_ids:
-                        lexicon_ids.extend(word.lexicon_ids)
+                    maybe_phonemes = maybe_role_phonemes.get(word.role)
 
-                    lexicon_ids.append(DEFAULT_LEXICON_ID)
+                    if (maybe_phonemes is None) and (word.role != WordRole.DEFAULT):
+                        # Try again with default role
+                        maybe_phonemes = maybe_role_phonemes.get(WordRole.DEFAULT)
 
-                    # Look up phonemes from inline <lexicon>
-                    for lexicon_id in lexicon_ids:
-                        lexicon = inline_lexicons.get(lexicon_id)
-                        if lexicon is None:
-                            continue
+                    if maybe_phonemes is not None:
+                        # Found inline pronunciation
+                        word.phonemes = maybe_phonemes
+                        break
 
-                        maybe_role_phonemes = lexicon.words.get(word.text)
-                        if maybe_role_phonemes is None:
-                            continue
+                if word.phonemes:
+                    # Got phonemes from inline lexicon
+                    continue
 
-                        maybe_phonemes = maybe_role_phonemes.get(word.role)
+                lang_words.setdefault(word.lang, []).append(word)
 
-                        if (maybe_phonemes is None) and (word.role != WordRole.DEFAULT):
-                            # Try again with default role
-                            maybe_phonemes = maybe_role_phonemes.get(WordRole.DEFAULT)
+        for lang, words in lang_words.items():
+            phonemize_settings = self.get_settings(lang)
+            if phonemize_settings.lookup_phonemes is not None:
+                words_roles = [(word.text, word.role) for word in words]
+                lookup_batch = getattr(
+                    phonemize_settings.lookup_phonemes, "lookup_batch", None
+                )
+                if lookup_batch is not None:
+                    # Bulk lexicon look up
+                    words_phonemes = lookup_batch(words_roles)
+                else:
+                    words_phonemes = [
+                        phonemize_settings.lookup_phonemes(word_text, word_role)
+                        for word_text, word_role in words_roles
+                    ]
 
-                        if maybe_phonemes is not None:
-                            # Found inline pronunciation
-                            word.phonemes = maybe_phonemes
-                            break
+                for word, word_phonemes in zip(words, words_phonemes):
+                    word.phonemes = word_phonemes
 
+            if phonemize_settings.guess_phonemes is not None:
+                # Guess each unique out-of-vocabulary word only once.
+                # (text, role) -> phonemes
+                guessed_phonemes: typing.Dict[
+                    typing.Tuple[str, str], typing.Optional[PHONEMES_TYPE]
+                ] = {}
+
+                for word in words:
                     if word.phonemes:
-                        # Got phonemes from inline lexicon
                         continue
 
-                    phonemize_settings = self.get_settings(word.lang)
-                    if phonemize_settings.lookup_phonemes is not None:
-                        word.phonemes = phonemize_settings.lookup_phonemes(
-                            word.text, word.role
+                    guess_key = (word.text, word.role)
+                    if guess_key in guessed_phonemes:
+                        # Copy so words can be modified independently in post-processing
+                        maybe_phonemes = guessed_phonemes[guess_key]
+                        word.phonemes = (
+                            list(maybe_phonemes) if maybe_phonemes is not None else None
                         )
-
-                    if (not word.phonemes) and (
-                        phonemize_settings.guess_phonemes is not None
-                    ):
+                    else:
                         word.phonemes = phonemize_settings.guess_phonemes(
                             word.text, word.role
                         )
+                        guessed_phonemes[guess_key] = word.phonemes
 
-        # Process tree leaves
-        sentence_words: typing.List[WordNode] = []
-
-        for dfs_node in nx.dfs_preorder_nodes(graph, root.node):
+    def _post_process(self, graph: GraphType, root: Node):
+        """Post-processes sentences and then entire graph"""
+        for dfs_node in dfs_preorder_nodes(graph, root.node):
             node = graph.nodes[dfs_node][DATA_PROP]
             if isinstance(node, SentenceNode):
-                if sentence_words:
-                    process_sentence(sentence_words)
-                    sentence_words = []
-            elif graph.out_degree(dfs_node) == 0:
-                if isinstance(node, WordNode):
-                    word_node = typing.cast(WordNode, node)
-                    sentence_words.append(word_node)
-
-        if sentence_words:
-            # Final sentence
-            process_sentence(sentence_words)
-            sentence_words = []
+                sent_node = typing.cast(SentenceNode, node)
+                sent_settings = self.get_settings(sent_node.lang)
+                if sent_settings.post_process_sentence is not None:
+                    sent_settings.post_process_sentence(graph, sent_node, sent_settings)
 
-        if post_process:
-            # Post-process sentences
-            for dfs_node in nx.dfs_preorder_nodes(graph, root.node):
-                node = graph.nodes[dfs_node][DATA_PROP]
-                if isinstance(node, SentenceNode):
-                    sent_node = typing.cast(SentenceNode, node)
-                    sent_settings = self.get_settings(sent_node.lang)
-                    if sent_settings.post_process_sentence is not None:
-                        sent_settings.post_process_sentence(
-                            graph, sent_node, sent_settings
-                        )
-
-            # Post process entire graph
-            self.post_process_graph(graph, root)
-
-        return graph, root
+        # Post process entire graph
+        self.post_process_graph(graph, root)
 
     def post_process_graph(self, graph: GraphType, root: Node):
         """User-defined post-processing of entire graph"""
@@ -1212,10 +1515,20 @@ class TextProcessor:
         was_changed = False
 
         # This involves:
-        # 1. Identifying where in the edge list of sentence the break occurs
-        # 2. Creating a new sentence next to the existing one in the parent paragraph
-        # 3. Moving everything after the break into the new sentence
-        for leaf_node in list(leaves(graph, root)):
+        # 1. Identifying where in the edge list of sentence the breaks occur
+        # 2. Creating new sentences next to the existing one in the parent paragraph
+        # 3. Moving everything after each break into the new sentences
+        #
+        # All breaks in a sentence (and all new sentences in a paragraph) are
+        # handled at once, so long sentences/paragraphs are only rebuilt once.
+
+        # sentence node -> indexes of sentence edges that end with a break
+        sentence_breaks: typing.Dict[int, typing.Set[int]] = {}
+
+        # sentence node -> edge index of each child
+        sentence_edge_idxs: typing.Dict[int, typing.Dict[int, int]] = {}
+
+        for leaf_node in pipeline_leaves(self._break_sentences, graph, root):
             if not isinstance(leaf_node, BreakWordNode):
                 # Not a break
                 continue
@@ -1247,40 +1560,78 @@ class TextProcessor:
             # Probably a WordNode
             below_s_node = s_path[-2]
 
-            # Edges after the break will need to be moved to the new sentence
-            s_edges = list(graph.out_edges(s_node.node))
-            break_edge_idx = s_edges.index((s_node.node, below_s_node.node))
+            edge_idxs = sentence_edge_idxs.get(s_node.node)
+            if edge_idxs is None:
+                edge_idxs = {
+                    v: idx for idx, v in enumerate(graph.successors(s_node.node))
+                }
+                sentence_edge_idxs[s_node.node] = edge_idxs
+
+            # Edges after the break will need to be moved to a new sentence
+            sentence_breaks.setdefault(s_node.node, set()).add(
+                edge_idxs[below_s_node.node]
+            )
 
-            edges_to_move = s_edges[break_edge_idx + 1 :]
-            if not edges_to_move:
+        # paragraph node -> sentence node -> new sentence nodes after it
+        paragraph_sentences: typing.Dict[int, typing.Dict[int, typing.List[int]]] = {}
+
+        for s_node_idx, break_edge_idxs in sentence_breaks.items():
+            s_children = list(graph.successors(s_node_idx))
+            s_parts: typing.List[typing.List[int]] = []
+            for break_edge_idx in sorted(break_edge_idxs, reverse=True):
+                part = s_children[break_edge_idx + 1 :]
+                del s_children[break_edge_idx + 1 :]
+
+                if part:
+                    s_parts.append(part)
+
+            if not s_parts:
                 # Final sentence, nothing to move
                 continue
 
-            # Locate parent paragraph so we can create a new sentence
+            s_parts.reverse()
+
+            # Move edges from current sentence to new sentences
+            graph.remove_edges_from(
+                [(s_node_idx, v) for s_part in s_parts for v in s_part]
+            )
+
+            # Locate parent paragraph so we can create new sentences
+            s_node = graph.nodes[s_node_idx][DATA_PROP]
             p_node = self._find_parent(graph, s_node, ParagraphNode)
             assert p_node is not None
 
-            # Find the index of the edge between the paragraph and the current sentence
-            p_s_edge = (p_node.node, s_node.node)
-            p_edges = list(graph.out_edges(p_node.node))
-            s_edge_idx = p_edges.index(p_s_edge)
-
-            # Remove existing edges from the paragraph
-            graph.remove_edges_from(p_edges)
+            new_s_node_idxs = paragraph_sentences.setdefault(p_node.node, {})[
+                s_node_idx
+            ] = []
 
-            # Create a sentence and add an edge to it right after the current sentence
-            new_s_node = SentenceNode(node=len(graph), implicit=True)
-            graph.add_node(new_s_node.node, data=new_s_node)
-            p_edges.insert(s_edge_idx + 1, (p_node.node, new_s_node.node))
+            for s_part in s_parts:
+                # Same language/voice as the original sentence
+                new_s_node = SentenceNode(
+                    node=len(graph),
+                    implicit=True,
+                    lang=s_node.lang,
+                    voice=s_node.voice,
+                )
+                graph.add_node(new_s_node.node, data=new_s_node)
+                graph.add_edges_from([(new_s_node.node, v) for v in s_part])
+                new_s_node_idxs.append(new_s_node.node)
 
-            # Insert paragraph edges with new sentence
-            graph.add_edges_from(p_edges)
+            was_changed = True
 
-            # Move edges from current sentence to new sentence
-            graph.remove_edges_from(edges_to_move)
-            graph.add_edges_from([(new_s_node.node, v) for (u, v) in edges_to_move])
+        for p_node_idx, new_sentences in paragraph_sentences.items():
+            # Insert new sentences right after their original sentence
+            p_edges = list(graph.out_edges(p_node_idx))
+            new_p_edges = []
+            for p_edge in p_edges:
+                new_p_edges.append(p_edge)
+                new_p_edges.extend(
+                    (p_node_idx, new_s_node_idx)
+                    for new_s_node_idx in new_sentences.get(p_edge[1], [])
+                )
 
-            was_changed = True
+            graph.remove_edges_from(p_edges)
+            graph.add_edges_from(new_p_edges)
 
         return was_changed
 
@@ -1555,6 +1906,8 @@ class TextProcessor:
         break_type: typing.Union[str, BreakType],
         lang: typing.Optional[str] = None,
     ) -> typing.Optional[PHONEMES_TYPE]:
+        from gruut_ipa import IPA
+
         if break_type == BreakType.MAJOR:
             return [IPA.BREAK_MAJOR.value]
 
@@ -1697,9 +2050,15 @@ class TextProcessor:
             # No replacements
             return
 
-        matched = False
         new_text = word.text_with_ws
 
+        assert settings.replacements_matcher is not None
+        if not settings.replacements_matcher.has_match(new_text):
+            # No replacement will change the text
+            return
+
+        matched = False
+
         for pattern, template in settings.replacements:
             assert isinstance(pattern, REGEX_PATTERN)
             new_text, num_subs = pattern.subn(template, new_text)
@@ -1744,13 +2103,12 @@ class TextProcessor:
             return
 
         new_text: typing.Optional[str] = None
-        for pattern, template in settings.abbreviations.items():
-            assert isinstance(pattern, REGEX_PATTERN), pattern
-            match = pattern.match(word.text_with_ws)
 
-            if match is not None:
-                new_text = match.expand(template)
-                break
+        # First abbreviation that matches (in order)
+        assert settings.abbreviations_matcher is not None
+        match = settings.abbreviations_matcher.match(word.text_with_ws)
+        if match is not None:
+            new_text = match.expand(settings.abbreviations[match.re])
 
         if new_text is not None:
             # Tokenize new text (whitespace should be preserved by regex)
@@ -1850,6 +2208,10 @@ class TextProcessor:
         ):
             return False
 
+        if word.number is not None:
+            # Already parsed
+            return False
+
         settings = self.get_settings(word.lang)
         assert settings.babel_locale
 
@@ -1860,14 +2222,12 @@ class TextProcessor:
                 word.interpret_as = InterpretAs.NUMBER
                 word.format = InterpretAsFormat.NUMBER_ORDINAL
                 word.number = Decimal(ordinal_num)
-                return False
+                return True
 
         try:
             # Try to parse as a number
             # This is important to handle thousand/decimal separators correctly.
-            number = babel.numbers.parse_decimal(
-                word.text, locale=settings.babel_locale
-            )
+            number = self._parse_decimal(word.text, settings.babel_locale)
 
             if not number.is_finite():
                 raise ValueError("Not parsing nan or inf")
@@ -1890,6 +2250,7 @@ class TextProcessor:
         except ValueError:
             # Probably not a number
             word.is_maybe_number = False
+            return False
 
         return True
 
@@ -1903,6 +2264,10 @@ class TextProcessor:
         ):
             return False
 
+        if word.number is not None:
+            # Already parsed
+            return False
+
         settings = self.get_settings(word.lang)
 
         if (settings.is_maybe_currency is not None) and (
@@ -1922,9 +2287,7 @@ class TextProcessor:
                 try:
                     # Try to parse as a number
                     # This is important to handle thousand/decimal separators correctly.
-                    number = babel.numbers.parse_decimal(
-                        num_str, locale=settings.babel_locale
-                    )
+                    number = self._parse_decimal(num_str, settings.babel_locale)
                     word.interpret_as = InterpretAs.CURRENCY
                     word.currency_symbol = currency_symbol
                     word.number = number
@@ -1939,16 +2302,42 @@ class TextProcessor:
             if default_currency:
                 # Forced interpretation using default currency
                 try:
-                    number = babel.numbers.parse_decimal(
-                        word.text, locale=settings.babel_locale
-                    )
+                    number = self._parse_decimal(word.text, settings.babel_locale)
                     word.interpret_as = InterpretAs.CURRENCY
                     word.currency_name = default_currency
                     word.number = number
+                    parsed = True
                 except ValueError:
                     pass
 
-        return True
+        return parsed
+
+    def _parse_decimal(self, text: str, locale: str) -> Decimal:
+        """Same as babel.numbers.parse_decimal, but cached (raises ValueError)"""
+        cache_key = (locale, text)
+        number = self.parse_number_cache.get(cache_key, _NOT_CACHED)
+        if number is _NOT_CACHED:
+            try:
+                number = self._get_number_parser(locale).parse(text)
+            except ValueError:
+                # Not a number
+                number = None
+
+            self.parse_number_cache[cache_key] = number
+
+        if number is None:
+            raise ValueError(f"Not a number: {text}")
+
+        return number
+
+    def _get_number_parser(self, locale: str) -> NumberParser:
+        """Get or create number parser for a babel locale"""
+        number_parser = self.number_parsers.get(locale)
+        if number_parser is None:
+            number_parser = NumberParser(locale)
+            self.number_parsers[locale] = number_parser
+
+        return number_parser
 
     def _transform_date(self, graph: GraphType, node: Node):
         if not isinstance(node, WordNode):
@@ -1960,6 +2349,10 @@ class TextProcessor:
         ):
             return False
 
+        if word.date is not None:
+            # Already parsed
+            return False
+
         settings = self.get_settings(word.lang)
 
         try:
@@ -1970,21 +2363,13 @@ class TextProcessor:
                 word.is_maybe_date = False
                 return False
 
-            assert settings.dateparser_lang
-
-            dateparser_kwargs: typing.Dict[str, typing.Any] = {
-                "settings": {"STRICT_PARSING": True},
-                "languages": [settings.dateparser_lang],
-            }
-
-            date = dateparser.parse(word.text, **dateparser_kwargs)
+            date = self._parse_date(word.text, settings)
             if date is not None:
                 word.interpret_as = InterpretAs.DATE
                 word.date = date
             elif word.interpret_as == InterpretAs.DATE:
                 # Try again without strict parsing
-                dateparser_kwargs["settings"]["STRICT_PARSING"] = False
-                date = dateparser.parse(word.text, **dateparser_kwargs)
+                date = self._parse_date(word.text, settings, strict=False)
                 if date is not None:
                     word.date = date
         except Exception:
@@ -1994,7 +2379,51 @@ class TextProcessor:
             word.is_maybe_date = False
             return False
 
-        return True
+        return date is not None
+
+    def _parse_date(
+        self, text: str, settings: TextProcessorSettings, strict: bool = True
+    ) -> typing.Optional[typing.Any]:
+        """
+        Parse a date with the language's numeric date parser, falling back to
+        dateparser. Strict results are cached.
+        """
+        assert settings.dateparser_lang
+
+        # InterpretAsFormat or format string
+        date_format = str(
+            getattr(
+                settings.default_date_format, "value", settings.default_date_format
+            )
+        )
+        cache_key = (settings.dateparser_lang, date_format, text)
+
+        if strict:
+            date = self.parse_date_cache.get(cache_key, _NOT_CACHED)
+            if date is not _NOT_CACHED:
+                return date
+
+        date_parser = self.date_parsers.get(date_format)
+        if date_parser is None:
+            date_parser = NumericDateParser(date_format)
+            self.date_parsers[date_format] = date_parser
+
+        date = date_parser.parse(text)
+        if (date is None) and not (strict and date_parser.is_not_date(text)):
+            # Slow, but handles everything else
+            import dateparser
+
+            date = dateparser.parse(
+                text,
+                settings={"STRICT_PARSING": strict},
+                languages=[settings.dateparser_lang],
+            )
+
+        if strict:
+            # Non-strict results may be relative to today
+            self.parse_date_cache[cache_key] = date
+
+        return date
 
     def _collapse_time(self, graph: GraphType, nodes: typing.Iterable[Node]):
         """Collapse times like '4:01 p.m.' into '4:01pm'"""
@@ -2014,7 +2443,7 @@ class TextProcessor:
 
         if not words:
             # No words
-            return
+            return False
 
         # Assume all words have the same language
         settings = self.get_settings(words[0].lang)
@@ -2042,13 +2471,13 @@ class TextProcessor:
 
                 for old_word in words:
                     graph.add_edge(old_word.node, new_node.node)
+
+                return True
         except Exception:
             _LOGGER.exception("collapse_time")
 
-            # Not a time
-            return False
-
-        return True
+        # Not a time
+        return False
 
     def _transform_time(self, graph: GraphType, node: Node):
         if not isinstance(node, WordNode):
@@ -2060,6 +2489,10 @@ class TextProcessor:
         ):
             return False
 
+        if word.time is not None:
+            # Already parsed
+            return False
+
         settings = self.get_settings(word.lang)
 
         if settings.parse_time is None:
@@ -2085,7 +2518,7 @@ class TextProcessor:
             word.is_maybe_time = False
             return False
 
-        return True
+        return time is not None
 
     def _is_word_in_lexicon(
         self, word: str, settings: TextProcessorSettings
@@ -2141,16 +2574,29 @@ class TextProcessor:
             else:
                 final_num = int(decimal_num)
 
-            try:
-                # Convert to words (e.g., 100 -> one hundred)
-                num_str = num2words(final_num, **num2words_kwargs)
-            except NotImplementedError:
-                _LOGGER.exception(
-                    "Failed to convert number %s to words for language %s",
-                    word.text,
-                    word.lang,
-                )
-                return
+            # int and float keys are kept apart (1 == 1.0)
+            cache_key = (
+                num2words_kwargs["lang"],
+                num2words_kwargs.get("to"),
+                type(final_num),
+                final_num,
+            )
+            num_str = self.verbalize_number_cache.get(cache_key)
+            if num_str is None:
+                from num2words import num2words
+
+                try:
+                    # Convert to words (e.g., 100 -> one hundred)
+                    num_str = num2words(final_num, **num2words_kwargs)
+                except NotImplementedError:
+                    _LOGGER.exception(
+                        "Failed to convert number %s to words for language %s",
+                        word.text,
+                        word.lang,
+                    )
+                    return
+
+                self.verbalize_number_cache[cache_key] = num_str
 
             # Add original whitespace back in
             first_ws, last_ws = settings.get_whitespace(word.text_with_ws)
@@ -2201,12 +2647,67 @@ class TextProcessor:
             # Assumed to be a Python format string already
             date_format_str = date_format
 
+        cache_key = (
+            settings.babel_locale,
+            settings.num2words_lang,
+            date_format_str,
+            date.year,
+            date.month,
+            date.day,
+        )
+        date_str = self.verbalize_date_cache.get(cache_key, _NOT_CACHED)
+        if date_str is _NOT_CACHED:
+            date_str = self._format_date(date, date_format_str, settings)
+            self.verbalize_date_cache[cache_key] = date_str
+
+        if date_str is None:
+            # Failed to format (logged once)
+            return
+
+        first_ws, last_ws = settings.get_whitespace(word.text_with_ws)
+        date_str = first_ws + date_str + last_ws
+
+        # Split into separate words
+        for date_word_text in settings.split_words(date_str):
+            date_word_text_norm = settings.normalize_whitespace(date_word_text)
+            if not date_word_text_norm:
+                continue
+
+            if not settings.keep_whitespace:
+                date_word_text = date_word_text_norm
+
+            if not date_word_text:
+                continue
+
+            date_word = WordNode(
+                node=len(graph),
+                implicit=True,
+                lang=word.lang,
+                text=date_word_text_norm,
+                text_with_ws=date_word_text,
+            )
+            graph.add_node(date_word.node, data=date_word)
+            graph.add_edge(word.node, date_word.node)
+
+    def _format_date(
+        self,
+        date: typing.Any,
+        date_format_str: str,
+        settings: TextProcessorSettings,
+    ) -> typing.Optional[str]:
+        """Format date as words using a Python format string ({M}, {D}, etc.)"""
+        assert settings.babel_locale
+        assert settings.num2words_lang
+
         day_card_str = ""
         day_ord_str = ""
         month_str = ""
         year_str = ""
 
         try:
+            import babel.dates
+            from num2words import num2words
+
             if ("{M}" in date_format_str) or ("{m}" in date_format_str):
                 month_str = babel.dates.format_date(
                     date, "MMMM", locale=settings.babel_locale
@@ -2234,11 +2735,11 @@ class TextProcessor:
                     year_str = num2words(date.year, **num2words_kwargs)
         except Exception:
             _LOGGER.exception(
-                "Failed to format date %s for language %s", word.text, word.lang
+                "Failed to format date %s for language %s", date, settings.lang
             )
-            return
+            return None
 
-        date_str = date_format_str.format(
+        return date_format_str.format(
             **{
                 "M": month_str,
                 "m": month_str,
@@ -2251,31 +2752,6 @@ class TextProcessor:
             }
         )
 
-        first_ws, last_ws = settings.get_whitespace(word.text_with_ws)
-        date_str = first_ws + date_str + last_ws
-
-        # Split into separate words
-        for date_word_text in settings.split_words(date_str):
-            date_word_text_norm = settings.normalize_whitespace(date_word_text)
-            if not date_word_text_norm:
-                continue
-
-            if not settings.keep_whitespace:
-                date_word_text = date_word_text_norm
-
-            if not date_word_text:
-                continue
-
-            date_word = WordNode(
-                node=len(graph),
-                implicit=True,
-                lang=word.lang,
-                text=date_word_text_norm,
-                text_with_ws=date_word_text,
-            )
-            graph.add_node(date_word.node, data=date_word)
-            graph.add_edge(word.node, date_word.node)
-
     def _verbalize_time(self, graph: GraphType, node: Node):
         """Split times into words"""
         if not isinstance(node, WordNode):
@@ -2374,21 +2850,28 @@ class TextProcessor:
         # Custom separator so we can remove 'zero cents'
         num2words_kwargs["separator"] = "|"
 
-        try:
-            num_str = num2words(float(decimal_num), **num2words_kwargs)
-        except Exception:
-            _LOGGER.exception(
-                "Failed to verbalize currency %s for language %s", word, word.lang
-            )
-            return
+        cache_key = (num2words_kwargs["lang"], word.currency_name, decimal_num)
+        num_str = self.verbalize_currency_cache.get(cache_key)
+        if num_str is None:
+            from num2words import num2words
 
-        # Post-process currency words
-        if num_has_frac:
-            # Discard num2words separator
-            num_str = num_str.replace("|", "")
-        else:
-            # Remove 'zero cents' part
-            num_str = num_str.split("|", maxsplit=1)[0]
+            try:
+                num_str = num2words(float(decimal_num), **num2words_kwargs)
+            except Exception:
+                _LOGGER.exception(
+                    "Failed to verbalize currency %s for language %s", word, word.lang
+                )
+                return
+
+            # Post-process currency words
+            if num_has_frac:
+                # Discard num2words separator
+                num_str = num_str.replace("|", "")
+            else:
+                # Remove 'zero cents' part
+                num_str = num_str.split("|", maxsplit=1)[0]
+
+            self.verbalize_currency_cache[cache_key] = num_str
 
         # Add original whitespace back in
         first_ws, last_ws = settings.get_whitespace(word.text_with_ws)
@@ -1,21 +1,22 @@
 """Utility methods for gruut"""
+import datetime
 import itertools
 import logging
 import os
 import re
-import ssl
+import threading
 import typing
 import xml.etree.ElementTree as etree
+from collections import OrderedDict
+from dataclasses import dataclass
+from decimal import Decimal
 from pathlib import Path
-from urllib.request import urlopen
-
-import networkx as nx
-from gruut_ipa import IPA
 
 from gruut.const import (
     DATA_PROP,
     LANG_ALIASES,
     NODE_TYPE,
+    SETTLED_PROP,
     EndElement,
     GraphType,
     InlineLexicon,
@@ -25,6 +26,9 @@ from gruut.const import (
 )
 from gruut.resources import _DIR
 
+if typing.TYPE_CHECKING:
+    import ssl
+
 _LOGGER = logging.getLogger("gruut.utils")
 
 # -----------------------------------------------------------------------------
@@ -140,6 +144,150 @@ def get_currency_names(locale_str: str) -> typing.Dict[str, str]:
     return currency_names
 
 
+class NumberParser:
+    """
+    Same as babel.numbers.parse_decimal for a single locale, but common forms
+    are accepted or rejected with one regex match.
+
+    Plain numbers with the locale's group/decimal symbols (1,234.5) are
+    converted directly. Text that can't be a number, like "mp3" or "COVID-19",
+    is rejected without calling babel. Anything else is passed to babel.
+    """
+
+    # Letters that may appear in a decimal.Decimal string (1e5, inf, nan)
+    DECIMAL_WORDS = {"inf", "infinity", "nan", "snan"}
+
+    def __init__(self, locale_str: str):
+        import babel.numbers
+
+        self.locale_str = locale_str
+        self.group_symbol = babel.numbers.get_group_symbol(locale_str)
+        self.decimal_symbol = babel.numbers.get_decimal_symbol(locale_str)
+
+        group = re.escape(self.group_symbol)
+        decimal = re.escape(self.decimal_symbol)
+
+        # Optional sign, digits and group symbols, optional decimal part
+        self.number_pattern = re.compile(
+            f"[+-]?[0-9](?:[0-9]|{group})*(?:{decimal}[0-9]*)?"
+        )
+
+        # Characters that decimal.Decimal will never accept after babel's
+        # replacements (letters are checked separately)
+        self.not_number_pattern = re.compile(f"[^\\w\\s+.{group}{decimal}-]")
+
+        # Counters for parse calls that matched/skipped/fell back to babel
+        self.num_fast = 0
+        self.num_rejected = 0
+        self.num_babel = 0
+
+    def parse(self, text: str) -> Decimal:
+        """Parse text as a Decimal (raises ValueError if it's not a number)"""
+        if self.number_pattern.fullmatch(text) is not None:
+            self.num_fast += 1
+            return Decimal(
+                text.replace(self.group_symbol, "").replace(self.decimal_symbol, ".")
+            )
+
+        if self._is_not_number(text):
+            self.num_rejected += 1
+            raise ValueError(f"Not a number: {text}")
+
+        self.num_babel += 1
+
+        import babel.numbers
+
+        return babel.numbers.parse_decimal(text, locale=self.locale_str)
+
+    def _is_not_number(self, text: str) -> bool:
+        """True if babel.numbers.parse_decimal would certainly raise ValueError"""
+        if self.not_number_pattern.search(text) is not None:
+            return True
+
+        letters = "".join(c for c in text if c.isalpha())
+        if (not letters) or (letters in ("e", "E")):
+            # Maybe digits or an exponent (1e5)
+            return False
+
+        return letters.lower() not in NumberParser.DECIMAL_WORDS
+
+
+class NumericDateParser:
+    """
+    Parses common numeric date shapes without dateparser.
+
+    Handles:
+
+    * Year first (ISO): 2021-04-01, 2021/04/01, 2021.04.01
+    * Dotted day first (German): 01.04.2021
+    * Day/month with slashes or dashes: 4/1/2021, 4-1-2021
+
+    The order of day and month with slashes/dashes comes from a date format
+    like "mdy" or "{m} {o}, {y}". Other text and invalid dates return None, so
+    the caller can fall back to dateparser.
+
+    is_not_date is True for numeric text that strict parsing (day, month, and
+    year required) would always reject.
+    """
+
+    YEAR_FIRST_PATTERN = re.compile(r"([0-9]{4})([-/.])([0-9]{1,2})\2([0-9]{1,2})")
+    DOTTED_PATTERN = re.compile(r"([0-9]{1,2})\.([0-9]{1,2})\.([0-9]{4})")
+    YEAR_LAST_PATTERN = re.compile(r"([0-9]{1,2})([-/])([0-9]{1,2})\2([0-9]{4})")
+
+    # Two numbers can't be a full date (e.g., 3.10, 123-45). A number followed by
+    # a year is excluded, since strict dateparser accepts 12.2021 for sv and fa.
+    NOT_DATE_PATTERN = re.compile(r"[0-9]{1,4}[-/.][0-9]{1,3}")
+
+    def __init__(self, date_format: str):
+        # Order of day, month, year in format (ordinal day is "o")
+        order: typing.List[str] = []
+        for c in date_format.lower():
+            if c == "o":
+                c = "d"
+
+            if (c in "dmy") and (c not in order):
+                order.append(c)
+
+        # Only day/month order is needed for slashes/dashes
+        self.month_first: typing.Optional[bool] = None
+        if order == ["m", "d", "y"]:
+            self.month_first = True
+        elif order == ["d", "m", "y"]:
+            self.month_first = False
+
+    def parse(self, text: str) -> typing.Optional[datetime.datetime]:
+        """Parse text as a date or return None if it's not a known shape"""
+        year: typing.Optional[str] = None
+        match = NumericDateParser.YEAR_FIRST_PATTERN.fullmatch(text)
+        if match is not None:
+            year, _separator, month, day = match.groups()
+        else:
+            match = NumericDateParser.DOTTED_PATTERN.fullmatch(text)
+            if match is not None:
+                day, month, year = match.groups()
+            elif self.month_first is not None:
+                match = NumericDateParser.YEAR_LAST_PATTERN.fullmatch(text)
+                if match is not None:
+                    first, _separator, second, year = match.groups()
+                    if self.month_first:
+                        month, day = first, second
+                    else:
+                        day, month = first, second
+
+        if year is None:
+            return None
+
+        try:
+            return datetime.datetime(int(year), int(month), int(day))
+        except ValueError:
+            # Invalid date
+            return None
+
+    def is_not_date(self, text: str) -> bool:
+        """True if text is certainly not a full date"""
+        return NumericDateParser.NOT_DATE_PATTERN.fullmatch(text) is not None
+
+
 # -----------------------------------------------------------------------------
 # Iteration
 # -----------------------------------------------------------------------------
@@ -170,6 +318,77 @@ def sliding_window(iterable, n=2):
     return zip(*iterables)
 
 
+# -----------------------------------------------------------------------------
+# Caching
+# -----------------------------------------------------------------------------
+
+
+@dataclass
+class CacheStats:
+    """Counters for a cache"""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of look ups that were hits"""
+        total = self.hits + self.misses
+        return (self.hits / total) if total > 0 else 0.0
+
+
+class LRUCache:
+    """
+    Mapping with an optional maximum size that evicts least recently used items.
+
+    Safe to share between threads.
+    """
+
+    def __init__(self, max_size: typing.Optional[int] = None):
+        self.max_size = max_size
+        self.stats = CacheStats()
+        self._items: "OrderedDict[typing.Any, typing.Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: typing.Any, default: typing.Any = None) -> typing.Any:
+        """Get item and mark it as recently used (updates hit/miss counters)"""
+        with self._lock:
+            value = self._items.get(key, _MISSING)
+            if value is _MISSING:
+                self.stats.misses += 1
+                return default
+
+            self.stats.hits += 1
+            self._items.move_to_end(key)
+
+        return value
+
+    def __setitem__(self, key: typing.Any, value: typing.Any):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+
+            if self.max_size is not None:
+                while len(self._items) > self.max_size:
+                    self._items.popitem(last=False)
+                    self.stats.evictions += 1
+
+    def __contains__(self, key: typing.Any) -> bool:
+        return key in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def clear(self):
+        """Remove all items (counters are kept)"""
+        with self._lock:
+            self._items.clear()
+
+
+_MISSING = object()
+
+
 # -----------------------------------------------------------------------------
 # XML
 # -----------------------------------------------------------------------------
@@ -230,9 +449,12 @@ def text_and_elements(element, is_last=False):
 def load_lexicon(
     uri: str,
     lexicon: InlineLexicon,
-    ssl_context: typing.Optional[ssl.SSLContext] = None,
+    ssl_context: typing.Optional["ssl.SSLContext"] = None,
 ):
     """Loads a pronunciation lexicon from a URI"""
+    import ssl
+    from urllib.request import urlopen
+
     if ssl_context is None:
         ssl_context = ssl.create_default_context()
 
@@ -290,6 +512,8 @@ def maybe_split_ipa(s: str) -> typing.List[str]:
         return s.split()
 
     # Automatic separation
+    from gruut_ipa import IPA
+
     return IPA.graphemes(s)
 
 
@@ -320,20 +544,80 @@ def print_graph(
         )
 
 
+def dfs_preorder_nodes(
+    graph: GraphType, node: NODE_TYPE
+) -> typing.Iterable[NODE_TYPE]:
+    """Iterate through graph nodes in depth-first pre-order"""
+    graph_dfs = getattr(graph, "dfs_preorder_nodes", None)
+    if graph_dfs is not None:
+        # Native traversal (TextGraph)
+        return graph_dfs(node)
+
+    import networkx as nx
+
+    return nx.dfs_preorder_nodes(graph, node)
+
+
 def leaves(graph: GraphType, node: Node):
     """Iterate through the leaves of a graph in depth-first order"""
-    for dfs_node in nx.dfs_preorder_nodes(graph, node.node):
+    graph_leaves = getattr(graph, "leaves", None)
+    if graph_leaves is not None:
+        # Native traversal (TextGraph)
+        graph_nodes = graph.nodes
+        for leaf_node in graph_leaves(node.node):
+            yield graph_nodes[leaf_node][DATA_PROP]
+
+        return
+
+    for dfs_node in dfs_preorder_nodes(graph, node.node):
         if not graph.out_degree(dfs_node) == 0:
             continue
 
         yield graph.nodes[dfs_node][DATA_PROP]
 
 
+def pipeline_leaves(
+    stage: typing.Any, graph: GraphType, parent_node: Node
+) -> typing.List[Node]:
+    """
+    Get leaves that a pipeline stage needs to visit.
+
+    A leaf is settled for a stage once the stage has visited it, and stays that
+    way until it is marked as changed (see mark_changed). Only unsettled leaves
+    are returned. A TextGraph tracks this with change stamps. For other graphs,
+    the stages a leaf is settled for are kept in its SETTLED_PROP attribute.
+    """
+    changed_leaves = getattr(graph, "changed_leaves", None)
+    if changed_leaves is not None:
+        maybe_leaves = changed_leaves(parent_node.node, stage)
+        if maybe_leaves is not None:
+            graph_nodes = graph.nodes
+            return [graph_nodes[leaf_node][DATA_PROP] for leaf_node in maybe_leaves]
+
+    unsettled_leaves: typing.List[Node] = []
+    for leaf_node in leaves(graph, parent_node):
+        leaf_settled = graph.nodes[leaf_node.node].setdefault(SETTLED_PROP, set())
+        if stage not in leaf_settled:
+            leaf_settled.add(stage)
+            unsettled_leaves.append(leaf_node)
+
+    return unsettled_leaves
+
+
+def mark_changed(graph: GraphType, node: Node):
+    """Mark node as changed so that all pipeline stages will visit it again"""
+    graph_mark_changed = getattr(graph, "mark_changed", None)
+    if graph_mark_changed is not None:
+        graph_mark_changed(node.node)
+
+    graph.nodes[node.node].pop(SETTLED_PROP, None)
+
+
 def pipeline_split(split_func, graph: GraphType, parent_node: Node) -> bool:
     """Splits leaf nodes of tree into zero or more sub-nodes"""
     was_changed = False
 
-    for leaf_node in list(leaves(graph, parent_node)):
+    for leaf_node in pipeline_leaves(split_func, graph, parent_node):
         for node_class, node_kwargs in split_func(graph, leaf_node):
             new_node = node_class(node=len(graph), **node_kwargs)
             graph.add_node(new_node.node, data=new_node)
@@ -344,26 +628,71 @@ def pipeline_split(split_func, graph: GraphType, parent_node: Node) -> bool:
 
 
 def pipeline_transform(transform_func, graph: GraphType, parent_node: Node) -> bool:
-    """Transforms leaves of tree with a custom function"""
+    """
+    Transforms leaves of tree with a custom function.
+
+    The transform function should return True only if it changed the leaf.
+    Adding nodes to the graph always counts as a change.
+    """
     was_changed = False
 
-    for leaf_node in list(leaves(graph, parent_node)):
+    for leaf_node in pipeline_leaves(transform_func, graph, parent_node):
+        num_nodes = len(graph)
         if transform_func(graph, leaf_node):
             was_changed = True
 
+            # Visit again in later passes
+            mark_changed(graph, leaf_node)
+        elif len(graph) > num_nodes:
+            # New nodes will be visited in later passes
+            was_changed = True
+
     return was_changed
 
 
 def pipeline_transform_window(
     transform_func, graph: GraphType, parent_node: Node, window_size: int
 ) -> bool:
-    """Transforms leaves of tree with a custom function using a rolling window"""
-    was_changed = False
+    """
+    Transforms leaves of tree with a custom function using a rolling window.
 
-    graph_leaves = list(leaves(graph, parent_node))
+    Only windows with at least one unsettled leaf are visited (see pipeline_leaves).
+    """
+    was_changed = False
 
-    for leaf_nodes in sliding_window(graph_leaves, n=window_size):
+    windows: typing.Optional[typing.Iterable[typing.Sequence[Node]]] = None
+    changed_windows = getattr(graph, "changed_windows", None)
+    if changed_windows is not None:
+        # Only windows with new or changed leaves
+        maybe_windows = changed_windows(parent_node.node, transform_func, window_size)
+        if maybe_windows is not None:
+            graph_nodes = graph.nodes
+            windows = [
+                [graph_nodes[leaf_node][DATA_PROP] for leaf_node in window]
+                for window in maybe_windows
+            ]
+
+    if windows is None:
+        unsettled_nodes = set(
+            leaf_node.node
+            for leaf_node in pipeline_leaves(transform_func, graph, parent_node)
+        )
+        windows = [
+            window
+            for window in sliding_window(leaves(graph, parent_node), n=window_size)
+            if any(leaf_node.node in unsettled_nodes for leaf_node in window)
+        ]
+
+    for leaf_nodes in windows:
+        num_nodes = len(graph)
         if transform_func(graph, leaf_nodes):
             was_changed = True
 
+            # Visit again in later passes
+            for leaf_node in leaf_nodes:
+                mark_changed(graph, leaf_node)
+        elif len(graph) > num_nodes:
+            # New nodes will be visited in later passes
+            was_changed = True
+
     return was_changed
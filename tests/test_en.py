@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
 """Tests for English class"""
+import asyncio
+import io
 import unittest
 
-from gruut import sentences
+import gruut
+from gruut import asentences, sentences, sentences_stream
 
 
 class EnglishTestCase(unittest.TestCase):
@@ -161,6 +164,74 @@ class EnglishTestCase(unittest.TestCase):
             [word.text for word in sentence],
         )
 
+    def test_sentences_stream(self):
+        """Test that streamed sentences are the same as processing all at once"""
+        text = (
+            "Dr. Smith paid $10.50 on 4/1/2021 at 4:01 p.m. "
+            "I read the book. Mr. and Mrs. Jones? Yes!  The end"
+        )
+        expected_sentences = list(sentences(text, lang="en_US"))
+        self.assertEqual(len(expected_sentences), 4)
+
+        for chunk_size in [1, 10, 1000]:
+            self.assertEqual(
+                list(
+                    sentences_stream(
+                        io.StringIO(text), lang="en_US", chunk_size=chunk_size
+                    )
+                ),
+                expected_sentences,
+            )
+
+        # Abbreviations are ruled out as boundaries before processing
+        text = "Dr. Smith read the book. Mr. and Mrs. Jones? Yes!  The end"
+        streamed_sentences = list(
+            sentences_stream(io.StringIO(text), lang="en_US", chunk_size=1)
+        )
+        self.assertEqual(len(streamed_sentences), 4)
+        self.assertEqual(
+            [s.text_with_ws for s in streamed_sentences],
+            [s.text_with_ws for s in sentences(text, lang="en_US")],
+        )
+
+    def test_sentences_stream_processes_once(self):
+        """Test that each streamed sentence is only processed once"""
+        text = "Dr. Smith read the book. Mr. and Mrs. Jones? Yes!  The end"
+        text_processor = gruut._get_text_processor(lang="en_US")
+        num_processed = text_processor.num_pos_tagged + text_processor.num_pos_skipped
+        streamed_sentences = list(
+            sentences_stream(
+                io.StringIO(text), lang="en_US", chunk_size=1, lazy_pos=True
+            )
+        )
+        self.assertEqual(len(streamed_sentences), 4)
+        self.assertEqual(
+            text_processor.num_pos_tagged
+            + text_processor.num_pos_skipped
+            - num_processed,
+            len(streamed_sentences),
+        )
+
+    def test_asentences(self):
+        """Test async sentences are the same as sync sentences"""
+        text = "Dr. Smith paid $10.50 on 4/1/2021. I read the book. The end"
+        expected_sentences = list(sentences(text, lang="en_US"))
+
+        async def get_sentences():
+            return [s async for s in asentences(text, lang="en_US")]
+
+        async def get_concurrent_sentences():
+            return await asyncio.gather(*[get_sentences() for _ in range(3)])
+
+        loop = asyncio.new_event_loop()
+        try:
+            for actual_sentences in loop.run_until_complete(
+                get_concurrent_sentences()
+            ):
+                self.assertEqual(actual_sentences, expected_sentences)
+        finally:
+            loop.close()
+
 
 # -----------------------------------------------------------------------------
 
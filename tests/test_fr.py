@@ -66,6 +66,37 @@ class FrenchTestCase(unittest.TestCase):
             "C’est très amusant!", "très", ["t", "ʁ", "ɛ"], ["t", "ʁ", "ɛ", "z"]
         )
 
+    def test_pos_tagger_per_sentence(self):
+        """Test that each sentence is tagged with its own language's POS model"""
+        text = (
+            "<speak>"
+            '<s lang="fr_FR">Les amis sont là.</s>'
+            '<s lang="en_US">I read a book.</s>'
+            "</speak>"
+        )
+        fr_sentence, en_sentence = sentences(text, lang="en_US", ssml=True)
+
+        self.assertEqual(
+            [(w.text, w.pos) for w in fr_sentence if w.is_spoken],
+            [("Les", "DET"), ("amis", "NOUN"), ("sont", "AUX"), ("là", "ADV")],
+        )
+        self.assertEqual(
+            [(w.text, w.pos) for w in en_sentence if w.is_spoken],
+            [("I", "PRP"), ("read", "VBP"), ("a", "DT"), ("book", "NN")],
+        )
+
+    def test_split_sentence_lang(self):
+        """Test that sentences split at a major break keep their language"""
+        text = '<speak lang="fr_FR">Bonjour. Les amis sont là.</speak>'
+        first_sentence, second_sentence = sentences(text, lang="en_US", ssml=True)
+
+        self.assertEqual(first_sentence.lang, "fr_FR")
+        self.assertEqual(second_sentence.lang, "fr_FR")
+
+        # French post-processing (liason) is done for the second sentence too
+        word = next(w for w in second_sentence if w.text == "Les")
+        self.assertEqual(word.phonemes, ["l", "e", "z"])
+
     def _without_and_with_liason(
         self,
         text: str,
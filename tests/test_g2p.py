@@ -1,8 +1,13 @@
 #!/usr/bin/env python3
 """Tests for GraphemesToPhonemes class"""
+import tempfile
 import unittest
+from pathlib import Path
+from unittest.mock import patch
 
 from gruut.g2p import GraphemesToPhonemes
+from gruut.lang import DelayedGraphemesToPhonemes, ModelRegistry
+from gruut.utils import find_lang_dir
 
 
 class GraphemesToPhonemesTestCase(unittest.TestCase):
@@ -31,6 +36,36 @@ class GraphemesToPhonemesTestCase(unittest.TestCase):
 
         self.assertEqual(expected_features, actual_features)
 
+    def test_guess_cache(self):
+        """Test in-memory and on-disk caching of guesses"""
+        lang_dir = find_lang_dir("en-us")
+        assert lang_dir is not None
+        model_path = lang_dir / "g2p" / "model.crf"
+
+        words = ["Gruutish", "raxacoricofallapatorius", "gruutish"]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store_path = Path(temp_dir) / "g2p.db"
+
+            with patch("gruut.lang.MODEL_REGISTRY", ModelRegistry()):
+                g2p = DelayedGraphemesToPhonemes(
+                    model_path, transform_func=str.lower, store_path=store_path
+                )
+                expected_phonemes = [g2p(word) for word in words]
+
+            # Same word after lower-casing
+            self.assertEqual(expected_phonemes[0], expected_phonemes[2])
+            self.assertEqual(g2p.cache_stats["guesses"].hits, 1)
+            self.assertEqual(g2p.cache_stats["store"].misses, 2)
+
+            # New process: cache is warmed up from the store
+            with patch("gruut.lang.MODEL_REGISTRY", ModelRegistry()):
+                g2p = DelayedGraphemesToPhonemes(
+                    model_path, transform_func=str.lower, store_path=store_path
+                )
+                self.assertEqual([g2p(word) for word in words], expected_phonemes)
+                self.assertEqual(g2p.cache_stats["guesses"].hit_rate, 1.0)
+
 
 # -----------------------------------------------------------------------------
 
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""Tests for PhonetisaurusGraph class"""
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+from gruut.g2p_phonetisaurus import PhonetisaurusGraph, index_graph, save_graph_dir
+from gruut.lang import (
+    DelayedPhonetisaurusGraph,
+    GuessPhonemesWithFallback,
+    ModelRegistry,
+    get_settings,
+)
+
+# a -> A/E, b -> B/(nothing)
+SYMBOLS = ["<eps>", "a", "A", "E", "b", "B", "_"]
+EDGES = [(0, 1, 1, 2), (0, 1, 1, 3), (1, 2, 4, 5), (1, 2, 4, 6)]
+EDGE_PROBS = [0.5, 1.0, 0.1, 0.2]
+
+
+def make_graph():
+    """Create a small numpy graph like fst2npy.py does"""
+    return {
+        "start_node": np.array([0], dtype=np.int32),
+        "edges": np.array(EDGES, dtype=np.int32),
+        "edge_probs": np.array(EDGE_PROBS, dtype=np.float32),
+        "final_nodes": np.array([2], dtype=np.int32),
+        "final_probs": np.array([0.0], dtype=np.float32),
+        "symbols": np.array(SYMBOLS, dtype=object),
+    }
+
+
+class PhonetisaurusGraphTestCase(unittest.TestCase):
+    """Test cases for PhonetisaurusGraph class"""
+
+    def test_guess(self):
+        """Test guesses in order of probability"""
+        phon_graph = PhonetisaurusGraph(make_graph())
+        guesses = [
+            phonemes for _, _, phonemes in phon_graph.g2p(["ab"], max_guesses=4)
+        ]
+
+        self.assertEqual(guesses, [["A", "B"], ["A"], ["E", "B"], ["E"]])
+
+    def test_vectorized(self):
+        """Test that vectorized beam search gives the same guesses"""
+        np_graph = make_graph()
+
+        # Add epsilon edge (2 -> 3) and multi-grapheme symbol "a|b" (0 -> 3)
+        np_graph["symbols"] = np.array(SYMBOLS + ["a|b"], dtype=object)
+        edges_probs = sorted(
+            zip(
+                EDGES + [(0, 3, len(SYMBOLS), 2), (2, 3, 0, 3)], EDGE_PROBS + [1.0, 0.5]
+            ),
+            key=lambda edge_prob: edge_prob[0][0],
+        )
+        np_graph["edges"] = np.array([e for e, _ in edges_probs], dtype=np.int32)
+        np_graph["edge_probs"] = np.array(
+            [p for _, p in edges_probs], dtype=np.float32
+        )
+        np_graph["final_nodes"] = np.array([2, 3], dtype=np.int32)
+        np_graph["final_probs"] = np.array([0.0, 0.0], dtype=np.float32)
+
+        phon_graph = PhonetisaurusGraph(np_graph)
+        words = ["ab", "a", "ba", "abab"]
+
+        for max_guesses in [1, 2, 5]:
+            for beam in [1, 2, 100]:
+                self.assertEqual(
+                    list(
+                        phon_graph.g2p(
+                            words,
+                            max_guesses=max_guesses,
+                            beam=beam,
+                            min_beam=1,
+                            vectorized=True,
+                        )
+                    ),
+                    list(
+                        phon_graph.g2p(
+                            words, max_guesses=max_guesses, beam=beam, min_beam=1
+                        )
+                    ),
+                )
+
+    def test_index(self):
+        """Test graph with CSR index and pre-split symbols from fst2npy.py"""
+        np_graph = make_graph()
+        np_graph.update(index_graph(np_graph))
+
+        self.assertEqual(np_graph["out_offsets"].tolist(), [0, 2, 4, 4])
+
+        unindexed_graph = PhonetisaurusGraph(make_graph())
+        words = ["ab", "ba", "a"]
+        expected_guesses = list(unindexed_graph.g2p(words, max_guesses=4))
+
+        for preload in [False, True]:
+            phon_graph = PhonetisaurusGraph(np_graph, preload=preload)
+            self.assertEqual(phon_graph.symbols, unindexed_graph.symbols)
+            self.assertEqual(
+                list(phon_graph.g2p(words, max_guesses=4)), expected_guesses
+            )
+
+            # No caches are needed
+            self.assertFalse(phon_graph.out_edges)
+            self.assertFalse(phon_graph.final_node_probs)
+
+    def test_graph_dir(self):
+        """Test npz and memory-mapped npy directory formats"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            npz_path = Path(temp_dir) / "graph.npz"
+            np.savez(npz_path, **make_graph())
+
+            graph_dir = Path(temp_dir) / "graph"
+            save_graph_dir(make_graph(), graph_dir)
+
+            npz_graph = PhonetisaurusGraph.load(npz_path)
+            dir_graph = PhonetisaurusGraph.load(graph_dir)
+
+            # Arrays are mapped, not read into memory
+            self.assertFalse(dir_graph.edges.flags.owndata)
+
+            for preload in [False, True]:
+                dir_graph = PhonetisaurusGraph.load(graph_dir, preload=preload)
+                self.assertEqual(
+                    list(dir_graph.g2p(["ab", "ba"], max_guesses=2)),
+                    list(npz_graph.g2p(["ab", "ba"], max_guesses=2)),
+                )
+
+    def test_settings(self):
+        """Test Phonetisaurus backend in language settings"""
+        with tempfile.TemporaryDirectory() as lang_dir, patch(
+            "gruut.lang.MODEL_REGISTRY", ModelRegistry()
+        ):
+            save_graph_dir(make_graph(), Path(lang_dir) / "g2p" / "graph")
+
+            settings = get_settings(
+                "en_US", lang_dir=lang_dir, g2p_backend="phonetisaurus", g2p_beam=10
+            )
+            self.assertIsInstance(settings.guess_phonemes, DelayedPhonetisaurusGraph)
+
+            assert settings.guess_phonemes is not None
+            self.assertEqual(settings.guess_phonemes("AB"), ["A", "B"])
+
+            # No guess for "c", so fallback is used
+            self.assertEqual(settings.guess_phonemes("c"), [])
+            fallback = GuessPhonemesWithFallback(
+                [settings.guess_phonemes, lambda word, role=None: ["C"]]
+            )
+            self.assertEqual(fallback("ab"), ["A", "B"])
+            self.assertEqual(fallback("c"), ["C"])
+
+            with self.assertRaises(ValueError):
+                get_settings("en_US", lang_dir=lang_dir, g2p_backend="unknown")
+
+
+# -----------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
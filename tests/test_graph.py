@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Tests for TextGraph class"""
+import dataclasses
+import unittest
+
+import networkx as nx
+
+from gruut.graph import TextGraph
+from gruut.text_processor import TextProcessor
+
+
+class TextGraphTestCase(unittest.TestCase):
+    """Test cases for TextGraph class"""
+
+    def test_leaves_in_order(self):
+        """Test depth-first order of leaves"""
+        graph = TextGraph()
+        for node in range(6):
+            graph.add_node(node, data=node)
+
+        graph.add_edges_from([(0, 1), (0, 2), (1, 3), (1, 4), (2, 5)])
+
+        self.assertEqual(list(graph.dfs_preorder_nodes(0)), [0, 1, 3, 4, 2, 5])
+        self.assertEqual(list(graph.leaves(0)), [3, 4, 5])
+        self.assertEqual(list(graph.predecessors(4)), [1])
+        self.assertEqual(graph.out_degree(1), 2)
+        self.assertEqual(len(graph), 6)
+
+    def test_shared_node(self):
+        """Test that a node with multiple parents is only visited once"""
+        graph = TextGraph()
+        for node in range(4):
+            graph.add_node(node, data=node)
+
+        # Node 3 is under both 1 and 2 (like a collapsed time)
+        graph.add_edges_from([(0, 1), (0, 2), (1, 3), (2, 3)])
+
+        self.assertEqual(list(graph.dfs_preorder_nodes(0)), [0, 1, 3, 2])
+        self.assertEqual(list(graph.leaves(0)), [3])
+
+    def test_reorder_edges(self):
+        """Test removing and re-adding edges changes child order"""
+        graph = TextGraph()
+        for node in range(4):
+            graph.add_node(node, data=node)
+
+        graph.add_edges_from([(0, 1), (0, 2)])
+        edges = list(graph.out_edges(0))
+        graph.remove_edges_from(edges)
+        edges.insert(1, (0, 3))
+        graph.add_edges_from(edges)
+
+        self.assertEqual(list(graph.successors(0)), [1, 3, 2])
+
+    def test_changed_leaves(self):
+        """Test that stages only see new or changed leaves"""
+        graph = TextGraph()
+        for node in range(3):
+            graph.add_node(node, data=node)
+
+        graph.add_edges_from([(0, 1), (0, 2)])
+
+        # First run sees all leaves
+        self.assertEqual(graph.changed_leaves(0, "stage"), [1, 2])
+        self.assertEqual(graph.changed_leaves(0, "stage"), [])
+
+        # Split leaf 1 into two new leaves
+        graph.add_node(3, data=3)
+        graph.add_node(4, data=4)
+        graph.add_edges_from([(1, 3), (1, 4)])
+        graph.mark_changed(2)
+
+        self.assertEqual(graph.changed_leaves(0, "stage"), [3, 4, 2])
+        self.assertEqual(
+            graph.changed_windows(0, "window_stage", 2), [(3, 4), (4, 2)]
+        )
+
+        # Removing edges falls back to a full rebuild with the same order
+        graph.remove_edges_from([(1, 4)])
+        self.assertEqual(graph.changed_leaves(0, "other_stage"), [3, 2])
+        self.assertEqual(list(graph.leaves(0)), [3, 2])
+
+    def test_networkx_compatibility(self):
+        """Test that networkx traversal works on TextGraph"""
+        graph = TextGraph()
+        for node in range(5):
+            graph.add_node(node, data=node)
+
+        graph.add_edges_from([(0, 1), (0, 2), (1, 3), (2, 4)])
+
+        self.assertEqual(
+            list(nx.dfs_preorder_nodes(graph, 0)), list(graph.dfs_preorder_nodes(0))
+        )
+
+    def test_same_as_networkx(self):
+        """Test that processing output is identical to networkx.DiGraph"""
+        text = (
+            "Dr. Smith paid $10.50 on 4/1/2021 at 4:01 p.m., didn't he? "
+            'He said "TTS is 1st-rate" and left.'
+        )
+
+        outputs = []
+        for graph_class in [nx.DiGraph, TextGraph]:
+            processor = TextProcessor(
+                graph_class=graph_class,
+                load_phoneme_lexicon=False,
+                load_g2p_guesser=False,
+                load_pos_tagger=False,
+            )
+            graph, root = processor(text)
+            outputs.append(
+                [dataclasses.asdict(s) for s in processor.sentences(graph, root)]
+            )
+
+        self.assertEqual(outputs[0], outputs[1])
+
+
+# -----------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
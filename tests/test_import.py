@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""Tests for import time of gruut"""
+import subprocess
+import sys
+import unittest
+
+# Loaded on demand by the stages that need them
+LAZY_MODULES = [
+    "babel",
+    "dateparser",
+    "gruut_ipa",
+    "jsonlines",
+    "networkx",
+    "num2words",
+    "pycrfsuite",
+]
+
+
+class ImportTestCase(unittest.TestCase):
+    """Tests for import time of gruut"""
+
+    def test_lazy_imports(self):
+        """Test that import gruut doesn't load heavy dependencies"""
+        loaded = subprocess.check_output(
+            [
+                sys.executable,
+                "-c",
+                "import sys, gruut; "
+                f"print(*[m for m in {LAZY_MODULES!r} if m in sys.modules])",
+            ],
+            universal_newlines=True,
+        ).split()
+
+        self.assertEqual(loaded, [])
+
+
+# -----------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
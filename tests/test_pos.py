@@ -4,6 +4,7 @@ import copy
 import unittest
 
 from gruut.pos import PartOfSpeechTagger
+from gruut.utils import LRUCache
 
 
 class PartOfSpeechTaggerTestCase(unittest.TestCase):
@@ -82,6 +83,30 @@ class PartOfSpeechTaggerTestCase(unittest.TestCase):
 
         self.assertEqual(expected_features, actual_features)
 
+    def test_features_cache(self):
+        """Test that cached sentence features match word features"""
+        features_cache = LRUCache()
+        sentences = ["this is a test .".split(), "a test is this".split(), ["test"]]
+
+        for sentence in sentences + sentences:
+            expected_features = [
+                PartOfSpeechTagger.word2features(sentence, i)
+                for i in range(len(sentence))
+            ]
+
+            self.assertEqual(
+                expected_features, PartOfSpeechTagger.sent2features(sentence)
+            )
+            self.assertEqual(
+                expected_features,
+                PartOfSpeechTagger.sent2features(
+                    sentence, features_cache=features_cache
+                ),
+            )
+
+        self.assertEqual(len(features_cache), 5)
+        self.assertGreater(features_cache.stats.hits, 0)
+
 
 # -----------------------------------------------------------------------------
 
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""Tests for gruut serve"""
+import concurrent.futures
+import dataclasses
+import http.client
+import json
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from gruut.server import (
+    BatchProcessor,
+    SentencesHandler,
+    TCPHTTPServer,
+    get_args,
+    serve,
+)
+from gruut.text_processor import TextProcessor
+
+
+class ServerTestCase(unittest.TestCase):
+    """Tests for gruut serve"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.processor = TextProcessor(default_lang="en_US")
+
+    def _expected(self, text: str):
+        graph, root = self.processor(text)
+        return [
+            dataclasses.asdict(sentence)
+            for sentence in self.processor.sentences(graph, root)
+        ]
+
+    def test_batch(self):
+        """Test that batched requests match individual processing"""
+        batcher = BatchProcessor(self.processor, batch_window=0.1)
+        texts = ["This is a test.", "I read a book.", "Is it 1:00 p.m.?"]
+        futures = [batcher.submit(text, lang="en_US") for text in texts]
+
+        for text, future in zip(texts, futures):
+            self.assertEqual(future.result(), self._expected(text))
+
+        # All requests arrived within the window
+        self.assertEqual(batcher.num_requests, len(texts))
+        self.assertEqual(batcher.num_batches, 1)
+
+    def test_batch_error(self):
+        """Test that the batcher keeps running after an unexpected error"""
+        batcher = BatchProcessor(self.processor)
+
+        # Unhashable option breaks grouping (outside of processing)
+        future = batcher.submit(
+            "This is a test.", lang="en_US", process_args={"pos": []}
+        )
+        with self.assertRaises(TypeError):
+            future.result(timeout=10)
+
+        text = "This is a test."
+        future = batcher.submit(text, lang="en_US")
+        self.assertEqual(future.result(timeout=10), self._expected(text))
+
+    def test_http_timeout(self):
+        """Test 503 when a request isn't processed in time"""
+
+        class StuckBatcher:
+            def submit(self, *args, **kwargs):
+                return concurrent.futures.Future()
+
+        server = TCPHTTPServer(("127.0.0.1", 0), SentencesHandler)
+        setattr(server, "batcher", StuckBatcher())
+        setattr(server, "default_lang", "en_US")
+        setattr(server, "request_timeout", 0.1)
+
+        server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+        server_thread.start()
+
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+            conn.request(
+                "POST",
+                "/sentences",
+                json.dumps({"text": "This is a test."}),
+                headers={"Content-Type": "application/json"},
+            )
+            response = conn.getresponse()
+            response.read()
+            self.assertEqual(response.status, 503)
+            conn.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_unix_socket_not_socket(self):
+        """Test that a file which isn't a socket is not replaced"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            socket_path = Path(temp_dir) / "gruut.sock"
+            socket_path.write_text("data")
+
+            with self.assertRaises(SystemExit):
+                serve(get_args(["--unix-socket", str(socket_path)]))
+
+            self.assertEqual(socket_path.read_text(), "data")
+
+    def test_http(self):
+        """Test POST /sentences"""
+        server = TCPHTTPServer(("127.0.0.1", 0), SentencesHandler)
+        setattr(server, "batcher", BatchProcessor(self.processor))
+        setattr(server, "default_lang", "en_US")
+
+        server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+        server_thread.start()
+
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+            text = "This is a test."
+
+            # JSON
+            conn.request(
+                "POST",
+                "/sentences",
+                json.dumps({"text": text}),
+                headers={"Content-Type": "application/json"},
+            )
+            response = conn.getresponse()
+            self.assertEqual(response.status, 200)
+            self.assertEqual(json.loads(response.read()), self._expected(text))
+
+            # Plain text
+            conn.request(
+                "POST",
+                "/sentences?lang=en_US",
+                text.encode(),
+                headers={"Content-Type": "text/plain"},
+            )
+            response = conn.getresponse()
+            self.assertEqual(response.status, 200)
+            self.assertEqual(json.loads(response.read()), self._expected(text))
+
+            # True/false strings in JSON are parsed like the query string
+            conn.request(
+                "POST",
+                "/sentences",
+                json.dumps({"text": text, "ssml": "false", "phonemes": "0"}),
+                headers={"Content-Type": "application/json"},
+            )
+            response = conn.getresponse()
+            self.assertEqual(response.status, 200)
+            sentences = json.loads(response.read())
+            self.assertTrue(sentences)
+            for sentence in sentences:
+                for word in sentence["words"]:
+                    self.assertIsNone(word["phonemes"])
+
+            # Bad requests
+            for body, content_type in [
+                (json.dumps({"text": text, "pos": "maybe"}), "application/json"),
+                (b"\xff\xfe", "text/plain"),
+            ]:
+                conn.request(
+                    "POST", "/sentences", body, headers={"Content-Type": content_type}
+                )
+                response = conn.getresponse()
+                response.read()
+                self.assertEqual(response.status, 400)
+
+            conn.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+# -----------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,19 @@
 #!/usr/bin/env python3
 """Tests for phonemization"""
+import gc
+import sqlite3
+import tempfile
+import threading
 import unittest
+from pathlib import Path
 
 from gruut import sentences
+from gruut.lexicon2db import (
+    LEXICON_SCHEMA_VERSION,
+    get_schema_version,
+    optimize_lexicon_db,
+)
+from gruut.phonemize import PreloadedLexicon, SqlitePhonemizer, ThreadLocalConnection
 
 # Translation from https://omniglot.com for:
 # My hovercraft is full of eels.
@@ -268,6 +279,199 @@ class PhonemizerTestCase(unittest.TestCase):
             ],
         )
 
+    def test_lookup_batch(self):
+        """Test bulk lexicon look up"""
+        phonemizer = SqlitePhonemizer(
+            make_lexicon_db(), word_transform_funcs=[str.lower]
+        )
+        words_roles = [
+            ("read", None),
+            ("read", "gruut:VBD"),
+            ("TEST", None),
+            ("missing", None),
+        ]
+
+        self.assertEqual(
+            phonemizer.lookup_batch(words_roles),
+            [
+                ["ɹ", "ˈi", "d"],
+                ["ɹ", "ˈɛ", "d"],
+                ["t", "ˈɛ", "s", "t"],
+                None,
+            ],
+        )
+
+        # Same as looking up each word
+        self.assertEqual(
+            phonemizer.lookup_batch(words_roles),
+            [phonemizer(word, role=role) for word, role in words_roles],
+        )
+
+    def test_heteronyms(self):
+        """Test words whose pronunciation depends on part of speech"""
+        phonemizer = SqlitePhonemizer(
+            make_lexicon_db(), word_transform_funcs=[str.lower]
+        )
+
+        self.assertTrue(phonemizer.is_heteronym("read"))
+        self.assertTrue(phonemizer.is_heteronym("READ"))
+        self.assertFalse(phonemizer.is_heteronym("READ", do_transforms=False))
+        self.assertFalse(phonemizer.is_heteronym("test"))
+        self.assertFalse(phonemizer.is_heteronym("missing"))
+
+    def test_preload(self):
+        """Test lexicon preloaded into memory"""
+        db_conn = make_lexicon_db()
+        preload_phonemizer = SqlitePhonemizer(
+            db_conn, word_transform_funcs=[str.lower], preload=True
+        )
+
+        assert preload_phonemizer.preloaded is not None
+        self.assertEqual(len(preload_phonemizer.preloaded), 2)
+
+        # Database isn't needed anymore
+        db_conn.close()
+
+        self.assertEqual(preload_phonemizer("read", role="gruut:VBD"), ["ɹ", "ˈɛ", "d"])
+        self.assertEqual(preload_phonemizer("READ"), ["ɹ", "ˈi", "d"])
+        self.assertIsNone(preload_phonemizer("missing"))
+
+        # Only the preloaded lexicon is used
+        self.assertEqual(preload_phonemizer.lexicon, {})
+
+    def test_mapped(self):
+        """Test compiled lexicon that is memory-mapped"""
+        db_conn = make_lexicon_db()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            bin_path = Path(temp_dir) / "lexicon.bin"
+            PreloadedLexicon(db_conn).save(bin_path)
+
+            mapped_phonemizer = SqlitePhonemizer(
+                db_conn, word_transform_funcs=[str.lower], mapped_path=bin_path
+            )
+
+            # Database isn't needed
+            db_conn.close()
+
+            assert mapped_phonemizer.preloaded is not None
+            self.assertEqual(len(mapped_phonemizer.preloaded), 2)
+            self.assertIn("test", mapped_phonemizer.preloaded)
+
+            self.assertEqual(
+                mapped_phonemizer("read", role="gruut:VBD"), ["ɹ", "ˈɛ", "d"]
+            )
+            self.assertEqual(mapped_phonemizer("READ"), ["ɹ", "ˈi", "d"])
+            self.assertIsNone(mapped_phonemizer("missing"))
+
+    def test_cache(self):
+        """Test bounded word cache and cache of missing words"""
+        db_conn = make_lexicon_db()
+        phonemizer = SqlitePhonemizer(
+            db_conn, word_transform_funcs=[str.lower], cache_size=2
+        )
+
+        self.assertEqual(phonemizer("READ"), ["ɹ", "ˈi", "d"])
+        self.assertIsNone(phonemizer("missing"))
+
+        # READ and its transformed form are both cached
+        self.assertIn("READ", phonemizer.cache)
+        self.assertIn("read", phonemizer.cache)
+
+        # Least recently used word is evicted
+        self.assertEqual(phonemizer("test"), ["t", "ˈɛ", "s", "t"])
+        self.assertEqual(len(phonemizer.cache), 2)
+        self.assertNotIn("READ", phonemizer.cache)
+        self.assertEqual(phonemizer.cache_stats["words"].evictions, 1)
+
+        # Missing word is not looked up again
+        db_conn.close()
+        self.assertIsNone(phonemizer("missing"))
+        self.assertEqual(phonemizer("read"), ["ɹ", "ˈi", "d"])
+        self.assertEqual(phonemizer.cache_stats["missing"].hits, 1)
+
+    def test_thread_local_connection(self):
+        """Test that connections are closed when their thread ends or on close"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = Path(temp_dir) / "lexicon.db"
+            mem_conn = make_lexicon_db()
+            mem_conn.commit()
+
+            file_conn = sqlite3.connect(str(db_path))
+            mem_conn.backup(file_conn)
+            file_conn.close()
+
+            thread_conn = ThreadLocalConnection(db_path)
+            phonemizer = SqlitePhonemizer(thread_conn, word_transform_funcs=[str.lower])
+            thread_db_conns = []
+
+            def lookup():
+                self.assertEqual(phonemizer("read"), ["ɹ", "ˈi", "d"])
+                thread_db_conns.append(thread_conn.connection)
+
+            thread = threading.Thread(target=lookup)
+            thread.start()
+            thread.join()
+            gc.collect()
+
+            self.assertEqual(len(thread_db_conns), 1)
+            with self.assertRaises(sqlite3.ProgrammingError):
+                thread_db_conns[0].execute("SELECT 1")
+
+            # Connection of the main thread
+            db_conn = thread_conn.connection
+            self.assertEqual(phonemizer("test"), ["t", "ˈɛ", "s", "t"])
+
+            thread_conn.close()
+            with self.assertRaises(sqlite3.ProgrammingError):
+                db_conn.execute("SELECT 1")
+
+            # Reconnects after close
+            self.assertIsNone(phonemizer("missing"))
+            thread_conn.close()
+
+    def test_optimize(self):
+        """Test lexicon database optimization"""
+        db_conn = make_lexicon_db()
+        self.assertTrue(optimize_lexicon_db(db_conn))
+        self.assertEqual(get_schema_version(db_conn), LEXICON_SCHEMA_VERSION)
+
+        # Already optimized
+        self.assertFalse(optimize_lexicon_db(db_conn))
+
+        # Look ups only need the index
+        query_plan = " ".join(
+            str(row[-1])
+            for row in db_conn.execute(
+                "EXPLAIN QUERY PLAN SELECT word, role, phonemes FROM word_phonemes "
+                + "WHERE word IN (?) ORDER BY word, pron_order",
+                ("read",),
+            )
+        )
+        self.assertIn("COVERING INDEX", query_plan)
+
+        phonemizer = SqlitePhonemizer(db_conn)
+        self.assertEqual(phonemizer("read", role="gruut:VBD"), ["ɹ", "ˈɛ", "d"])
+
+
+def make_lexicon_db() -> sqlite3.Connection:
+    """Create small lexicon database in memory"""
+    db_conn = sqlite3.connect(":memory:")
+    db_conn.execute(
+        "CREATE TABLE word_phonemes "
+        + "(id INTEGER PRIMARY KEY AUTOINCREMENT, word TEXT, pron_order INTEGER, phonemes TEXT, role TEXT);"
+    )
+    db_conn.executemany(
+        "INSERT INTO word_phonemes (word, pron_order, phonemes, role) VALUES (?, ?, ?, ?)",
+        [
+            ("read", 0, "ɹ ˈi d", ""),
+            ("read", 1, "ɹ ˈɛ d", "gruut:VBD"),
+            ("test", 0, "t ˈɛ s t", ""),
+        ],
+    )
+
+    return db_conn
+
 
 def get_phonemes(text, lang):
     """Return (text, phonemes) for each word"""
@@ -1,10 +1,14 @@
 #!/usr/bin/env python3
 """Tests for TextProcessor"""
+import datetime
+import re
 import sys
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 
+from gruut.const import NUM_PASSES_PROP, PatternMatcher
 from gruut.text_processor import Sentence, TextProcessor, TextProcessorSettings, Word
-from gruut.utils import print_graph
+from gruut.utils import NumberParser, NumericDateParser, print_graph
 
 WORDS_KWARGS = {"explicit_lang": False, "phonemes": False, "pos": False}
 
@@ -191,6 +195,67 @@ class TextProcessorTestCase(unittest.TestCase):
             ],
         )
 
+    def test_patterns_changed(self):
+        """Test that abbreviations and replacements can be changed after creation"""
+        processor = TextProcessor(
+            major_breaks={"."},
+            abbreviations={r"^([dD])r\.": r"\1octor"},
+            replacements=[("'", "")],
+        )
+
+        def get_texts(text):
+            graph, root = processor(text)
+            return [w.text for w in processor.words(graph, root, **WORDS_KWARGS)]
+
+        self.assertEqual(
+            get_texts("Dr. O'Neil, St. Mary"),
+            ["Doctor", "ONeil", ",", "St", ".", "Mary"],
+        )
+
+        settings = processor.get_settings()
+        settings.abbreviations.clear()
+        settings.abbreviations[re.compile(r"^([sS])t\.")] = r"\1aint"
+        settings.replacements.append((re.compile(","), ""))
+
+        # Removed abbreviation is not used, new patterns are
+        self.assertEqual(
+            get_texts("Dr. O'Neil, St. Mary"), ["Dr", ".", "ONeil", "Saint", "Mary"]
+        )
+
+    def test_pattern_matcher(self):
+        """Test that joined patterns keep their order and groups"""
+        matcher = PatternMatcher(
+            [
+                r"^([dD])r\.(?P<break>\?)?",
+                r"^([dD])rs\.",
+                r"^([dD])r",
+                r"^(\w)\1",  # back reference (not joined)
+                re.compile(r"^ok", re.IGNORECASE),  # flags (not joined)
+            ]
+        )
+
+        self.assertEqual(len(matcher.groups), 3)
+
+        # First pattern wins, with its own groups
+        match = matcher.match("Dr.?")
+        self.assertIs(match.re, matcher.patterns[0])
+        self.assertEqual(match.expand(r"\1octor\g<break>"), "Doctor?")
+
+        self.assertIs(matcher.match("drs.").re, matcher.patterns[1])
+        self.assertIs(matcher.match("dr").re, matcher.patterns[2])
+        self.assertIs(matcher.match("aa").re, matcher.patterns[3])
+        self.assertIs(matcher.match("OK").re, matcher.patterns[4])
+        self.assertIsNone(matcher.match("a dr."))
+
+        self.assertTrue(matcher.has_match("ok then"))
+        self.assertFalse(matcher.has_match("then ok"))
+
+        # Plain text is found without a regex
+        literal_matcher = PatternMatcher(["’", "ß"])
+        self.assertEqual(literal_matcher.literals, ["’", "ß"])
+        self.assertTrue(literal_matcher.has_match("Straße"))
+        self.assertFalse(literal_matcher.has_match("Strasse"))
+
     def test_multiple_sentences(self):
         """Test sentence break"""
         processor = TextProcessor(major_breaks={".", "!"})
@@ -432,6 +497,79 @@ class TextProcessorTestCase(unittest.TestCase):
             ],
         )
 
+    def test_stops_when_unchanged(self):
+        """Test that processing stops as soon as a pass makes no changes"""
+        processor = TextProcessor(default_lang="en_US")
+
+        # Nothing to split or transform
+        graph, root = processor("hello world")
+        self.assertEqual(graph.graph[NUM_PASSES_PROP], 1)
+
+        # Parsed numbers are not counted as changes again
+        graph, root = processor("1 2 3", verbalize_numbers=False)
+        self.assertEqual(graph.graph[NUM_PASSES_PROP], 2)
+
+        words = list(processor.words(graph, root, **WORDS_KWARGS))
+        self.assertEqual(
+            [w.text for w in words], ["1", "2", "3"],
+        )
+
+    def test_process_batch(self):
+        """Test batch processing gives the same results with fewer guesses"""
+        guessed_words = []
+
+        def guess_phonemes(word: str, *args, **kwargs):
+            guessed_words.append(word)
+            return list(word)
+
+        processor = TextProcessor(
+            default_lang="en_US",
+            lookup_phonemes=lambda word, *args, **kwargs: None,
+            guess_phonemes=guess_phonemes,
+        )
+        texts = ["this is a test", "this is another test"]
+        batch_words = [
+            list(processor.words(graph, root, **WORDS_KWARGS))
+            for graph, root in processor.process_batch(texts, pos=False)
+        ]
+
+        # Each unique word is guessed once
+        self.assertEqual(
+            sorted(guessed_words), ["a", "another", "is", "test", "this"],
+        )
+
+        single_words = [
+            list(processor.words(*processor(text, pos=False), **WORDS_KWARGS))
+            for text in texts
+        ]
+        self.assertEqual(batch_words, single_words)
+
+    def test_shared_models(self):
+        """Test that models are loaded once and shared between threads"""
+        processors = [TextProcessor(default_lang="en_US") for _ in range(2)]
+        settings = [p.get_settings() for p in processors]
+
+        # Load models
+        for lang_settings in settings:
+            lang_settings.lookup_phonemes("test")
+
+        self.assertIs(
+            settings[0].lookup_phonemes.phonemizer,
+            settings[1].lookup_phonemes.phonemizer,
+        )
+
+        text = "I read 2 books, and then read them again."
+        expected_words = list(
+            processors[0].words(*processors[0](text), **WORDS_KWARGS)
+        )
+
+        def process_text(processor):
+            return list(processor.words(*processor(text), **WORDS_KWARGS))
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            for words in executor.map(process_text, processors * 4):
+                self.assertEqual(words, expected_words)
+
     def test_currency_one_language(self):
         """Test currency verbalization (single language)"""
         processor = TextProcessor(default_lang="en_US")
@@ -482,6 +620,79 @@ class TextProcessorTestCase(unittest.TestCase):
             ],
         )
 
+    def test_verbalize_cache(self):
+        """Test that repeated numbers, currency, and dates are verbalized once"""
+        processor = TextProcessor(default_lang="en_US")
+        text = "$10 for 12 on 4/1/2021"
+        graph, root = processor(f"{text}, {text}", phonemize=False)
+        words = [w.text for w in processor.words(graph, root, **WORDS_KWARGS)]
+
+        self.assertEqual(
+            words,
+            (
+                "ten dollars for twelve on April first , twenty twenty one ,".split()
+                + "ten dollars for twelve on April first , twenty twenty one".split()
+            ),
+        )
+
+        cache_stats = processor.cache_stats
+        for cache_name in ("verbalize_number", "verbalize_currency", "verbalize_date"):
+            self.assertEqual(cache_stats[cache_name].misses, 1, cache_name)
+            self.assertEqual(cache_stats[cache_name].hits, 1, cache_name)
+
+        self.assertGreater(cache_stats["parse_number"].hits, 0)
+
+    def test_number_parser(self):
+        """Test that fast number parsing matches babel"""
+        import babel.numbers
+
+        texts = ["1,234.5", "1.234,5", "2020", "-3.", "1e5", "nan", "A4", "COVID-19"]
+        for locale in ("en_US", "de_DE", "fr_FR"):
+            number_parser = NumberParser(locale)
+            for text in texts:
+                try:
+                    expected = babel.numbers.parse_decimal(text, locale=locale)
+                except ValueError:
+                    with self.assertRaises(ValueError):
+                        number_parser.parse(text)
+
+                    continue
+
+                actual = number_parser.parse(text)
+                self.assertEqual(str(actual), str(expected), (locale, text))
+
+            # A4 and COVID-19 don't go to babel
+            self.assertEqual(number_parser.num_rejected, 2)
+            self.assertGreater(number_parser.num_fast, 0)
+
+    def test_numeric_date_parser(self):
+        """Test common numeric date shapes without dateparser"""
+        mdy_parser = NumericDateParser("{m} {o}, {y}")
+        dmy_parser = NumericDateParser("dmy")
+
+        april_first = datetime.datetime(2021, 4, 1)
+        self.assertEqual(mdy_parser.parse("4/1/2021"), april_first)
+        self.assertEqual(dmy_parser.parse("1-4-2021"), april_first)
+
+        for date_parser in (mdy_parser, dmy_parser):
+            self.assertEqual(date_parser.parse("2021-04-01"), april_first)
+            self.assertEqual(date_parser.parse("01.04.2021"), april_first)
+
+        # Invalid or unknown shapes are left to dateparser
+        self.assertIsNone(mdy_parser.parse("13/1/2021"))
+        self.assertIsNone(mdy_parser.parse("4/1/21"))
+
+        self.assertTrue(mdy_parser.is_not_date("123-45"))
+        self.assertFalse(mdy_parser.is_not_date("4/1/21"))
+
+        # Month and year is a date for dateparser in some languages
+        self.assertFalse(mdy_parser.is_not_date("12.2021"))
+
+        processor = TextProcessor(default_lang="sv-se")
+        graph, root = processor("Den 12.2021", phonemize=False)
+        words = [w.text for w in processor.words(graph, root, **WORDS_KWARGS)]
+        self.assertIn("december", words)
+
     def test_currency_default(self):
         """Test default currency use when no currency symbol (interpret-as="currency")"""
         processor = TextProcessor(default_lang="en_US", default_currency="USD")
@@ -756,6 +967,41 @@ class TextProcessorTestCase(unittest.TestCase):
             ],
         )
 
+    def test_lazy_pos(self):
+        """Test skipping part-of-speech tagging when roles don't matter"""
+
+        class LookupPhonemes:
+            def __call__(self, word, role=None, **kwargs):
+                if not word.isalpha():
+                    return None
+
+                if role == "gruut:VBD":
+                    return ["ɹ", "ˈɛ", "d"]
+
+                return list(word)
+
+            def is_heteronym(self, word):
+                return word == "read"
+
+        def get_parts_of_speech(words, *args, **kwargs):
+            return ["VBD"] * len(words)
+
+        processor = TextProcessor(
+            major_breaks={"."},
+            lookup_phonemes=LookupPhonemes(),
+            get_parts_of_speech=get_parts_of_speech,
+        )
+        graph, root = processor("This is a test. I read it.", lazy_pos=True)
+        sentences = list(processor.sentences(graph, root, explicit_lang=False))
+
+        # Only the second sentence is tagged
+        self.assertEqual(processor.num_pos_skipped, 1)
+        self.assertEqual(processor.num_pos_tagged, 1)
+
+        self.assertIsNone(sentences[0].words[0].pos)
+        self.assertEqual(sentences[1].words[1].pos, "VBD")
+        self.assertEqual(sentences[1].words[1].phonemes, ["ɹ", "ˈɛ", "d"])
+
     def test_phonemize_one_language(self):
         """Test phonemizer (single language)"""
 